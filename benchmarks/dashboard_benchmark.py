@@ -0,0 +1,103 @@
+"""Compare the time taken to extract the courses from a large dashboard.
+
+- reference: the whole page is parsed into a BeautifulSoup tree, its title is
+  checked, and extract_courses walks the courseList region
+- single pass: iter_dashboard_courses, which parses the page incrementally
+  and extracts each course as soon as its entry is complete
+
+The peak memory allocated by each is measured in a separate run, since
+tracing slows parsing down.
+
+Run from the root of the project:
+
+    python -m benchmarks.dashboard_benchmark
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, List
+
+from bs4 import BeautifulSoup
+
+from benchmarks.synthetic import make_dashboard
+from gradescraper.structures.course import Course
+from gradescraper.util import processor
+
+
+def reference(page: bytes) -> List[Course]:
+    soup = BeautifulSoup(page, 'lxml')
+    if soup.find('title').string == processor.LOGIN_PAGE_TITLE:
+        raise processor.LoginPageError(processor.LOGIN_PAGE_TITLE)
+    return processor.extract_courses(soup)
+
+
+def single_pass(page: bytes) -> List[Course]:
+    return [course for _, course in processor.iter_dashboard_courses(page)]
+
+
+def course_tuple(course: Course) -> tuple:
+    return (
+        course.term.season,
+        course.term.year,
+        course.number,
+        course.short_name,
+        course.name,
+        course.assignments_num,
+    )
+
+
+def time_extraction(extract: Callable, page: bytes, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(extract: Callable, page: bytes) -> int:
+    tracemalloc.start()
+    extract(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--terms', metavar='NUM', type=int, default=20)
+    parser.add_argument('--courses-per-term', metavar='NUM', type=int, default=25)
+    parser.add_argument('--repeat', metavar='NUM', type=int, default=5)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    page = make_dashboard(args.terms, args.courses_per_term).encode()
+    assert list(map(course_tuple, single_pass(page))) == list(
+        map(course_tuple, reference(page))
+    ), 'the single pass extractor differs from the reference'
+
+    extractors = {'reference': reference, 'single pass': single_pass}
+    times = {
+        name: time_extraction(extract, page, args.repeat)
+        for name, extract in extractors.items()
+    }
+    num_courses = args.terms * args.courses_per_term
+
+    print(f'{num_courses} courses over {args.terms} terms, {len(page) / 1024:.0f} KiB')
+    print(
+        f'{"":<12} {"total (ms)":>11} {"per course (us)":>16} '
+        f'{"peak (KiB)":>11} {"speedup":>8}'
+    )
+    for name, extract in extractors.items():
+        seconds = times[name]
+        print(
+            f'{name:<12} {seconds * 1000:>11.2f} {seconds / num_courses * 1e6:>16.2f} '
+            f'{peak_memory(extract, page) / 1024:>11.0f} '
+            f'{times["reference"] / seconds:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Compare wall-clock time of fetching and parsing course pages per parse mode.
+
+Each simulated fetch downloads its page in several chunks, sleeping between
+them to stand in for network latency, and then parses the page through a
+ParseExecutor. When parsing runs inline, it blocks the event loop and stalls
+every other download; in a thread or process pool it overlaps with them.
+
+Run from the root of the project:
+
+    python -m benchmarks.parse_executor_benchmark
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from benchmarks.synthetic import make_course_page
+from gradescraper.util import processor
+from gradescraper.util.executor import ParseExecutor
+
+
+async def fetch_and_parse(
+    executor: ParseExecutor, page: bytes, latency: float, chunks: int
+) -> int:
+    for _ in range(chunks):
+        await asyncio.sleep(latency / chunks)
+    return len(await executor.run(processor.parse_course_page, page, 'Course', 2021))
+
+
+async def time_mode(
+    mode: str, course_count: int, page: bytes, latency: float, chunks: int
+) -> float:
+    executor = ParseExecutor(mode)
+    # Start the pool before timing, as a long-lived messenger would have
+    await executor.run(processor.parse_course_page, page, 'Course', 2021)
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *[
+                fetch_and_parse(executor, page, latency, chunks)
+                for _ in range(course_count)
+            ]
+        )
+        return time.perf_counter() - start
+    finally:
+        executor.shutdown()
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--course-counts',
+        metavar='NUM',
+        nargs='+',
+        type=int,
+        default=[1, 4, 16, 32, 64],
+    )
+    parser.add_argument('--assignments', metavar='NUM', type=int, default=200)
+    parser.add_argument(
+        '--latency',
+        metavar='SECONDS',
+        help='simulated download time of each page',
+        type=float,
+        default=0.2,
+    )
+    parser.add_argument('--chunks', metavar='NUM', type=int, default=10)
+    return parser
+
+
+async def main():
+    args = get_parser().parse_args()
+    page = make_course_page(123456, args.assignments).encode()
+
+    modes: List[str] = list(ParseExecutor.modes)
+    print(f'{"Courses":>8} ' + ' '.join(f'{mode + " (s)":>12}' for mode in modes))
+    for course_count in args.course_counts:
+        times = [
+            await time_mode(mode, course_count, page, args.latency, args.chunks)
+            for mode in modes
+        ]
+        print(f'{course_count:>8} ' + ' '.join(f'{t:>12.3f}' for t in times))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
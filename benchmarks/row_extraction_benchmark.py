@@ -0,0 +1,89 @@
+"""Compare the time taken to extract Assignments from parsed course page rows.
+
+Rows are parsed once up front, so only extraction is timed:
+
+- reference: extract_assignment_from_row, which searches each row once per
+  field and parses every date with datetime.strptime
+- fast: extract_assignment_from_row_fast, which walks each row once and
+  parses dates with the cached parse_release_date and parse_due_date
+- lxml: extract_assignment_from_element, used by the stream parser
+
+Run from the root of the project:
+
+    python -m benchmarks.row_extraction_benchmark
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+from benchmarks.synthetic import make_course_page
+from gradescraper.util import processor
+
+
+def time_extraction(extract: Callable, rows: List, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        processor.parse_release_date.cache_clear()
+        processor.parse_due_date.cache_clear()
+        start = time.perf_counter()
+        for row in rows:
+            extract(row, 'Course', 2021)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', metavar='NUM', type=int, default=10_000)
+    parser.add_argument('--repeat', metavar='NUM', type=int, default=3)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    page = make_course_page(123456, args.rows)
+    soup_rows = BeautifulSoup(
+        page, 'lxml', parse_only=SoupStrainer('tr')
+    ).find_all('tr')[1:]
+    lxml_rows = etree.HTML(page).findall('.//tbody/tr')
+
+    reference = [
+        processor.assignment_to_tuple(
+            processor.extract_assignment_from_row(row, 'Course', 2021)
+        )
+        for row in soup_rows
+    ]
+    fast = [
+        processor.assignment_to_tuple(
+            processor.extract_assignment_from_row_fast(row, 'Course', 2021)
+        )
+        for row in soup_rows
+    ]
+    assert fast == reference, 'the fast extractor differs from the reference'
+
+    times = {
+        'reference': time_extraction(
+            processor.extract_assignment_from_row, soup_rows, args.repeat
+        ),
+        'fast': time_extraction(
+            processor.extract_assignment_from_row_fast, soup_rows, args.repeat
+        ),
+        'lxml': time_extraction(
+            processor.extract_assignment_from_element, lxml_rows, args.repeat
+        ),
+    }
+
+    print(f'{args.rows} rows')
+    print(f'{"":<10} {"total (ms)":>11} {"per row (us)":>13} {"speedup":>8}')
+    for name, seconds in times.items():
+        print(
+            f'{name:<10} {seconds * 1000:>11.1f} {seconds / args.rows * 1e6:>13.2f} '
+            f'{times["reference"] / seconds:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""Measure end-to-end retrieval against a local synthetic Gradescope site.
+
+A SyntheticSite is served locally with the given number of terms, courses and
+assignments, and with every response delayed to simulate network latency.
+GradescopeMessenger.get_courses_and_assignments is then timed against it.
+Results are printed, or written to a file, as JSON so that they can be
+compared across commits:
+
+- end_to_end: the best wall-clock time of a full run, and the requests made
+  per second during it
+- parse: the time taken to parse a course page, per assignment row
+- memory: the peak memory allocated during a full run, including by the
+  local site, traced separately since tracing slows the run down
+
+Run from the root of the project:
+
+    python -m benchmarks.run_benchmarks --output results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.stub_server import SyntheticSite, serve_synthetic_site
+from benchmarks.synthetic import make_course_page
+from gradescraper.util import processor
+from gradescraper.util.executor import ParseExecutor
+from gradescraper.util.messenger import GradescopeMessenger
+
+
+async def retrieve(base_url: str, args: argparse.Namespace) -> int:
+    async with GradescopeMessenger(
+        'benchmark@email.com',
+        'password',
+        max_in_flight=args.max_in_flight,
+        parser=args.parser,
+        parse_mode=args.parse_mode,
+    ) as messenger:
+        messenger.base_url = base_url
+        courses = await messenger.get_courses_and_assignments(
+            recent_only=not args.all_terms
+        )
+    return sum(len(course.assignments) for course in courses)
+
+
+async def measure_end_to_end(site: SyntheticSite, args: argparse.Namespace) -> dict:
+    async with serve_synthetic_site(site) as base_url:
+        best = float('inf')
+        requests = assignments = 0
+        for _ in range(args.repeat):
+            site.request_count = 0
+            start = time.perf_counter()
+            assignments = await retrieve(base_url, args)
+            elapsed = time.perf_counter() - start
+            if elapsed < best:
+                best, requests = elapsed, site.request_count
+
+        tracemalloc.start()
+        await retrieve(base_url, args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'end_to_end': {
+            'seconds': best,
+            'requests': requests,
+            'requests_per_second': requests / best,
+            'assignments': assignments,
+        },
+        'memory': {'peak_bytes': peak},
+    }
+
+
+def measure_parse(args: argparse.Namespace) -> dict:
+    page = make_course_page(123456, args.assignments).encode()
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        rows = len(processor.parse_course_page(page, 'Course', 2021))
+        best = min(best, time.perf_counter() - start)
+    return {'rows': rows, 'seconds_per_row': best / max(rows, 1)}
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--terms', metavar='NUM', type=int, default=4)
+    parser.add_argument('--courses-per-term', metavar='NUM', type=int, default=8)
+    parser.add_argument('--assignments', metavar='NUM', type=int, default=50)
+    parser.add_argument(
+        '--latency',
+        metavar='SECONDS',
+        help='delay of every response',
+        type=float,
+        default=0.05,
+    )
+    parser.add_argument(
+        '--connect-latency',
+        metavar='SECONDS',
+        help='further delay of the first response on each connection',
+        type=float,
+        default=0.0,
+    )
+    parser.add_argument(
+        '--throughput',
+        metavar='BYTES',
+        help='send pages at BYTES per second instead of all at once',
+        type=float,
+    )
+    parser.add_argument(
+        '--all-terms',
+        help='retrieve the courses of every term, not only the most recent',
+        action='store_true',
+    )
+    parser.add_argument('--max-in-flight', metavar='NUM', type=int, default=6)
+    parser.add_argument(
+        '--parser', choices=GradescopeMessenger.parsers, default='soup'
+    )
+    parser.add_argument(
+        '--parse-mode', choices=ParseExecutor.modes, default='inline'
+    )
+    parser.add_argument('--repeat', metavar='NUM', type=int, default=3)
+    parser.add_argument(
+        '--output',
+        metavar='FILE',
+        help='write the results to FILE instead of printing them',
+    )
+    return parser
+
+
+async def main():
+    args = get_parser().parse_args()
+    site = SyntheticSite(
+        args.terms,
+        args.courses_per_term,
+        args.assignments,
+        args.latency,
+        args.connect_latency,
+        args.throughput,
+    )
+    results = {
+        'config': {
+            key: value for key, value in vars(args).items() if key != 'output'
+        },
+        'python': platform.python_version(),
+        **(await measure_end_to_end(site, args)),
+        'parse': measure_parse(args),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
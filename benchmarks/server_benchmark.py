@@ -0,0 +1,110 @@
+"""Measure the latency of queries answered by the local assignment server.
+
+An AssignmentService is loaded with synthetic courses, and each kind of query
+is timed both directly and as an HTTP request to the server's application,
+so that the cost of the index can be told apart from the cost of HTTP and
+JSON encoding. No requests are made to Gradescope either way.
+
+Run from the root of the project:
+
+    python -m benchmarks.server_benchmark
+"""
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+from gradescraper.util.server import AssignmentService, create_app
+
+NOW = datetime.datetime(2021, 4, 10)
+
+
+def make_courses(num_courses: int, assignments_per_course: int) -> List[Course]:
+    courses = []
+    for number in range(num_courses):
+        course = Course(
+            Term('Spring', 2021), number, f'C{number}', f'Course {number}', 0
+        )
+        course.assignments = [
+            Assignment(
+                f'Assignment {index}',
+                course.name,
+                f'/courses/{number}/assignments/{index}',
+                index % 3 != 0,
+                NOW + datetime.timedelta(days=index - 120),
+                NOW + datetime.timedelta(days=index - 113, hours=number),
+                None,
+            )
+            for index in range(assignments_per_course)
+        ]
+        courses.append(course)
+    return courses
+
+
+def time_calls(call: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+async def time_requests(
+    request: Callable[[], Awaitable[object]], repeat: int
+) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await request()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', metavar='NUM', type=int, default=8)
+    parser.add_argument('--assignments', metavar='NUM', type=int, default=200)
+    parser.add_argument('--repeat', metavar='NUM', type=int, default=1000)
+    return parser
+
+
+async def main():
+    args = get_parser().parse_args()
+    service = AssignmentService(
+        make_courses(args.courses, args.assignments), now=lambda: NOW
+    )
+    queries = {
+        'upcoming': (service.upcoming, '/assignments/upcoming'),
+        'unsubmitted': (service.unsubmitted, '/assignments/unsubmitted'),
+        'by course': (
+            lambda: service.course_assignments(0, days=7),
+            '/courses/0/assignments?days=7',
+        ),
+    }
+
+    print(f'{args.courses} courses, {args.assignments} assignments each')
+    print(f'{"":<12} {"results":>8} {"direct (us)":>12} {"HTTP (us)":>10}')
+    async with TestClient(TestServer(create_app(service))) as client:
+
+        async def request(path: str):
+            async with client.get(path) as response:
+                await response.read()
+
+        for name, (query, path) in queries.items():
+            direct = time_calls(query, args.repeat)
+            http = await time_requests(lambda: request(path), args.repeat)
+            print(
+                f'{name:<12} {len(query()):>8} {direct * 1e6:>12.1f} {http * 1e6:>10.1f}'
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
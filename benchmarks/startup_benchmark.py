@@ -0,0 +1,96 @@
+"""Measure how long the CLI takes to start on its quick code paths.
+
+Each scenario runs gradescraper.py in a fresh interpreter with -X importtime,
+and reports its wall-clock time, the time spent importing modules, and the
+slowest imports. The script exits with status 1 if any scenario's median
+wall-clock time exceeds --max-ms, so it can be run as a regression check.
+
+Run from the root of the project:
+
+    python -m benchmarks.startup_benchmark
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Parse the output of -X importtime.
+
+    Args:
+        stderr (str): the interpreter's standard error.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: the self and cumulative import times, in
+        microseconds, of each imported module.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def run_scenario(arguments: List[str]) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'gradescraper.py', *arguments],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed, parse_importtime(completed.stderr)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', metavar='NUM', type=int, default=5)
+    parser.add_argument(
+        '--max-ms',
+        metavar='MS',
+        help='fail if a scenario takes longer than MS milliseconds',
+        type=float,
+        default=100,
+    )
+    parser.add_argument('--top', metavar='NUM', type=int, default=5)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        db = os.path.join(directory, 'gradescraper.db')
+        scenarios = {
+            'help': ['--help'],
+            'offline': ['--offline', '--account', 'a@email.com', 'x', '--db', db],
+        }
+
+        failed = False
+        for name, arguments in scenarios.items():
+            runs = [run_scenario(arguments) for _ in range(args.repeat)]
+            wall = statistics.median(elapsed for elapsed, _ in runs) * 1000
+            imports = runs[-1][1]
+            import_ms = sum(self_us for self_us, _ in imports.values()) / 1000
+            status = 'ok' if wall <= args.max_ms else 'SLOW'
+            failed = failed or wall > args.max_ms
+            print(
+                f'{name:<10} wall {wall:>7.1f} ms  imports {import_ms:>7.1f} ms '
+                f'({len(imports)} modules)  {status}'
+            )
+            slowest = sorted(imports.items(), key=lambda item: -item[1][0])
+            for module, (self_us, _) in slowest[: args.top]:
+                print(f'    {module:<40} {self_us / 1000:>7.1f} ms')
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Compare memory and throughput of the assignment and term representations.
+
+Three representations of the same assignments are measured:
+
+- legacy: the original dict-backed Assignment, and a Term that builds its
+  season lookup on every comparison
+- slotted: the current Assignment and Term, which use __slots__
+- compact: CompactAssignment, which is tuple-backed with integer timestamps
+
+Run from the root of the project:
+
+    python -m benchmarks.structures_benchmark
+"""
+import argparse
+import datetime
+import functools
+import gc
+import time
+import tracemalloc
+from typing import Callable, List
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.compact import CompactAssignment
+from gradescraper.structures.term import Term
+
+
+class LegacyAssignment:
+    def __init__(
+        self,
+        name,
+        course_name,
+        url,
+        submitted,
+        release_date=None,
+        due_date=None,
+        late_due_date=None,
+    ):
+        self.name = name
+        self.course_name = course_name
+        self.url = url
+        self.submitted = submitted
+        self.release_date = release_date
+        self.due_date = due_date
+        self.late_due_date = late_due_date
+
+
+@functools.total_ordering
+class LegacyTerm:
+    def __init__(self, season, year):
+        self.season = season
+        self.year = year
+
+    def __gt__(self, o):
+        season_values = {"Spring": 0, "Summer": 1, "Fall": 2, "Winter": 3}
+        if self.year != o.year:
+            return self.year > o.year
+        return season_values[self.season] > season_values[o.season]
+
+    def __eq__(self, o):
+        return self.year == o.year and self.season == o.season
+
+
+def make_assignments(count: int) -> List[Assignment]:
+    start = datetime.datetime(2021, 1, 1)
+    return [
+        Assignment(
+            f'Assignment {i}',
+            f'Course {i % 40}',
+            f'https://www.gradescope.com/courses/{i % 40}/assignments/{i}',
+            i % 3 != 0,
+            start + datetime.timedelta(hours=i),
+            start + datetime.timedelta(hours=i, days=7),
+            start + datetime.timedelta(hours=i, days=9) if i % 4 == 0 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def measure_memory(build: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def measure_time(function: Callable[[], object], repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', metavar='NUM', type=int, default=100_000)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    assignments = make_assignments(args.count)
+
+    # Strings are shared by every representation, so only the objects
+    # themselves and their dates are counted.
+    builders = {
+        'legacy': lambda: [
+            LegacyAssignment(
+                a.name,
+                a.course_name,
+                a.url,
+                a.submitted,
+                a.release_date + datetime.timedelta(0),
+                a.due_date + datetime.timedelta(0),
+                a.late_due_date and a.late_due_date + datetime.timedelta(0),
+            )
+            for a in assignments
+        ],
+        'slotted': lambda: [
+            Assignment(
+                a.name,
+                a.course_name,
+                a.url,
+                a.submitted,
+                a.release_date + datetime.timedelta(0),
+                a.due_date + datetime.timedelta(0),
+                a.late_due_date and a.late_due_date + datetime.timedelta(0),
+            )
+            for a in assignments
+        ],
+        'compact': lambda: [
+            CompactAssignment.from_assignment(a) for a in assignments
+        ],
+    }
+    sort_keys = {
+        'legacy': lambda a: a.due_date,
+        'slotted': lambda a: a.due_date,
+        'compact': lambda a: a.due_timestamp,
+    }
+
+    print(f'{args.count} assignments')
+    print(f'{"":<10} {"bytes/object":>14} {"sort by due (ms)":>18}')
+    for name, build in builders.items():
+        memory = measure_memory(build)
+        objects = build()
+        sort_time = measure_time(lambda: sorted(objects, key=sort_keys[name]))
+        print(f'{name:<10} {memory / args.count:>14.1f} {sort_time * 1000:>18.2f}')
+
+    seasons = ['Spring', 'Summer', 'Fall', 'Winter']
+    term_args = [(seasons[i % 4], 2000 + (i * 7) % 23) for i in range(args.count)]
+    legacy_terms = [LegacyTerm(*term) for term in term_args]
+    terms = [Term(*term) for term in term_args]
+    print()
+    print(f'{"":<10} {"sort terms (ms)":>18}')
+    print(f'{"legacy":<10} {measure_time(lambda: sorted(legacy_terms)) * 1000:>18.2f}')
+    print(f'{"slotted":<10} {measure_time(lambda: sorted(terms)) * 1000:>18.2f}')
+    print(
+        f'{"sort_key":<10} '
+        f'{measure_time(lambda: sorted(terms, key=lambda t: t.sort_key)) * 1000:>18.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
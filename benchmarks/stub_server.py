@@ -0,0 +1,147 @@
+"""A local stand-in for the Gradescope website serving synthetic pages.
+
+Unlike tests/gradescope_stub.py, which serves the fixed test fixtures, this
+serves a dashboard and course pages of any size built by benchmarks.synthetic,
+and can delay responses and new connections, and limit the rate pages are sent
+at, to simulate a network. Its fake login is the stub's.
+"""
+import asyncio
+import contextlib
+import weakref
+from typing import Optional
+
+from aiohttp import web
+
+from benchmarks.synthetic import course_numbers, make_course_page, make_dashboard
+from tests.gradescope_stub import LOGIN_PAGE_TEMPLATE, LoginSite, serve_app
+
+# The size of the chunks pages are sent in when throughput is limited
+CHUNK_SIZE = 4 * 1024
+
+LOGIN_PAGE = LOGIN_PAGE_TEMPLATE.format(token='benchmark-token')
+
+
+class SyntheticSite(LoginSite):
+    """Serves a synthetic dashboard and course pages behind a fake login.
+
+    Any email and password are accepted. Pages are built once, up front, so
+    building them isn't measured.
+
+    Attributes:
+        latency (float): the number of seconds every response is delayed by.
+        connect_latency (float): the number of seconds the first response on
+        each connection is further delayed by, like a TCP and TLS handshake.
+        throughput (float, optional): the number of bytes of each page sent
+        per second, or None to send pages at once.
+        request_count (int): the number of requests served.
+        connection_count (int): the number of connections opened.
+    """
+
+    def __init__(
+        self,
+        num_terms: int,
+        courses_per_term: int,
+        assignments_per_course: int,
+        latency: float = 0.0,
+        connect_latency: float = 0.0,
+        throughput: Optional[float] = None,
+    ):
+        """Create a SyntheticSite.
+
+        Args:
+            num_terms (int): the number of terms on the dashboard.
+            courses_per_term (int): the number of courses in each term.
+            assignments_per_course (int): the number of assignments in each
+            course.
+            latency (float, optional): the number of seconds every response
+            is delayed by. Defaults to 0.0.
+            connect_latency (float, optional): the number of seconds the first
+            response on each connection is further delayed by. Defaults to
+            0.0.
+            throughput (float, optional): the number of bytes of each page
+            sent per second. Defaults to None, to send pages at once.
+        """
+        super().__init__()
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.throughput = throughput
+        self.request_count = 0
+        self.connection_count = 0
+        self._transports = weakref.WeakSet()
+        self.dashboard = make_dashboard(
+            num_terms, courses_per_term, assignments_per_course
+        )
+        self.course_pages = {
+            number: make_course_page(number, assignments_per_course)
+            for number in course_numbers(num_terms, courses_per_term)
+        }
+        self.app = web.Application(middlewares=[self.delay])
+        self.app.add_routes(
+            [
+                web.get('/', self.home),
+                web.post('/login', self.login),
+                web.get('/courses/{number}', self.course),
+            ]
+        )
+
+    @web.middleware
+    async def delay(self, request, handler):
+        self.request_count += 1
+        delay = self.latency
+        if request.transport not in self._transports:
+            self._transports.add(request.transport)
+            self.connection_count += 1
+            delay += self.connect_latency
+        if delay:
+            await asyncio.sleep(delay)
+        return await handler(request)
+
+    async def _page(
+        self, request: web.Request, page: str, session: Optional[str] = None
+    ) -> web.StreamResponse:
+        if not self.throughput:
+            response = web.Response(text=page, content_type='text/html')
+            if session:
+                response.set_cookie('session', session)
+            return response
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/html'})
+        if session:
+            response.set_cookie('session', session)
+        await response.prepare(request)
+        body = page.encode()
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = body[start : start + CHUNK_SIZE]
+            await response.write(chunk)
+            await asyncio.sleep(len(chunk) / self.throughput)
+        await response.write_eof()
+        return response
+
+    async def home(self, request):
+        page = self.dashboard if self.is_logged_in(request) else LOGIN_PAGE
+        return await self._page(request, page)
+
+    async def login(self, request):
+        return await self._page(request, self.dashboard, self.start_session())
+
+    async def course(self, request):
+        if not self.is_logged_in(request):
+            raise web.HTTPFound('/')
+        page = self.course_pages.get(int(request.match_info['number']))
+        if page is None:
+            raise web.HTTPNotFound()
+        return await self._page(request, page)
+
+
+@contextlib.asynccontextmanager
+async def serve_synthetic_site(site: SyntheticSite):
+    """Run a SyntheticSite on a local port for the duration of the context.
+
+    Args:
+        site (SyntheticSite): the site to serve.
+
+    Yields:
+        str: the site's base URL.
+    """
+    async with serve_app(site.app) as base_url:
+        yield base_url
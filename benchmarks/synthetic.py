@@ -0,0 +1,140 @@
+"""Builders for synthetic Gradescope pages shaped like the test fixtures."""
+import datetime
+from typing import List
+
+SEASONS = ['Spring', 'Summer', 'Fall', 'Winter']
+
+HEADER_ROW = """<tr role="row"><th role="columnheader" scope="col">Name</th>
+<th role="columnheader" scope="col">Status</th>
+<th role="columnheader" scope="col">ReleasedDue</th></tr>"""
+
+
+def _date(day: int) -> datetime.datetime:
+    return datetime.datetime(2021, 1, 1) + datetime.timedelta(days=day % 365)
+
+
+def make_assignment_row(course_number: int, index: int) -> str:
+    """Build an assignment row like those in tests/sample_course_dashboard.html.
+
+    Rows cycle between submitted and unsubmitted assignments, with and without
+    links and late due dates.
+
+    Args:
+        course_number (int): the number of the course the row belongs to.
+        index (int): the index of the assignment within its course.
+
+    Returns:
+        str: the row's HTML.
+    """
+    release = _date(index)
+    due = release + datetime.timedelta(days=7, hours=index % 24)
+    late = due + datetime.timedelta(days=2)
+    submitted = index % 3 != 0
+
+    if submitted:
+        header = (
+            f'<a aria-label="View Assignment {index}" href="/courses/'
+            f'{course_number}/assignments/{index}/submissions/{index * 7}">'
+            f'Assignment {index}</a>'
+        )
+        status = (
+            '<td class="submissionStatus submissionStatus-complete">'
+            '<div class="submissionStatus--text">Submitted</div></td>'
+        )
+    else:
+        header = f'Assignment {index}'
+        status = (
+            '<td class="submissionStatus submissionStatus-warning">'
+            '<div class="submissionStatus--text">No Submission</div></td>'
+        )
+
+    late_span = (
+        f'<br><span class="submissionTimeChart--dueDate">Late Due Date: '
+        f'{late:%b %d at %I:%M%p}</span>'
+        if index % 4 == 0
+        else ''
+    )
+    return (
+        '<tr role="row" class="odd">'
+        f'<th class="table--primaryLink" role="rowheader" scope="row">{header}</th>'
+        f'{status}'
+        '<td class="sorting_1 sorting_2"><div class="submissionTimeChart">'
+        '<div class="progressBar--caption">'
+        f'<span class="submissionTimeChart--releaseDate">{release:%b %d}</span>'
+        f'<span class="submissionTimeChart--dueDate">{due:%b %d at %I:%M%p}</span>'
+        f'{late_span}</div></div></td></tr>'
+    )
+
+
+def make_course_page(course_number: int, num_assignments: int) -> str:
+    """Build a course page with the given number of assignment rows.
+
+    Args:
+        course_number (int): the course's number.
+        num_assignments (int): the number of assignment rows on the page.
+
+    Returns:
+        str: the page's HTML.
+    """
+    rows = ''.join(
+        make_assignment_row(course_number, index)
+        for index in range(num_assignments)
+    )
+    return (
+        '<html lang="en"><head><title>Course Dashboard | Gradescope</title>'
+        '</head><body><table class="table" id="assignments-student-table">'
+        f'<thead>{HEADER_ROW}</thead><tbody>{rows}</tbody></table></body></html>'
+    )
+
+
+def course_numbers(num_terms: int, courses_per_term: int) -> List[int]:
+    """Get the course numbers used by make_dashboard.
+
+    Args:
+        num_terms (int): the number of terms on the dashboard.
+        courses_per_term (int): the number of courses in each term.
+
+    Returns:
+        List[int]: the number of every course on the dashboard.
+    """
+    return [100000 + i for i in range(num_terms * courses_per_term)]
+
+
+def make_dashboard(
+    num_terms: int, courses_per_term: int, assignments_per_course: int = 10
+) -> str:
+    """Build a dashboard like tests/courses_dashboard.html.
+
+    Terms are listed from most to least recent, as on the real dashboard.
+
+    Args:
+        num_terms (int): the number of terms on the dashboard.
+        courses_per_term (int): the number of courses in each term.
+        assignments_per_course (int, optional): the assignment count shown for
+        each course. Defaults to 10.
+
+    Returns:
+        str: the page's HTML.
+    """
+    numbers = iter(course_numbers(num_terms, courses_per_term))
+    terms = []
+    for term_index in range(num_terms):
+        season = SEASONS[(len(SEASONS) - 1 - term_index) % len(SEASONS)]
+        year = 2021 - term_index // len(SEASONS)
+        course_boxes = ''.join(
+            f'<a class="courseBox" href="/courses/{number}">'
+            f'<h3 class="courseBox--shortname">COURSE {number}</h3>'
+            f'<h4 class="courseBox--name">Course {number}</h4>'
+            f'<div class="courseBox--assignments">{assignments_per_course} '
+            'assignments</div></a>'
+            for number in (next(numbers) for _ in range(courses_per_term))
+        )
+        terms.append(
+            f'<h2 class="courseList--term pageSubheading">{season} {year}</h2>'
+            f'<div class="courseList--coursesForTerm">{course_boxes}</div>'
+        )
+    return (
+        '<html lang="en"><head><title>Your Courses | Gradescope</title></head>'
+        '<body><div id="account-show"><h1 class="pageHeading">Your Courses</h1>'
+        f'<div class="courseList">{"".join(terms)}</div></div></body></html>'
+    )
@@ -0,0 +1,181 @@
+"""Compare workload queries over many assignments on objects and on a table.
+
+Each query is answered three ways over the same assignments:
+
+- loop: a Python loop over the Assignment objects of every course
+- index: the courses' due date indexes, merged once, where the query is one
+  they answer
+- table: an AssignmentTable, whose columns are NumPy arrays
+
+The time taken to build the merged index and the table is reported
+separately, since both are built once and then queried many times.
+
+Run from the root of the project:
+
+    python -m benchmarks.table_benchmark
+"""
+import argparse
+import collections
+import datetime
+import time
+from typing import Callable, List
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.due_date_index import DueDateIndex
+from gradescraper.structures.table import AssignmentTable
+from gradescraper.structures.term import Term
+
+NOW = datetime.datetime(2021, 4, 10)
+DAY = datetime.timedelta(days=1)
+
+
+def make_courses(num_courses: int, assignments_per_course: int) -> List[Course]:
+    courses = []
+    for number in range(num_courses):
+        course = Course(
+            Term('Spring', 2021), number, f'C{number}', f'Course {number}', 0
+        )
+        course.assignments = []
+        for index in range(assignments_per_course):
+            # Spread due dates over a year around NOW, at varying hours
+            due = NOW + datetime.timedelta(hours=(index * 97 + number * 13) % 8760 - 4380)
+            course.assignments.append(
+                Assignment(
+                    f'Assignment {index}',
+                    course.name,
+                    f'/courses/{number}/assignments/{index}',
+                    (index + number) % 3 != 0,
+                    due - 7 * DAY,
+                    due,
+                    due + 2 * DAY if index % 4 == 0 else None,
+                )
+            )
+        courses.append(course)
+    return courses
+
+
+def loop_in_range(courses, start, end):
+    in_range = [
+        assignment
+        for course in courses
+        for assignment in course.assignments
+        if not assignment.submitted and start <= assignment.due_date <= end
+    ]
+    in_range.sort(key=lambda assignment: assignment.due_date)
+    return in_range
+
+
+def loop_overdue(courses, now):
+    return sum(
+        not assignment.submitted and assignment.due_date < now
+        for course in courses
+        for assignment in course.assignments
+    )
+
+
+def loop_by_day(courses, start, end):
+    counts = [0] * ((end - start) // DAY)
+    for course in courses:
+        for assignment in course.assignments:
+            if start <= assignment.due_date < end:
+                counts[(assignment.due_date - start) // DAY] += 1
+    return counts
+
+
+def loop_by_course(courses, start, end):
+    counts = collections.Counter()
+    for course in courses:
+        for assignment in course.assignments:
+            if start <= assignment.due_date <= end:
+                counts[course.name] += 1
+    return [counts[course.name] for course in courses]
+
+
+def time_call(call: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', metavar='NUM', type=int, default=200)
+    parser.add_argument('--assignments', metavar='NUM', type=int, default=500)
+    parser.add_argument('--days', metavar='NUM', type=int, default=30)
+    parser.add_argument('--repeat', metavar='NUM', type=int, default=5)
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    courses = make_courses(args.courses, args.assignments)
+    end = NOW + args.days * DAY
+
+    index_time = time_call(
+        lambda: DueDateIndex.merge(course.due_date_index for course in courses),
+        args.repeat,
+    )
+    table_time = time_call(lambda: AssignmentTable.from_courses(courses), args.repeat)
+    index = DueDateIndex.merge(course.due_date_index for course in courses)
+    table = AssignmentTable.from_courses(courses)
+
+    queries = {
+        'in range': (
+            lambda: loop_in_range(courses, NOW, end),
+            lambda: index.in_range(NOW, end, unsubmitted_only=True),
+            lambda: table.in_range(NOW, end, unsubmitted_only=True),
+        ),
+        'overdue': (
+            lambda: loop_overdue(courses, NOW),
+            lambda: len(index.overdue(NOW)),
+            lambda: table.count_overdue(NOW),
+        ),
+        'by day': (
+            lambda: loop_by_day(courses, NOW, end),
+            None,
+            lambda: list(table.workload_by_day(NOW, end)),
+        ),
+        'by course': (
+            lambda: loop_by_course(courses, NOW, end),
+            None,
+            lambda: list(table.workload_by_course(NOW, end)),
+        ),
+    }
+    for name, (loop, indexed, vectorized) in queries.items():
+        expected = loop()
+        assert vectorized() == expected, f'the table differs from the loop: {name}'
+        assert indexed is None or indexed() == expected, (
+            f'the index differs from the loop: {name}'
+        )
+
+    print(
+        f'{len(table)} assignments in {args.courses} courses, '
+        f'{args.days} day window'
+    )
+    print(
+        f'build (ms): index {index_time * 1000:.1f}, table {table_time * 1000:.1f}'
+    )
+    print(
+        f'{"":<10} {"loop (ms)":>10} {"index (ms)":>11} {"table (ms)":>11} '
+        f'{"speedup":>8}'
+    )
+    for name, (loop, indexed, vectorized) in queries.items():
+        loop_time = time_call(loop, args.repeat)
+        index_column = (
+            f'{time_call(indexed, args.repeat) * 1000:>11.2f}'
+            if indexed
+            else f'{"-":>11}'
+        )
+        vectorized_time = time_call(vectorized, args.repeat)
+        print(
+            f'{name:<10} {loop_time * 1000:>10.2f} {index_column} '
+            f'{vectorized_time * 1000:>11.2f} {loop_time / vectorized_time:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,28 @@
 import argparse
-import asyncio
 import datetime
-import platform
-from asyncio.proactor_events import _ProactorBasePipeTransport
+import io
+import sys
 from functools import wraps
+from typing import TYPE_CHECKING, Dict, List, Optional, TextIO
 
-import keyring
+# Modules that are slow to import, like aiohttp, bs4, lxml and keyring, are
+# imported only on the code paths that use them, so that --help, --forget-me
+# and --offline start quickly.
+if TYPE_CHECKING:
+    from gradescraper.structures.assignment import Assignment
+    from gradescraper.structures.course import Course
+    from gradescraper.util.formatter import AssignmentWriter
+    from gradescraper.util.profiler import Profiler
+    from gradescraper.util.store import SnapshotStore
 
-from gradescraper.util.messenger import GradescopeMessenger
+# The same as GradescopeMessenger.parsers and ParseExecutor.modes, which aren't
+# imported just to build the ArgumentParser
+PARSERS = ('soup', 'stream')
+PARSE_MODES = ('inline', 'thread', 'process')
+# 'text' and the names of the writers in gradescraper.util.formatter.WRITERS
+FORMATS = ('text', 'jsonl', 'csv', 'ics')
+
+SERVICE_ID = 'Gradescraper'
 
 
 def get_parser() -> argparse.ArgumentParser:
@@ -65,61 +80,645 @@ def get_parser() -> argparse.ArgumentParser:
         type=int,
         default=7,
     )
+    parser.add_argument(
+        '--max-in-flight',
+        metavar='NUM',
+        help='fetch at most NUM course pages at once',
+        type=int,
+        default=6,
+    )
+    parser.add_argument(
+        '--parser',
+        help='parse course pages with BeautifulSoup once read (soup, the default) or incrementally as they arrive (stream)',
+        choices=PARSERS,
+        default='soup',
+    )
+    parser.add_argument(
+        '--parse-mode',
+        help='parse pages on the event loop (inline, the default) or in a thread or process pool',
+        choices=PARSE_MODES,
+        default='inline',
+    )
+    parser.add_argument(
+        '--no-cache',
+        help='do not store or revalidate course pages in the local cache',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--max-cache-age',
+        metavar='SECONDS',
+        help='discard cached course pages older than SECONDS (default one week)',
+        type=float,
+        default=7 * 24 * 60 * 60,
+    )
+    parser.add_argument(
+        '--db',
+        metavar='PATH',
+        help='store fetched courses and assignments in the SQLite database at PATH (default ~/.gradescraper/gradescraper.db)',
+        type=str,
+    )
+    parser.add_argument(
+        '--offline',
+        help='answer from the courses and assignments stored by the last run, without logging in',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--incremental',
+        help='only fetch courses whose assignment count changed since the last run, or whose stored assignments are stale',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--fresh-for',
+        metavar='SECONDS',
+        help='with --incremental, trust stored assignments of unchanged courses for SECONDS (default 15 minutes)',
+        type=float,
+        default=15 * 60,
+    )
+    parser.add_argument(
+        '--batch',
+        metavar='FILE',
+        help='retrieve every account listed in the JSON file FILE in one run. Passwords missing from FILE are read from the keyring',
+        type=str,
+    )
+    parser.add_argument(
+        '--max-accounts',
+        metavar='NUM',
+        help='with --batch, retrieve at most NUM accounts at once',
+        type=int,
+        default=16,
+    )
+    parser.add_argument(
+        '--max-connections',
+        metavar='NUM',
+        help='with --batch, open at most NUM connections at once across all accounts',
+        type=int,
+        default=64,
+    )
+    parser.add_argument(
+        '--watch',
+        metavar='INTERVAL',
+        help='keep running, checking for changes to assignments about every INTERVAL seconds and printing only what changed. Uses --fresh-for like --incremental',
+        type=float,
+    )
+    parser.add_argument(
+        '--timeout',
+        metavar='SECONDS',
+        help='give up on an attempt at a request after SECONDS (default 60)',
+        type=float,
+        default=60,
+    )
+    parser.add_argument(
+        '--retries',
+        metavar='NUM',
+        help='retry requests that time out, fail to connect, or are rate limited or failed by the server up to NUM times, backing off between attempts (default 3)',
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        '--rate-limit',
+        metavar='NUM',
+        help='make at most NUM requests per second',
+        type=float,
+    )
+    parser.add_argument(
+        '--profile',
+        help='print how long each phase of retrieving assignments took',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--profile-output',
+        metavar='FILE',
+        help='write the timed phases of retrieving assignments to FILE in the Trace Event Format, which can be loaded in chrome://tracing or Perfetto',
+        type=str,
+    )
+    parser.add_argument(
+        '--serve',
+        metavar='PORT',
+        help='keep running, serving upcoming, per-course and unsubmitted assignments over HTTP on PORT from memory, and syncing with Gradescope in the background',
+        type=int,
+    )
+    parser.add_argument(
+        '--host',
+        help='with --serve, the address to listen on (default 127.0.0.1)',
+        default='127.0.0.1',
+    )
+    parser.add_argument(
+        '--sync-interval',
+        metavar='SECONDS',
+        help='with --serve, sync with Gradescope about every SECONDS (default 15 minutes). Uses --fresh-for like --incremental',
+        type=float,
+        default=15 * 60,
+    )
+    parser.add_argument(
+        '--format',
+        help='print upcoming assignments as a table (text, the default), or as JSON Lines, CSV or iCalendar, streaming each course\'s assignments as soon as they are retrieved. Other messages are printed to standard error. Not used with --watch',
+        choices=FORMATS,
+        default='text',
+    )
+    parser.add_argument(
+        '--details',
+        help='also retrieve the score and submission time of each upcoming assignment, which takes a request per assignment. Not used with --batch, --watch or --serve',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--sort',
+        help='with --format, order assignments by due date, which waits for every course to be retrieved',
+        action='store_true',
+    )
 
     return parser
 
 
-async def main():
+def open_store(path: Optional[str]) -> 'SnapshotStore':
+    """Open the snapshot store at the given path.
+
+    Args:
+        path (str, optional): the path of the database, or None for the
+        default path.
+
+    Returns:
+        SnapshotStore: the store.
+    """
+    from gradescraper.util.store import DEFAULT_DB_PATH, SnapshotStore
+
+    return SnapshotStore(path or DEFAULT_DB_PATH)
+
+
+def forget_session(service_id: str, account_email: str):
+    """Delete the cached session cookies for the given account, if any.
+
+    Args:
+        service_id (str): the keyring service the session is stored under.
+        account_email (str): the email address of the account.
+    """
+    import keyring
+    import keyring.errors
+
+    try:
+        keyring.delete_password(service_id, f'{account_email}:session')
+    except keyring.errors.PasswordDeleteError:
+        pass
+
+
+def upcoming_assignments_for(
+    courses: List['Course'],
+    start_date: datetime.datetime,
+    end_date: datetime.datetime,
+) -> List['Assignment']:
+    """Get the assignments of several courses due within the specified range.
+
+    Args:
+        courses (List[Course]): the courses to get the assignments of.
+        start_date (datetime.datetime): the start of the range, inclusive.
+        end_date (datetime.datetime): the end of the range, inclusive.
+
+    Returns:
+        List[Assignment]: the assignments in the range, ordered by due date.
+    """
+    from gradescraper.structures.due_date_index import DueDateIndex
+
+    return DueDateIndex.merge(
+        course.due_date_index for course in courses
+    ).in_range(start_date, end_date)
+
+
+def status_output(args: argparse.Namespace) -> TextIO:
+    """Get the stream that messages other than the report are printed to.
+
+    Args:
+        args (argparse.Namespace): the parsed command line arguments.
+
+    Returns:
+        TextIO: standard output for the text report, or standard error when
+        the report is machine-readable, so that the two aren't mixed.
+    """
+    return sys.stdout if args.format == 'text' else sys.stderr
+
+
+def open_writer(
+    args: argparse.Namespace, with_account: bool = False
+) -> Optional['AssignmentWriter']:
+    """Create a writer of assignments in the requested output format.
+
+    Args:
+        args (argparse.Namespace): the parsed command line arguments.
+        with_account (bool, optional): whether each assignment is written with
+        the account it belongs to. Defaults to False.
+
+    Returns:
+        AssignmentWriter, optional: the writer, or None for the text report.
+    """
+    if args.format == 'text':
+        return None
+    from gradescraper.util.formatter import WRITERS
+
+    # Writers choose their own line endings, e.g. CRLF for iCalendar, which
+    # standard output would otherwise translate again on Windows
+    if isinstance(sys.stdout, io.TextIOWrapper):
+        sys.stdout.reconfigure(newline='')
+    return WRITERS[args.format](sys.stdout, with_account)
+
+
+def print_course_errors(
+    courses: List['Course'], errors: Dict[int, Exception], file: TextIO = sys.stdout
+):
+    """Print the courses whose assignments failed to be retrieved.
+
+    Args:
+        courses (List[Course]): the courses that were retrieved.
+        errors (Dict[int, Exception]): the errors raised while retrieving
+        courses, by course number.
+        file (TextIO, optional): the stream to print to. Defaults to
+        standard output.
+    """
+    for course in courses:
+        if course.number in errors:
+            print(
+                f'Failed to retrieve assignments for {course.short_name}: {errors[course.number]}',
+                file=file,
+            )
+
+
+def report_profile(profiler: Optional['Profiler'], args: argparse.Namespace):
+    """Print and export the phases recorded by the profiler, if requested.
+
+    Args:
+        profiler (Profiler, optional): the profiler used for the run, if any.
+        args (argparse.Namespace): the parsed command line arguments.
+    """
+    if profiler is None:
+        return
+    if args.profile:
+        print(file=status_output(args))
+        print(profiler.format_summary(), file=status_output(args))
+    if args.profile_output:
+        profiler.export_trace(args.profile_output)
+
+
+def print_upcoming_assignments(
+    assignments: List['Assignment'],
+    start_date: datetime.datetime,
+    end_date: datetime.datetime,
+    days_forward: int,
+):
+    """Print a report of upcoming assignments.
+
+    Args:
+        assignments (List[Assignment]): the assignments due in the range.
+        start_date (datetime.datetime): the start of the range.
+        end_date (datetime.datetime): the end of the range.
+        days_forward (int): the number of days in the range.
+    """
+    print(
+        f'Upcoming assignments over the next {days_forward} days ({start_date:%m/%d}\U000027A1 {end_date:%m/%d}):'
+    )
+    print(
+        f'{"Course Name":<20} {"Assignment": <15}   Due Date        Submitted'
+    )
+    for assignment in assignments:
+        print(assignment)
+
+
+def output_assignments(
+    assignments: List['Assignment'],
+    args: argparse.Namespace,
+    start_date: datetime.datetime,
+    end_date: datetime.datetime,
+):
+    """Print upcoming assignments in the requested output format.
+
+    Args:
+        assignments (List[Assignment]): the assignments due in the range.
+        args (argparse.Namespace): the parsed command line arguments.
+        start_date (datetime.datetime): the start of the range.
+        end_date (datetime.datetime): the end of the range.
+    """
+    writer = open_writer(args)
+    if writer is None:
+        print_upcoming_assignments(
+            assignments, start_date, end_date, args.days_forward
+        )
+    else:
+        writer.write_all(assignments)
+
+
+def main():
     args = get_parser().parse_args()
 
-    service_id = 'Gradescraper'
+    # TODO should actually be datetime.now() in prod
+    today = datetime.datetime(2021, 4, 10)
+    end_date = today + datetime.timedelta(days=args.days_forward)
 
     if args.forget_me:
-        account_email = keyring.get_password(service_id, 'STORED_EMAIL')
+        import keyring
+
+        account_email = keyring.get_password(SERVICE_ID, 'STORED_EMAIL')
         if not account_email:
             print('No stored account info was found')
         else:
-            keyring.delete_password(service_id, account_email)
-            keyring.delete_password(service_id, 'STORED_EMAIL')
-            print(f'Removed account information.')
+            keyring.delete_password(SERVICE_ID, account_email)
+            keyring.delete_password(SERVICE_ID, 'STORED_EMAIL')
+            forget_session(SERVICE_ID, account_email)
+            print('Removed account information.')
 
         return None
 
+    if args.offline:
+        with open_store(args.db) as store:
+            if args.account:
+                account_email = args.account[0]
+            else:
+                # Only look up the stored account, which loads the keyring,
+                # if the store holds more than one account
+                accounts = store.accounts()
+                if len(accounts) == 1:
+                    account_email = accounts[0]
+                else:
+                    import keyring
+
+                    account_email = keyring.get_password(SERVICE_ID, 'STORED_EMAIL')
+            if not account_email:
+                print(
+                    'No stored account info was found. Please run with --account to choose an account.',
+                    file=status_output(args),
+                )
+                return None
+            upcoming_assignments = store.assignments_in_range(
+                account_email, today, end_date
+            )
+        output_assignments(upcoming_assignments, args, today, end_date)
+        return None
+
+    import asyncio
+
+    asyncio.run(retrieve(args, today, end_date))
+
+
+async def retrieve(
+    args: argparse.Namespace, today: datetime.datetime, end_date: datetime.datetime
+):
+    """Retrieve assignments from Gradescope and report the upcoming ones.
+
+    Args:
+        args (argparse.Namespace): the parsed command line arguments.
+        today (datetime.datetime): the start of the report's range.
+        end_date (datetime.datetime): the end of the report's range.
+    """
+    import aiohttp
+    import keyring
+
+    from gradescraper.util.batch import load_accounts, retrieve_accounts
+    from gradescraper.util.cache import ResponseCache
+    from gradescraper.util.messenger import GradescopeMessenger
+    from gradescraper.util.profiler import Profiler
+    from gradescraper.util.retry import RetryPolicy, TokenBucket
+    from gradescraper.util.sync import incremental_sync
+    from gradescraper.util.watch import PollSchedule, watch
+
+    cache = None if args.no_cache else ResponseCache(max_age=args.max_cache_age)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    retry_policy = RetryPolicy(max_attempts=args.retries + 1)
+    # Watching and serving run indefinitely, so they aren't profiled
+    profiler = (
+        Profiler()
+        if (args.profile or args.profile_output)
+        and not (args.watch or args.serve)
+        else None
+    )
+    status = status_output(args)
+
+    if args.batch:
+        accounts = load_accounts(
+            args.batch, lambda email: keyring.get_password(SERVICE_ID, email)
+        )
+        print(
+            f'\U0001F4F6 Retrieving assignents for {len(accounts)} accounts...',
+            file=status,
+        )
+        results = await retrieve_accounts(
+            accounts,
+            max_accounts=args.max_accounts,
+            max_connections=args.max_connections,
+            max_in_flight=args.max_in_flight,
+            cache=cache,
+            parser=args.parser,
+            parse_mode=args.parse_mode,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            rate_limit=args.rate_limit,
+            profiler=profiler,
+        )
+        with open_store(args.db) as store:
+            for result in results:
+                if result.courses is not None:
+                    store.save(result.email, result.courses)
+        writer = open_writer(args, with_account=True)
+        if writer is not None:
+            # Every account's assignments are written as one document, each
+            # with the account it belongs to
+            writer.begin()
+            for result in results:
+                if result.error is None:
+                    for assignment in upcoming_assignments_for(
+                        result.courses, today, end_date
+                    ):
+                        writer.write(assignment, result.email)
+            writer.end()
+        for result in results:
+            if writer is None:
+                print()
+                print(result.email)
+            if result.error is not None:
+                print(
+                    f'Failed to retrieve assignments for {result.email}: {result.error}',
+                    file=status,
+                )
+                continue
+            if writer is None:
+                print_upcoming_assignments(
+                    upcoming_assignments_for(result.courses, today, end_date),
+                    today,
+                    end_date,
+                    args.days_forward,
+                )
+        report_profile(profiler, args)
+        return None
+
     if args.account:
         account_email, password = args.account
         if args.remember_me:
-            keyring.set_password(service_id, account_email, password)
-            keyring.set_password(service_id, 'STORED_EMAIL', account_email)
+            keyring.set_password(SERVICE_ID, account_email, password)
+            keyring.set_password(SERVICE_ID, 'STORED_EMAIL', account_email)
     else:
-        account_email = keyring.get_password(service_id, 'STORED_EMAIL')
-        password = keyring.get_password(service_id, account_email)
+        account_email = keyring.get_password(SERVICE_ID, 'STORED_EMAIL')
+        password = keyring.get_password(SERVICE_ID, account_email)
         if not (account_email and password):
             print(
-                'No stored account info was found. Please run with --account and --remember-me to save account information.'
+                'No stored account info was found. Please run with --account and --remember-me to save account information.',
+                file=status,
             )
             return None
 
-    print(f'\U0001F4F6 Retrieving assignents from courses...')
-    async with GradescopeMessenger(account_email, password) as messenger:
-        courses = await messenger.get_courses_and_assignments()
+    writer = open_writer(args)
 
-    # TODO should actually be datetime.now() in prod
-    today = datetime.datetime(2021, 4, 10)
-    end_date = today + datetime.timedelta(days=args.days_forward)
-    upcoming_assignments = [
-        assignment
-        for course in courses
-        for assignment in course.get_assignments_in_range(today, end_date)
-    ]
+    # Only cache the session for accounts whose credentials are stored too
+    cache_session = args.remember_me or not args.account
+    session_id = f'{account_email}:session'
 
-    print(
-        f'Upcoming assignments over the next {args.days_forward} days ({today:%m/%d}\U000027A1 {end_date:%m/%d}):'
-    )
-    print(
-        f'{"Course Name":<20} {"Assignment": <15}   Due Date        Submitted'
-    )
-    for assignment in upcoming_assignments:
-        print(assignment)
+    print('\U0001F4F6 Retrieving assignents from courses...', file=status)
+    async with GradescopeMessenger(
+        account_email,
+        password,
+        max_in_flight=args.max_in_flight,
+        cache=cache,
+        parser=args.parser,
+        parse_mode=args.parse_mode,
+        timeout=timeout,
+        retry_policy=retry_policy,
+        rate_limiter=TokenBucket(args.rate_limit) if args.rate_limit else None,
+        profiler=profiler,
+    ) as messenger:
+        stored_session = (
+            keyring.get_password(SERVICE_ID, session_id)
+            if cache_session
+            else None
+        )
+        if stored_session:
+            messenger.import_session(stored_session)
+
+        if args.serve:
+            from gradescraper.util.server import AssignmentService, serve
+
+            with open_store(args.db) as store:
+
+                def on_sync(result, changes):
+                    store.save(account_email, result.courses)
+                    if cache_session:
+                        keyring.set_password(
+                            SERVICE_ID, session_id, messenger.export_session()
+                        )
+                    print(
+                        f'{datetime.datetime.now():%m/%d %H:%M} Synced {len(result.fetched)} courses, {len(changes)} changes',
+                        file=status,
+                    )
+                    print_course_errors(result.courses, result.failed, status)
+
+                def on_sync_error(error):
+                    print(
+                        f'{datetime.datetime.now():%m/%d %H:%M} Failed to sync: {error}',
+                        file=status,
+                    )
+
+                # Answer from the last stored snapshot until the first sync
+                service = AssignmentService(
+                    store.load(account_email),
+                    days_forward=args.days_forward,
+                    now=lambda: today,
+                )
+                print(
+                    f'Serving assignments on http://{args.host}:{args.serve}, syncing every {args.sync_interval:g} seconds...',
+                    file=status,
+                )
+                await serve(
+                    messenger,
+                    service,
+                    PollSchedule(args.sync_interval),
+                    datetime.timedelta(seconds=args.fresh_for),
+                    host=args.host,
+                    port=args.serve,
+                    on_poll=on_sync,
+                    on_error=on_sync_error,
+                )
+            return None
+
+        if args.watch:
+            with open_store(args.db) as store:
+
+                def on_poll(result, changes):
+                    store.save(account_email, result.courses)
+                    if cache_session:
+                        keyring.set_password(
+                            SERVICE_ID, session_id, messenger.export_session()
+                        )
+                    for change in changes:
+                        print(f'{datetime.datetime.now():%m/%d %H:%M} {change}')
+                    print_course_errors(result.courses, result.failed)
+
+                def on_error(error):
+                    print(
+                        f'{datetime.datetime.now():%m/%d %H:%M} Failed to check for changes: {error}'
+                    )
+
+                print(f'Watching for changes every {args.watch:g} seconds...')
+                await watch(
+                    messenger,
+                    PollSchedule(args.watch),
+                    datetime.timedelta(seconds=args.fresh_for),
+                    on_poll,
+                    on_error,
+                    previous_courses=store.load(account_email),
+                )
+            return None
+
+        detail_errors = {}
+        if args.incremental:
+            with open_store(args.db) as store:
+                previous_courses = store.load(account_email)
+            result = await incremental_sync(
+                messenger,
+                previous_courses,
+                datetime.timedelta(seconds=args.fresh_for),
+            )
+            courses = result.courses
+            print(
+                f'Fetched {len(result.fetched)} courses, skipped {len(result.skipped)} unchanged courses',
+                file=status,
+            )
+        elif writer is not None and not args.sort:
+            courses = await messenger.get_courses()
+            writer.begin()
+            async for course, error in messenger.iter_assignments_for_courses(
+                courses, recent_only=True
+            ):
+                if error is None:
+                    course_assignments = course.due_date_index.in_range(
+                        today, end_date
+                    )
+                    if args.details:
+                        detail_errors.update(
+                            await messenger.retrieve_assignment_details(
+                                course_assignments
+                            )
+                        )
+                    for assignment in course_assignments:
+                        writer.write(assignment)
+            writer.end()
+        else:
+            courses = await messenger.get_courses_and_assignments()
+        if args.details and (writer is None or args.sort or args.incremental):
+            detail_errors = await messenger.retrieve_assignment_details(
+                upcoming_assignments_for(courses, today, end_date)
+            )
+        print_course_errors(courses, messenger.errors, status)
+        for url, error in detail_errors.items():
+            print(f'Failed to retrieve details of {url}: {error}', file=status)
+        if cache_session:
+            keyring.set_password(
+                SERVICE_ID, session_id, messenger.export_session()
+            )
+
+    with open_store(args.db) as store:
+        store.save(account_email, courses)
+
+    upcoming_assignments = upcoming_assignments_for(courses, today, end_date)
+    if writer is None:
+        print_upcoming_assignments(
+            upcoming_assignments, today, end_date, args.days_forward
+        )
+    elif args.sort or args.incremental:
+        # Otherwise, the assignments were written as they were retrieved
+        writer.write_all(upcoming_assignments)
+    report_profile(profiler, args)
 
 
 """
@@ -144,8 +743,10 @@ def silence_event_loop_closed(func):
 if __name__ == '__main__':
 
     # Silence the RuntimeError if the OS is Windows
-    if platform.system() == 'Windows':
+    if sys.platform == 'win32':
+        from asyncio.proactor_events import _ProactorBasePipeTransport
+
         _ProactorBasePipeTransport.__del__ = silence_event_loop_closed(
             _ProactorBasePipeTransport.__del__
         )
-    asyncio.run(main())
+    main()
@@ -1,4 +1,51 @@
 import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class AssignmentDetails(NamedTuple):
+    """Details of an assignment shown on its own page, but not in the list
+    of assignments on its course's page.
+
+    Attributes:
+        score (float, optional): the points scored, or None if the submission
+        hasn't been graded.
+        points_possible (float, optional): the points the assignment is out
+        of, or None if the page doesn't show them.
+        submitted_at (datetime.datetime, optional): when the latest
+        submission was made, or None if there is none.
+    """
+
+    score: Optional[float] = None
+    points_possible: Optional[float] = None
+    submitted_at: Optional[datetime.datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the AssignmentDetails to a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: the details, with dates in ISO format.
+        """
+        return {
+            'score': self.score,
+            'points_possible': self.points_possible,
+            'submitted_at': _isoformat(self.submitted_at),
+        }
+
+    @classmethod
+    def from_dict(cls, details_dict: Dict[str, Any]) -> 'AssignmentDetails':
+        """Create AssignmentDetails from a dictionary made by to_dict.
+
+        Args:
+            details_dict (Dict[str, Any]): the details.
+
+        Returns:
+            AssignmentDetails: the details described by details_dict.
+        """
+        return cls(
+            details_dict['score'],
+            details_dict['points_possible'],
+            _fromisoformat(details_dict['submitted_at']),
+        )
 
 
 class Assignment:
@@ -14,8 +61,25 @@ class Assignment:
         due_date (datetime.datetime, optional): the assignment's due date.
         late_due_date (datetime.datetime, optional): the assignment's late
         due date.
+        status (str, optional): the text of the row's status cell on the
+        course page, e.g. 'No Submission', 'Submitted', or a score such as
+        '38.5 / 40.0' once the assignment has been graded.
+        details (AssignmentDetails, optional): details from the assignment's
+        own page, if they have been retrieved.
     """
 
+    __slots__ = (
+        'name',
+        'course_name',
+        'url',
+        'submitted',
+        'release_date',
+        'due_date',
+        'late_due_date',
+        'status',
+        'details',
+    )
+
     def __init__(
         self,
         name: str,
@@ -25,6 +89,8 @@ class Assignment:
         release_date: datetime.datetime = None,
         due_date: datetime.datetime = None,
         late_due_date: datetime.datetime = None,
+        status: Optional[str] = None,
+        details: Optional[AssignmentDetails] = None,
     ):
         """Create an Assignment with possible due dates.
 
@@ -39,6 +105,10 @@ class Assignment:
             Defaults to None.
             late_due_date (datetime.datetime, optional): the assignment's late
             due date. Defaults to None.
+            status (str, optional): the text of the row's status cell on the
+            course page. Defaults to None.
+            details (AssignmentDetails, optional): details from the
+            assignment's own page. Defaults to None.
         """
         self.name = name
         self.course_name = course_name
@@ -47,7 +117,74 @@ class Assignment:
         self.release_date = release_date
         self.due_date = due_date
         self.late_due_date = late_due_date
+        self.status = status
+        self.details = details
+
+    @property
+    def key(self) -> str:
+        """str: a key identifying the assignment within its course.
+
+        Assignments without a URL, such as unsubmitted ones, are identified by
+        their course name and name instead.
+        """
+        return self.url or f'{self.course_name}/{self.name}'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the Assignment to a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: the Assignment's attributes, with dates in ISO
+            format.
+        """
+        return {
+            'name': self.name,
+            'course_name': self.course_name,
+            'url': self.url,
+            'submitted': self.submitted,
+            'release_date': _isoformat(self.release_date),
+            'due_date': _isoformat(self.due_date),
+            'late_due_date': _isoformat(self.late_due_date),
+            'status': self.status,
+            'details': self.details and self.details.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, assignment_dict: Dict[str, Any]) -> 'Assignment':
+        """Create an Assignment from a dictionary made by to_dict.
+
+        Args:
+            assignment_dict (Dict[str, Any]): the Assignment's attributes.
+
+        Returns:
+            Assignment: the Assignment described by assignment_dict.
+        """
+        return cls(
+            assignment_dict['name'],
+            assignment_dict['course_name'],
+            assignment_dict['url'],
+            assignment_dict['submitted'],
+            _fromisoformat(assignment_dict['release_date']),
+            _fromisoformat(assignment_dict['due_date']),
+            _fromisoformat(assignment_dict['late_due_date']),
+            # Older entries, e.g. in the response cache, have no status or
+            # details
+            assignment_dict.get('status'),
+            AssignmentDetails.from_dict(assignment_dict['details'])
+            if assignment_dict.get('details')
+            else None,
+        )
 
     def __str__(self):
         submission_emoji = '\U00002705' if self.submitted else '\U0000274C'
-        return f'{self.course_name[:18]:<20} \U0001F4D3{self.name[:15]: <15} \U0001F4C5{self.due_date:%m/%d %I:%M%p} {submission_emoji}'
+        line = f'{self.course_name[:18]:<20} \U0001F4D3{self.name[:15]: <15} \U0001F4C5{self.due_date:%m/%d %I:%M%p} {submission_emoji}'
+        if self.details and self.details.score is not None:
+            line += f' {self.details.score:g} / {self.details.points_possible or 0:g}'
+        return line
+
+
+def _isoformat(date: datetime.datetime):
+    return date.isoformat() if date else None
+
+
+def _fromisoformat(date_string: str):
+    return datetime.datetime.fromisoformat(date_string) if date_string else None
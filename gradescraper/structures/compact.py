@@ -0,0 +1,164 @@
+import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+from gradescraper.structures.assignment import Assignment, AssignmentDetails
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+from gradescraper.structures.timestamp import from_timestamp, to_timestamp
+
+
+class CompactAssignment(NamedTuple):
+    """An immutable, tuple-backed equivalent of an Assignment.
+
+    Dates are stored as integer timestamps, which take less memory than
+    datetimes and can be compared and sorted directly. The release_date,
+    due_date and late_due_date properties convert them back to datetimes, so
+    CompactAssignments can be read like Assignments.
+
+    Attributes:
+        name (str): the assignment name.
+        course_name (str): the name of the course the assignment belongs to.
+        url (str): the assignment's full URL.
+        submitted (bool): the user's submission status for the assignment.
+        release_timestamp (int, optional): the assignment's release date.
+        due_timestamp (int, optional): the assignment's due date.
+        late_due_timestamp (int, optional): the assignment's late due date.
+        status (str, optional): the text of the row's status cell on the
+        course page.
+        details (AssignmentDetails, optional): details from the assignment's
+        own page, if they have been retrieved.
+    """
+
+    name: str
+    course_name: str
+    url: str
+    submitted: bool
+    release_timestamp: Optional[int] = None
+    due_timestamp: Optional[int] = None
+    late_due_timestamp: Optional[int] = None
+    status: Optional[str] = None
+    details: Optional[AssignmentDetails] = None
+
+    @classmethod
+    def from_assignment(cls, assignment: Assignment) -> 'CompactAssignment':
+        """Create a CompactAssignment with the same values as an Assignment.
+
+        Args:
+            assignment (Assignment): the assignment to copy.
+
+        Returns:
+            CompactAssignment: the compact copy.
+        """
+        return cls(
+            assignment.name,
+            assignment.course_name,
+            assignment.url,
+            assignment.submitted,
+            to_timestamp(assignment.release_date),
+            to_timestamp(assignment.due_date),
+            to_timestamp(assignment.late_due_date),
+            assignment.status,
+            assignment.details,
+        )
+
+    def to_assignment(self) -> Assignment:
+        """Create an Assignment with the same values.
+
+        Returns:
+            Assignment: the Assignment equivalent of this CompactAssignment.
+        """
+        return Assignment(
+            self.name,
+            self.course_name,
+            self.url,
+            self.submitted,
+            self.release_date,
+            self.due_date,
+            self.late_due_date,
+            self.status,
+            self.details,
+        )
+
+    @property
+    def release_date(self) -> Optional[datetime.datetime]:
+        return from_timestamp(self.release_timestamp)
+
+    @property
+    def due_date(self) -> Optional[datetime.datetime]:
+        return from_timestamp(self.due_timestamp)
+
+    @property
+    def late_due_date(self) -> Optional[datetime.datetime]:
+        return from_timestamp(self.late_due_timestamp)
+
+    def __str__(self):
+        return Assignment.__str__(self)
+
+
+class CompactCourse(NamedTuple):
+    """An immutable, tuple-backed equivalent of a Course.
+
+    Attributes:
+        term (Term): the school term that the Course takes place during.
+        number (int): the course's number on the Gradescope system.
+        short_name (str): the course's short name in the Gradescope system.
+        name (str): The course's full name.
+        assignments_num (int): the number of assignments in the Course at the
+        time it was parsed.
+        assignments (Tuple[CompactAssignment, ...]): the Course's assignments.
+    """
+
+    term: Term
+    number: int
+    short_name: str
+    name: str
+    assignments_num: int
+    assignments: Tuple[CompactAssignment, ...] = ()
+
+    @classmethod
+    def from_course(cls, course: Course) -> 'CompactCourse':
+        """Create a CompactCourse with the same values as a Course.
+
+        Args:
+            course (Course): the course to copy, along with its assignments.
+
+        Returns:
+            CompactCourse: the compact copy.
+        """
+        return cls(
+            course.term,
+            course.number,
+            course.short_name,
+            course.name,
+            course.assignments_num,
+            tuple(
+                CompactAssignment.from_assignment(assignment)
+                for assignment in course.assignments
+            ),
+        )
+
+    def to_course(self) -> Course:
+        """Create a Course with the same values and assignments.
+
+        Returns:
+            Course: the Course equivalent of this CompactCourse.
+        """
+        course = Course(
+            self.term, self.number, self.short_name, self.name, self.assignments_num
+        )
+        course.assignments = [
+            assignment.to_assignment() for assignment in self.assignments
+        ]
+        return course
+
+
+def compact_courses(courses: List[Course]) -> List[CompactCourse]:
+    """Convert Courses and their assignments to their compact equivalents.
+
+    Args:
+        courses (List[Course]): the courses to convert.
+
+    Returns:
+        List[CompactCourse]: the compact copies of the courses.
+    """
+    return [CompactCourse.from_course(course) for course in courses]
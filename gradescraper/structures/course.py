@@ -1,8 +1,9 @@
 import datetime
-from typing import List
+from typing import List, Optional
 from collections import namedtuple
 
 from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.due_date_index import DueDateIndex
 from gradescraper.structures.term import Term
 
 class Course:
@@ -17,8 +18,24 @@ class Course:
         name (str): The course's full name.
         assignments_num (int): the number of assignments in the Course at the 
         time it was parsed.
+        assignments (List[Assignment]): the Course's assignments, if they have
+        been retrieved. Assign a new list rather than modifying it in place,
+        so that the Course's due date index is rebuilt.
+        retrieved_at (datetime.datetime, optional): when the Course's
+        assignments were retrieved, or None if they haven't been.
     """
 
+    __slots__ = (
+        'term',
+        'number',
+        'short_name',
+        'name',
+        'assignments_num',
+        '_assignments',
+        '_due_date_index',
+        'retrieved_at',
+    )
+
     def __init__(
         self,
         term: Term,
@@ -47,16 +64,35 @@ class Course:
         self.name = name
         self.assignments_num = assignments_num
         self.assignments = []
+        self.retrieved_at: Optional[datetime.datetime] = None
         return None
     
     def __repr__(self) -> str:
         return str(namedtuple('Course', ['name', 'number'])(self.name, self.number))
+
+    @property
+    def assignments(self) -> List[Assignment]:
+        return self._assignments
+
+    @assignments.setter
+    def assignments(self, assignments: List[Assignment]):
+        self._assignments = assignments
+        self._due_date_index = None
+
+    @property
+    def due_date_index(self) -> DueDateIndex:
+        """DueDateIndex: an index of the Course's assignments by due date,
+        built when first needed."""
+        if self._due_date_index is None:
+            self._due_date_index = DueDateIndex(self._assignments)
+        return self._due_date_index
     
     def get_assignments_in_range(
         self,
         start_date: datetime.datetime,
         end_date: datetime.datetime,
         unsubmitted_only: bool = False,
+        include_late: bool = False,
     ) -> List[Assignment]:
         """Get the assignments within the specified range.
 
@@ -66,6 +102,9 @@ class Course:
         invalid range is passed (start_date refers to a date after end_date),
         an empty List is returned.
 
+        The Course's due date index is used, so only the assignments in the
+        range are visited.
+
         Args:
             start_date (datetime.datetime): The start date of the range to
             search for assignments over.
@@ -73,27 +112,16 @@ class Course:
             for assignments over.
             unsubmitted_only (bool, optional): Whether to only return
             unsubmitted assignments. Defaults to False.
+            include_late (bool, optional): Whether to also return assignments
+            whose late due date falls in the range. Defaults to False.
 
         Returns:
-            List[Assignment]: The assignments contained in the specified range.
+            List[Assignment]: The assignments contained in the specified range,
+            ordered by due date.
         """
-        if start_date > end_date:
-            return []
-
-        assignments_to_return = []
-        for assignment in self.assignments:
-            if (
-                assignment.due_date >= start_date
-                and assignment.due_date <= end_date
-            ):
-                if unsubmitted_only:
-                    if not assignment.submitted:
-                        assignments_to_return.append(assignment)
-                else:
-                    assignments_to_return.append(assignment)
-        # TODO add or to handle late due date
-
-        return assignments_to_return
+        return self.due_date_index.in_range(
+            start_date, end_date, unsubmitted_only, include_late
+        )
 
     def __str__(self):
         return f'{self.term}: {self.short_name} ({self.name})\t Assignments: {self.assignments_num}\t #:{self.number}'
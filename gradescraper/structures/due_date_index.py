@@ -0,0 +1,248 @@
+import bisect
+import datetime
+import heapq
+from operator import attrgetter, itemgetter
+from typing import Callable, Iterable, List, Optional
+
+from gradescraper.structures.assignment import Assignment
+
+
+class _SortedAssignments:
+    """Assignments sorted by one of their dates, with the dates kept alongside
+    so that ranges can be found by bisection."""
+
+    __slots__ = ('keys', 'assignments')
+
+    def __init__(self, keys: List[datetime.datetime], assignments: List[Assignment]):
+        self.keys = keys
+        self.assignments = assignments
+
+    @classmethod
+    def build(
+        cls,
+        assignments: Iterable[Assignment],
+        get_date: Callable[[Assignment], Optional[datetime.datetime]],
+    ) -> '_SortedAssignments':
+        # sorted is stable, so assignments sharing a date keep their order
+        entries = sorted(
+            (
+                (get_date(assignment), assignment)
+                for assignment in assignments
+                if get_date(assignment) is not None
+            ),
+            key=itemgetter(0),
+        )
+        return cls(
+            [date for date, _ in entries],
+            [assignment for _, assignment in entries],
+        )
+
+    @classmethod
+    def merge(
+        cls, sorted_assignments: Iterable['_SortedAssignments']
+    ) -> '_SortedAssignments':
+        entries = list(
+            heapq.merge(
+                *[
+                    zip(dates.keys, dates.assignments)
+                    for dates in sorted_assignments
+                ],
+                key=itemgetter(0),
+            )
+        )
+        return cls(
+            [date for date, _ in entries],
+            [assignment for _, assignment in entries],
+        )
+
+    def between(
+        self,
+        start_date: Optional[datetime.datetime],
+        end_date: Optional[datetime.datetime],
+    ) -> List[Assignment]:
+        start = 0 if start_date is None else bisect.bisect_left(self.keys, start_date)
+        end = (
+            len(self.keys)
+            if end_date is None
+            else bisect.bisect_right(self.keys, end_date)
+        )
+        return self.assignments[start:end]
+
+    def before(self, date: datetime.datetime) -> List[Assignment]:
+        return self.assignments[: bisect.bisect_left(self.keys, date)]
+
+
+class DueDateIndex:
+    """An index of assignments by due date and late due date.
+
+    Assignments are sorted once when the index is built, after which range
+    queries take O(log n + k) time for k results, with the exception of
+    in_late_window (see its docstring). Unsubmitted assignments are
+    indexed separately, so filtering them out doesn't require a scan.
+    Assignments without a due date are not indexed.
+
+    Indexes for separate courses can be combined with merge, which takes linear
+    time since each index is already sorted.
+
+    Note:
+        The index is a snapshot. If assignments are added or their dates or
+        submission statuses change, a new index must be built.
+    """
+
+    __slots__ = (
+        '_due',
+        '_unsubmitted_due',
+        '_late_due',
+        '_unsubmitted_late_due',
+        '_max_late_period',
+    )
+    _sorted_slots = __slots__[:4]
+
+    def __init__(self, assignments: Iterable[Assignment] = ()):
+        """Create an index of the given assignments.
+
+        Args:
+            assignments (Iterable[Assignment], optional): the assignments to
+            index. Defaults to ().
+        """
+        assignments = list(assignments)
+        unsubmitted = [
+            assignment for assignment in assignments if not assignment.submitted
+        ]
+        get_due_date = attrgetter('due_date')
+        get_late_due_date = attrgetter('late_due_date')
+        self._due = _SortedAssignments.build(assignments, get_due_date)
+        self._unsubmitted_due = _SortedAssignments.build(unsubmitted, get_due_date)
+        self._late_due = _SortedAssignments.build(assignments, get_late_due_date)
+        self._unsubmitted_late_due = _SortedAssignments.build(
+            unsubmitted, get_late_due_date
+        )
+        # The longest time between an unsubmitted assignment's due date and
+        # its late due date, which bounds the scan in in_late_window
+        self._max_late_period = max(
+            (
+                assignment.late_due_date - assignment.due_date
+                for assignment in unsubmitted
+                if assignment.due_date and assignment.late_due_date
+            ),
+            default=None,
+        )
+
+    @classmethod
+    def merge(cls, indexes: Iterable['DueDateIndex']) -> 'DueDateIndex':
+        """Combine several indexes, e.g. one per course, into one.
+
+        Assignments sharing a due date are ordered by the order of the indexes
+        they came from.
+
+        Args:
+            indexes (Iterable[DueDateIndex]): the indexes to combine.
+
+        Returns:
+            DueDateIndex: an index of every assignment in the given indexes.
+        """
+        indexes = list(indexes)
+        merged = cls.__new__(cls)
+        for attribute in cls._sorted_slots:
+            setattr(
+                merged,
+                attribute,
+                _SortedAssignments.merge(getattr(index, attribute) for index in indexes),
+            )
+        merged._max_late_period = max(
+            (
+                index._max_late_period
+                for index in indexes
+                if index._max_late_period is not None
+            ),
+            default=None,
+        )
+        return merged
+
+    def __len__(self) -> int:
+        return len(self._due.assignments)
+
+    def in_range(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        unsubmitted_only: bool = False,
+        include_late: bool = False,
+    ) -> List[Assignment]:
+        """Get the assignments due within the specified range.
+
+        Args:
+            start_date (datetime.datetime): The start date of the range,
+            inclusive.
+            end_date (datetime.datetime): The end date of the range, inclusive.
+            unsubmitted_only (bool, optional): Whether to only return
+            unsubmitted assignments. Defaults to False.
+            include_late (bool, optional): Whether to also return assignments
+            whose late due date, rather than due date, is within the range.
+            Defaults to False.
+
+        Returns:
+            List[Assignment]: The assignments in the range, ordered by due
+            date. An empty List is returned if start_date is after end_date.
+        """
+        if start_date > end_date:
+            return []
+
+        due = self._unsubmitted_due if unsubmitted_only else self._due
+        in_range = due.between(start_date, end_date)
+        if not include_late:
+            return in_range
+
+        late_due = self._unsubmitted_late_due if unsubmitted_only else self._late_due
+        found = set(map(id, in_range))
+        late_only = [
+            assignment
+            for assignment in late_due.between(start_date, end_date)
+            if id(assignment) not in found
+        ]
+        if not late_only:
+            return in_range
+        late_only.sort(key=attrgetter('due_date'))
+        return list(heapq.merge(late_only, in_range, key=attrgetter('due_date')))
+
+    def overdue(self, now: datetime.datetime) -> List[Assignment]:
+        """Get the unsubmitted assignments whose due date has passed.
+
+        Args:
+            now (datetime.datetime): the current date.
+
+        Returns:
+            List[Assignment]: the overdue assignments, ordered by due date.
+        """
+        return self._unsubmitted_due.before(now)
+
+    def in_late_window(self, now: datetime.datetime) -> List[Assignment]:
+        """Get the unsubmitted assignments that can only be submitted late.
+
+        These are the assignments whose due date has passed but whose late
+        due date has not.
+
+        This isn't a single range of either date, so it takes O(log n + m)
+        time rather than O(log n + k): only the m unsubmitted assignments
+        whose late due date is at most the longest late period after now are
+        scanned. Since late periods are usually a few days long, m is usually
+        close to k.
+
+        Args:
+            now (datetime.datetime): the current date.
+
+        Returns:
+            List[Assignment]: the assignments in their late window, ordered by
+            late due date.
+        """
+        if self._max_late_period is None:
+            return []
+        # An assignment in its late window has due_date < now <= late_due_date
+        # <= due_date + _max_late_period, so its late due date is in this range
+        return [
+            assignment
+            for assignment in self._unsubmitted_late_due.between(
+                now, now + self._max_late_period
+            )
+            if assignment.due_date is not None and assignment.due_date < now
+        ]
@@ -0,0 +1,298 @@
+import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.timestamp import to_timestamp
+
+ONE_DAY = datetime.timedelta(days=1)
+_NAT = np.datetime64('NaT', 's').astype(np.int64)
+
+
+def _dates(dates: Iterable[Optional[datetime.datetime]]) -> np.ndarray:
+    # Going through integer timestamps is several times faster than letting
+    # NumPy convert the datetimes. None becomes NaT, which compares False
+    # with every date, so assignments missing a date never fall in a range.
+    return np.fromiter(
+        (_NAT if date is None else to_timestamp(date) for date in dates),
+        dtype=np.int64,
+    ).view('datetime64[s]')
+
+
+def _date(date: datetime.datetime) -> np.datetime64:
+    return np.datetime64(date, 's')
+
+
+class AssignmentTable:
+    """A columnar table of assignments, for queries over many assignments at
+    once, e.g. every course of every account in a batch.
+
+    Each column is a NumPy array with an entry per assignment, so filters and
+    counts are vectorized operations over the whole table instead of Python
+    loops over Assignment objects. The table is a snapshot: if assignments
+    change, a new table must be built.
+
+    Attributes:
+        assignments (List[Assignment]): the assignments, in the order of the
+        table's rows.
+        release_dates (np.ndarray): the release date of each assignment, as
+        datetime64[s], or NaT if it has none.
+        due_dates (np.ndarray): the due date of each assignment, as
+        datetime64[s], or NaT if it has none.
+        late_due_dates (np.ndarray): the late due date of each assignment, as
+        datetime64[s], or NaT if it has none.
+        submitted (np.ndarray): the submission status of each assignment.
+        course_ids (np.ndarray): the index in course_names of each
+        assignment's course.
+        course_names (List[str]): the name of each course in the table.
+    """
+
+    def __init__(
+        self,
+        assignments: List[Assignment],
+        course_ids: Iterable[int],
+        course_names: List[str],
+    ):
+        """Create an AssignmentTable.
+
+        from_courses and from_assignments are usually more convenient.
+
+        Args:
+            assignments (List[Assignment]): the assignments.
+            course_ids (Iterable[int]): the index in course_names of each
+            assignment's course.
+            course_names (List[str]): the name of each course.
+        """
+        self.assignments = assignments
+        self.release_dates = _dates(
+            assignment.release_date for assignment in assignments
+        )
+        self.due_dates = _dates(assignment.due_date for assignment in assignments)
+        self.late_due_dates = _dates(
+            assignment.late_due_date for assignment in assignments
+        )
+        self.submitted = np.fromiter(
+            (assignment.submitted for assignment in assignments),
+            dtype=bool,
+            count=len(assignments),
+        )
+        self.course_ids = np.fromiter(
+            course_ids, dtype=np.int32, count=len(assignments)
+        )
+        self.course_names = course_names
+
+    @classmethod
+    def from_courses(cls, courses: List[Course]) -> 'AssignmentTable':
+        """Create a table of the assignments of several courses.
+
+        Courses with the same name, e.g. from different terms or accounts,
+        are kept apart.
+
+        Args:
+            courses (List[Course]): the courses.
+
+        Returns:
+            AssignmentTable: a table whose course ids are the indexes of the
+            assignments' courses in courses.
+        """
+        return cls(
+            [assignment for course in courses for assignment in course.assignments],
+            (
+                course_id
+                for course_id, course in enumerate(courses)
+                for _ in course.assignments
+            ),
+            [course.name for course in courses],
+        )
+
+    @classmethod
+    def from_assignments(cls, assignments: Iterable[Assignment]) -> 'AssignmentTable':
+        """Create a table of assignments, grouping them into courses by their
+        course names.
+
+        Args:
+            assignments (Iterable[Assignment]): the assignments.
+
+        Returns:
+            AssignmentTable: a table whose course names are in the order they
+            first appear in.
+        """
+        assignments = list(assignments)
+        course_ids: Dict[str, int] = {}
+        return cls(
+            assignments,
+            [
+                course_ids.setdefault(assignment.course_name, len(course_ids))
+                for assignment in assignments
+            ],
+            list(course_ids),
+        )
+
+    def __len__(self) -> int:
+        return len(self.assignments)
+
+    def range_mask(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        unsubmitted_only: bool = False,
+        include_late: bool = False,
+    ) -> np.ndarray:
+        """Find the assignments due within the specified range.
+
+        Args:
+            start_date (datetime.datetime): The start date of the range,
+            inclusive.
+            end_date (datetime.datetime): The end date of the range, inclusive.
+            unsubmitted_only (bool, optional): Whether to only include
+            unsubmitted assignments. Defaults to False.
+            include_late (bool, optional): Whether to also include assignments
+            whose late due date, rather than due date, is within the range.
+            Defaults to False.
+
+        Returns:
+            np.ndarray: a boolean mask of the table's rows in the range.
+        """
+        start, end = _date(start_date), _date(end_date)
+        mask = (self.due_dates >= start) & (self.due_dates <= end)
+        if include_late:
+            mask |= (self.late_due_dates >= start) & (self.late_due_dates <= end)
+        if unsubmitted_only:
+            mask &= ~self.submitted
+        return mask
+
+    def in_range(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        unsubmitted_only: bool = False,
+        include_late: bool = False,
+    ) -> List[Assignment]:
+        """Get the assignments due within the specified range.
+
+        This returns the same assignments as DueDateIndex.in_range.
+
+        Args:
+            start_date (datetime.datetime): The start date of the range,
+            inclusive.
+            end_date (datetime.datetime): The end date of the range, inclusive.
+            unsubmitted_only (bool, optional): Whether to only return
+            unsubmitted assignments. Defaults to False.
+            include_late (bool, optional): Whether to also return assignments
+            whose late due date, rather than due date, is within the range.
+            Defaults to False.
+
+        Returns:
+            List[Assignment]: The assignments in the range, ordered by due
+            date.
+        """
+        rows = np.flatnonzero(
+            self.range_mask(start_date, end_date, unsubmitted_only, include_late)
+        )
+        # Late-only rows may have no due date; NaT sorts last
+        rows = rows[np.argsort(self.due_dates[rows], kind='stable')]
+        return [self.assignments[row] for row in rows]
+
+    def count_overdue(self, now: datetime.datetime) -> int:
+        """Count the unsubmitted assignments whose due date has passed.
+
+        Args:
+            now (datetime.datetime): the current date.
+
+        Returns:
+            int: the number of overdue assignments.
+        """
+        return int(np.count_nonzero((self.due_dates < _date(now)) & ~self.submitted))
+
+    def overdue_by_course(self, now: datetime.datetime) -> np.ndarray:
+        """Count the unsubmitted assignments of each course whose due date has
+        passed.
+
+        Args:
+            now (datetime.datetime): the current date.
+
+        Returns:
+            np.ndarray: the number of overdue assignments of each course, in
+            the order of course_names.
+        """
+        mask = (self.due_dates < _date(now)) & ~self.submitted
+        return np.bincount(self.course_ids[mask], minlength=len(self.course_names))
+
+    def workload_by_course(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        unsubmitted_only: bool = False,
+    ) -> np.ndarray:
+        """Count the assignments of each course due within the specified
+        range.
+
+        Args:
+            start_date (datetime.datetime): The start date of the range,
+            inclusive.
+            end_date (datetime.datetime): The end date of the range, inclusive.
+            unsubmitted_only (bool, optional): Whether to only count
+            unsubmitted assignments. Defaults to False.
+
+        Returns:
+            np.ndarray: the number of assignments of each course due in the
+            range, in the order of course_names.
+        """
+        mask = self.range_mask(start_date, end_date, unsubmitted_only)
+        return np.bincount(self.course_ids[mask], minlength=len(self.course_names))
+
+    def workload_by_day(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        unsubmitted_only: bool = False,
+        by_course: bool = False,
+        bin_size: datetime.timedelta = ONE_DAY,
+    ) -> np.ndarray:
+        """Count the assignments due in each day of a window.
+
+        The window is split into bins of bin_size starting at start_date, so
+        bins line up with calendar days when start_date is midnight. Each bin
+        includes its start but not its end, and the last bin is cut off at
+        end_date, which is not included.
+
+        Args:
+            start_date (datetime.datetime): The start of the window, inclusive.
+            end_date (datetime.datetime): The end of the window, exclusive.
+            unsubmitted_only (bool, optional): Whether to only count
+            unsubmitted assignments. Defaults to False.
+            by_course (bool, optional): Whether to count each course's
+            assignments separately. Defaults to False.
+            bin_size (datetime.timedelta, optional): The length of each bin.
+            Defaults to one day.
+
+        Raises:
+            ValueError: if bin_size is shorter than a second.
+
+        Returns:
+            np.ndarray: the number of assignments due in each bin. If by_course
+            is True, a row for each course in the order of course_names, with
+            a column for each bin.
+        """
+        bin_seconds = bin_size // datetime.timedelta(seconds=1)
+        if bin_seconds < 1:
+            raise ValueError(f'bin_size must be at least a second, not {bin_size}')
+        start, end = _date(start_date), _date(end_date)
+        window_seconds = int((end - start) // np.timedelta64(1, 's'))
+        # Round up, so that a partial last bin is kept
+        num_bins = max(0, -(-window_seconds // bin_seconds))
+
+        mask = (self.due_dates >= start) & (self.due_dates < end)
+        if unsubmitted_only:
+            mask &= ~self.submitted
+        bins = (self.due_dates[mask] - start) // np.timedelta64(bin_seconds, 's')
+        if not by_course:
+            return np.bincount(bins, minlength=num_bins)
+
+        num_courses = len(self.course_names)
+        cells = self.course_ids[mask].astype(np.int64) * num_bins + bins
+        return np.bincount(cells, minlength=num_courses * num_bins).reshape(
+            num_courses, num_bins
+        )
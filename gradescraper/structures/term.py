@@ -1,22 +1,32 @@
 import functools
 
+# The order of seasons within a year, from earliest to latest
+SEASON_VALUES = {'Spring': 0, 'Summer': 1, 'Fall': 2, 'Winter': 3}
+
 
 @functools.total_ordering
 class Term:
     """A class to represent a school term that courses can take place during.
 
+    Terms are immutable, and their sort key is computed once when they are
+    created, so comparing and sorting them is cheap.
+
     Note:
-        Currently only the 4 seasons are valid entries for the season attribute.
-        Terms occuring further in the past are evaluated as less than terms 
-        occuring more recently when compared.
+        Currently only the 4 seasons are recognized for the season attribute.
+        Terms with other seasons are ordered before the recognized seasons of
+        the same year. Terms occuring further in the past are evaluated as less
+        than terms occuring more recently when compared.
 
     Attributes:
         season (str): the term's season.
         year (int): the term's year.
+        sort_key (int): an integer that orders terms from least to most recent.
     """
     year: int
     season: str
 
+    __slots__ = ('_season', '_year', '_sort_key')
+
     def __init__(self, season: str, year: int):
         """Create a Term for the given season during the given year.
 
@@ -24,22 +34,37 @@ class Term:
             season (str): the term's season.
             year (int): the term's year.
         """
-        self.season = season
-        self.year = year
+        self._season = season
+        self._year = year
+        self._sort_key = int(year) * (len(SEASON_VALUES) + 1) + (
+            SEASON_VALUES.get(season, -1) + 1
+        )
+
+    @property
+    def season(self) -> str:
+        return self._season
+
+    @property
+    def year(self) -> int:
+        return self._year
+
+    @property
+    def sort_key(self) -> int:
+        return self._sort_key
 
     def __repr__(self) -> str:
         return f'{self.season} {self.year}'
 
     def __gt__(self, o: object):
         # More recent terms are greater than older terms
-        # TODO handle unexpected seasons
-        season_values = {"Spring": 0, "Summer": 1, "Fall": 2, "Winter": 3}
-        if self.year > o.year:
-            return True
-        elif season_values[self.season] > season_values[o.season]:
-            return True
-        else:
-            return False
+        return self._sort_key > o.sort_key
+
+    def __lt__(self, o: object):
+        # Defined directly, rather than by total_ordering, since sorting uses it
+        return self._sort_key < o.sort_key
 
     def __eq__(self, o: object):
-        return self.year == o.year and self.season == o.season
+        return self._year == o.year and self._season == o.season
+
+    def __hash__(self):
+        return hash((self._season, self._year))
@@ -0,0 +1,36 @@
+import datetime
+from typing import Optional
+
+# This module doesn't import the other structures, so that code which just
+# reads stored dates, like the CLI's --offline report, starts quickly
+EPOCH = datetime.datetime(1970, 1, 1)
+ONE_SECOND = datetime.timedelta(seconds=1)
+
+
+def to_timestamp(date: Optional[datetime.datetime]) -> Optional[int]:
+    """Convert a naive datetime to whole seconds since EPOCH.
+
+    Gradescope's dates are parsed without a timezone, so they are converted as
+    they are rather than through the local timezone.
+
+    Args:
+        date (datetime.datetime, optional): the date to convert.
+
+    Returns:
+        Optional[int]: the number of seconds from EPOCH to date, or None if
+        date is None.
+    """
+    return None if date is None else (date - EPOCH) // ONE_SECOND
+
+
+def from_timestamp(timestamp: Optional[int]) -> Optional[datetime.datetime]:
+    """Convert seconds since EPOCH, as returned by to_timestamp, to a datetime.
+
+    Args:
+        timestamp (int, optional): the number of seconds since EPOCH.
+
+    Returns:
+        Optional[datetime.datetime]: the naive datetime, or None if timestamp
+        is None.
+    """
+    return None if timestamp is None else EPOCH + timestamp * ONE_SECOND
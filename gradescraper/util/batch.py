@@ -0,0 +1,171 @@
+import asyncio
+import json
+from typing import Callable, List, NamedTuple, Optional
+
+import aiohttp
+
+from gradescraper.structures.course import Course
+from gradescraper.util.cache import ResponseCache
+from gradescraper.util.executor import ParseExecutor
+from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.profiler import Profiler
+from gradescraper.util.retry import RetryPolicy, TokenBucket
+
+
+class Account(NamedTuple):
+    """The credentials of a Gradescope account."""
+
+    email: str
+    password: str
+
+
+class AccountResult(NamedTuple):
+    """The outcome of retrieving one account's courses in a batch.
+
+    Attributes:
+        email (str): the email address of the account.
+        courses (List[Course], optional): the account's courses and
+        assignments, or None if retrieving them failed.
+        error (Exception, optional): the error raised while retrieving the
+        account's courses, if any.
+    """
+
+    email: str
+    courses: Optional[List[Course]]
+    error: Optional[Exception]
+
+
+def load_accounts(
+    path: str, get_password: Optional[Callable[[str], Optional[str]]] = None
+) -> List[Account]:
+    """Load a list of accounts from a JSON file.
+
+    The file should contain a list of objects with an 'email' key and,
+    optionally, a 'password' key. Passwords that are missing from the file are
+    looked up with get_password, e.g. from the keyring.
+
+    Args:
+        path (str): the path of the JSON file.
+        get_password (Callable[[str], Optional[str]], optional): a function
+        returning the password for an email address, or None if it is unknown.
+        Defaults to None.
+
+    Raises:
+        ValueError: if an account has no password in the file and none is
+        returned by get_password.
+
+    Returns:
+        List[Account]: the accounts in the file, in order.
+    """
+    with open(path) as accounts_file:
+        entries = json.load(accounts_file)
+
+    accounts = []
+    for entry in entries:
+        email = entry['email']
+        password = entry.get('password') or (get_password and get_password(email))
+        if not password:
+            raise ValueError(f'No password was found for {email}')
+        accounts.append(Account(email, password))
+    return accounts
+
+
+async def _retrieve_account(
+    account: Account,
+    accounts_limit: asyncio.Semaphore,
+    recent_only: bool,
+    **messenger_options,
+) -> AccountResult:
+    async with accounts_limit:
+        try:
+            async with GradescopeMessenger(
+                account.email, account.password, **messenger_options
+            ) as messenger:
+                courses = await messenger.get_courses_and_assignments(recent_only)
+        except Exception as error:
+            return AccountResult(account.email, None, error)
+        return AccountResult(account.email, courses, None)
+
+
+async def retrieve_accounts(
+    accounts: List[Account],
+    max_accounts: int = 16,
+    max_connections: int = 64,
+    max_in_flight: int = 6,
+    cache: Optional[ResponseCache] = None,
+    parser: str = 'soup',
+    parse_mode: str = 'inline',
+    recent_only: bool = True,
+    timeout: Optional[aiohttp.ClientTimeout] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    rate_limit: Optional[float] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[AccountResult]:
+    """Retrieve the courses and assignments of many accounts concurrently.
+
+    Every account gets its own GradescopeMessenger, and so its own session and
+    cookie jar, but they share one connector. Open connections, and the DNS
+    cache, are reused across accounts, and max_connections bounds the number
+    of connections open at once across all of them. A failure in one account
+    is recorded in its result and does not affect the others.
+
+    Args:
+        accounts (List[Account]): the accounts to retrieve.
+        max_accounts (int, optional): the maximum number of accounts retrieved
+        at once. Defaults to 16.
+        max_connections (int, optional): the maximum number of connections open
+        at once across all accounts. Defaults to 64.
+        max_in_flight (int, optional): the maximum number of course pages
+        fetched at once for each account. Defaults to 6.
+        cache (ResponseCache, optional): a cache to store course pages in,
+        shared by every account. Defaults to None.
+        parser (str, optional): the backend used to parse course pages, either
+        'soup' or 'stream'. Defaults to 'soup'.
+        parse_mode (str, optional): where whole pages are parsed, see
+        ParseExecutor. A single pool is shared by every account. Defaults to
+        'inline'.
+        recent_only (bool, optional): Whether to only fetch courses occuring in
+        the most recent term. Defaults to True.
+        timeout (aiohttp.ClientTimeout, optional): the timeouts of each attempt
+        at a request. Defaults to None, in which case the messenger's default
+        is used.
+        retry_policy (RetryPolicy, optional): when failed requests are retried.
+        Defaults to None, in which case the messenger's default is used.
+        rate_limit (float, optional): the most requests made per second across
+        all accounts. Defaults to None, in which case requests aren't rate
+        limited.
+        profiler (Profiler, optional): a profiler recording the phases of every
+        account's retrieval. Defaults to None.
+
+    Returns:
+        List[AccountResult]: the result for each account, in the order given.
+    """
+    accounts_limit = asyncio.Semaphore(max_accounts)
+    connector = aiohttp.TCPConnector(
+        limit=max_connections, limit_per_host=max_connections, ttl_dns_cache=300
+    )
+    parse_executor = ParseExecutor(parse_mode)
+    rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+    try:
+        return await asyncio.gather(
+            *[
+                _retrieve_account(
+                    account,
+                    accounts_limit,
+                    recent_only,
+                    max_in_flight=max_in_flight,
+                    cache=cache,
+                    parser=parser,
+                    connector=connector,
+                    parse_executor=parse_executor,
+                    timeout=timeout,
+                    retry_policy=retry_policy,
+                    rate_limiter=rate_limiter,
+                    profiler=profiler,
+                )
+                for account in accounts
+            ]
+        )
+    finally:
+        await connector.close()
+        parse_executor.shutdown()
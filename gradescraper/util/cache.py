@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, List, NamedTuple, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.gradescraper', 'cache')
+
+# Bump when the format of stored entries or parsed results changes
+CACHE_VERSION = 2
+
+
+class CachedResponse(NamedTuple):
+    """A response body stored in a ResponseCache.
+
+    Attributes:
+        body (str): the response body.
+        body_hash (str): the SHA-256 hex digest of the body.
+        etag (str, optional): the response's ETag header.
+        last_modified (str, optional): the response's Last-Modified header.
+        stored_at (float): the time the entry was stored or last revalidated,
+        in seconds since the epoch.
+        parsed (Any): the result of parsing the body, stored so that it does
+        not need to be parsed again.
+    """
+
+    body: str
+    body_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    parsed: Any
+
+    def conditional_headers(self) -> dict:
+        """Get the headers for revalidating this entry with the server.
+
+        Returns:
+            dict: If-None-Match and If-Modified-Since headers, for whichever
+            validators the entry has.
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def hash_body(body: str) -> str:
+    """Hash a response body for comparison with cached entries.
+
+    Args:
+        body (str): the response body.
+
+    Returns:
+        str: the SHA-256 hex digest of the body.
+    """
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """An on-disk cache of response bodies keyed by account and URL.
+
+    Each entry is stored as a JSON file. Entries older than max_age seconds are
+    treated as missing, and the least recently stored entries are evicted once
+    the cache grows beyond max_size bytes.
+
+    Attributes:
+        directory (str): the directory that entries are stored in.
+        max_age (float): the age in seconds after which entries expire.
+        max_size (int): the maximum total size of the cache in bytes.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        max_age: float = 7 * 24 * 60 * 60,
+        max_size: int = 32 * 1024 * 1024,
+    ):
+        """Create a ResponseCache, creating its directory if needed.
+
+        Args:
+            directory (str, optional): the directory to store entries in.
+            Defaults to DEFAULT_CACHE_DIR.
+            max_age (float, optional): the age in seconds after which entries
+            expire. Defaults to one week.
+            max_size (int, optional): the maximum total size of the cache in
+            bytes. Defaults to 32 MiB.
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.max_size = max_size
+        # Cached pages contain the user's grades, so keep them private
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, account: str, url: str) -> str:
+        key = hashlib.sha256(f'{account}\n{url}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, account: str, url: str) -> Optional[CachedResponse]:
+        """Get the unexpired entry for the given account and URL.
+
+        Args:
+            account (str): the account the response was retrieved with.
+            url (str): the URL the response was retrieved from.
+
+        Returns:
+            Optional[CachedResponse]: the cached response, or None if there is
+            no valid entry.
+        """
+        try:
+            with open(self._path(account, url), encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            entry.get('version') != CACHE_VERSION
+            or time.time() - entry['stored_at'] > self.max_age
+        ):
+            return None
+        return CachedResponse(
+            entry['body'],
+            entry['body_hash'],
+            entry['etag'],
+            entry['last_modified'],
+            entry['stored_at'],
+            entry['parsed'],
+        )
+
+    def put(
+        self,
+        account: str,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        parsed: Any = None,
+    ) -> CachedResponse:
+        """Store a response for the given account and URL.
+
+        Args:
+            account (str): the account the response was retrieved with.
+            url (str): the URL the response was retrieved from.
+            body (str): the response body.
+            etag (str, optional): the response's ETag header. Defaults to
+            None.
+            last_modified (str, optional): the response's Last-Modified
+            header. Defaults to None.
+            parsed (Any, optional): the JSON-serializable result of parsing
+            the body. Defaults to None.
+
+        Returns:
+            CachedResponse: the stored entry.
+        """
+        cached_response = CachedResponse(
+            body, hash_body(body), etag, last_modified, time.time(), parsed
+        )
+        path = self._path(account, url)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as entry_file:
+            json.dump(
+                {'version': CACHE_VERSION, **cached_response._asdict()},
+                entry_file,
+            )
+        os.replace(temp_path, path)
+        return cached_response
+
+    def evict(self) -> int:
+        """Remove expired entries, then the oldest ones until under max_size.
+
+        Returns:
+            int: the number of entries removed.
+        """
+        entries: List[os.DirEntry] = []
+        with os.scandir(self.directory) as directory_entries:
+            for directory_entry in directory_entries:
+                if directory_entry.name.endswith('.json'):
+                    entries.append(directory_entry)
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+
+        now = time.time()
+        total_size = 0
+        removed = 0
+        for entry in entries:
+            stat = entry.stat()
+            total_size += stat.st_size
+            if now - stat.st_mtime > self.max_age or total_size > self.max_size:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -0,0 +1,131 @@
+import enum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+
+
+class ChangeKind(enum.Enum):
+    """The ways an assignment can change between two snapshots."""
+
+    ADDED = 'added'
+    REMOVED = 'removed'
+    DUE_DATE_MOVED = 'due date moved'
+    LATE_DUE_DATE_ADDED = 'late due date added'
+    SUBMITTED_TOGGLED = 'submitted toggled'
+
+
+class Change(NamedTuple):
+    """A change to an assignment between two snapshots.
+
+    Attributes:
+        kind (ChangeKind): how the assignment changed.
+        course_number (int): the number of the course the assignment belongs
+        to.
+        assignment (Assignment): the assignment in the newer snapshot, or in
+        the older snapshot if it was removed.
+        previous (Assignment, optional): the assignment in the older snapshot,
+        or None if it was added.
+    """
+
+    kind: ChangeKind
+    course_number: int
+    assignment: Assignment
+    previous: Optional[Assignment] = None
+
+    def __str__(self) -> str:
+        if self.kind is ChangeKind.ADDED:
+            return f'New assignment: {self.assignment}'
+        if self.kind is ChangeKind.REMOVED:
+            return f'Removed assignment: {self.assignment}'
+        if self.kind is ChangeKind.DUE_DATE_MOVED:
+            return (
+                f'Due date moved from {self.previous.due_date:%m/%d %H:%M}: '
+                f'{self.assignment}'
+            )
+        if self.kind is ChangeKind.LATE_DUE_DATE_ADDED:
+            return (
+                f'Late due date added, {self.assignment.late_due_date:%m/%d %H:%M}: '
+                f'{self.assignment}'
+            )
+        return f'Submission status changed: {self.assignment}'
+
+
+AssignmentKey = Tuple[int, str]
+
+
+def _by_key(courses: Iterable[Course]) -> Dict[AssignmentKey, Assignment]:
+    return {
+        (course.number, assignment.key): assignment
+        for course in courses
+        for assignment in course.assignments
+    }
+
+
+def _diff_assignment(
+    key: AssignmentKey, old: Assignment, new: Assignment
+) -> List[Change]:
+    course_number = key[0]
+    changes = []
+    if old.due_date != new.due_date:
+        changes.append(Change(ChangeKind.DUE_DATE_MOVED, course_number, new, old))
+    if old.late_due_date is None and new.late_due_date is not None:
+        changes.append(
+            Change(ChangeKind.LATE_DUE_DATE_ADDED, course_number, new, old)
+        )
+    if old.submitted != new.submitted:
+        changes.append(Change(ChangeKind.SUBMITTED_TOGGLED, course_number, new, old))
+    return changes
+
+
+def diff_snapshots(
+    old_courses: Iterable[Course], new_courses: Iterable[Course]
+) -> List[Change]:
+    """Get the changes to assignments between two snapshots of courses.
+
+    Assignments are matched by their course's number and their key, which is
+    their URL when they have one, so this takes time linear in the number of
+    assignments rather than comparing every pair.
+
+    Gradescope only links the rows of submitted assignments, so an
+    assignment's key changes from its name to its URL when it is submitted.
+    Assignments left unmatched by key are therefore paired by their course's
+    number and their name, so that a submission is reported as such rather
+    than as a removal and an addition.
+
+    Args:
+        old_courses (Iterable[Course]): the older snapshot.
+        new_courses (Iterable[Course]): the newer snapshot.
+
+    Returns:
+        List[Change]: the changes, with those to assignments in the newer
+        snapshot in its order, followed by removals in the older snapshot's
+        order.
+    """
+    old = _by_key(old_courses)
+    new = _by_key(new_courses)
+    unmatched_by_name: Dict[Tuple[int, str], List[AssignmentKey]] = {}
+    for key, assignment in old.items():
+        if key not in new:
+            unmatched_by_name.setdefault((key[0], assignment.name), []).append(key)
+
+    changes = []
+    paired = set()
+    for key, assignment in new.items():
+        previous = old.get(key)
+        if previous is None:
+            same_name = unmatched_by_name.get((key[0], assignment.name))
+            if same_name:
+                previous_key = same_name.pop(0)
+                paired.add(previous_key)
+                previous = old[previous_key]
+        if previous is None:
+            changes.append(Change(ChangeKind.ADDED, key[0], assignment))
+        else:
+            changes.extend(_diff_assignment(key, previous, assignment))
+    changes.extend(
+        Change(ChangeKind.REMOVED, key[0], assignment)
+        for key, assignment in old.items()
+        if key not in new and key not in paired
+    )
+    return changes
@@ -0,0 +1,76 @@
+import asyncio
+import concurrent.futures
+import functools
+from typing import Callable, ClassVar, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class ParseExecutor:
+    """Runs parsing functions inline, in a thread pool, or in a process pool.
+
+    Parsing pages with BeautifulSoup or lxml is CPU bound, and blocks the event
+    loop while it runs. Running it in a pool lets other requests make progress
+    in the meantime. Functions run in a process pool must be importable at the
+    module level, and their arguments and results must be picklable, so raw
+    page bytes should be passed in and plain tuples returned.
+
+    Attributes:
+        mode (str): where functions are run, one of 'inline', 'thread' or
+        'process'.
+        max_workers (int, optional): the maximum number of workers in the pool.
+    """
+
+    modes: ClassVar[Tuple[str, ...]] = ('inline', 'thread', 'process')
+
+    def __init__(self, mode: str = 'inline', max_workers: Optional[int] = None):
+        """Create a ParseExecutor. Its pool is started on first use.
+
+        Args:
+            mode (str, optional): where functions are run, one of 'inline',
+            'thread' or 'process'. Defaults to 'inline'.
+            max_workers (int, optional): the maximum number of workers in the
+            pool. Defaults to None, in which case the pool's default is used.
+
+        Raises:
+            ValueError: if mode is not a known mode.
+        """
+        if mode not in self.modes:
+            raise ValueError(f'Unknown parse mode {mode!r}')
+        self.mode = mode
+        self.max_workers = max_workers
+        self._pool: Optional[concurrent.futures.Executor] = None
+
+    def _get_pool(self) -> concurrent.futures.Executor:
+        if self._pool is None:
+            if self.mode == 'thread':
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix='gradescraper-parse'
+                )
+            else:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers
+                )
+        return self._pool
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """Run function with the given arguments.
+
+        Args:
+            function (Callable[..., T]): the function to run.
+            *args: the arguments to call function with.
+
+        Returns:
+            T: the result of the function.
+        """
+        if self.mode == 'inline':
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_pool(), functools.partial(function, *args)
+        )
+
+    def shutdown(self):
+        """Shut down the executor's pool, if it was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,245 @@
+import csv
+import datetime
+import hashlib
+import json
+from typing import ClassVar, Dict, Iterable, List, Optional, TextIO, Type
+
+from gradescraper.structures.assignment import Assignment
+
+
+class AssignmentWriter:
+    """Writes assignments to a stream in a machine-readable format.
+
+    Assignments are written one at a time, and the stream is flushed after
+    each one, so a program reading the output can handle each assignment as
+    soon as it has been retrieved:
+
+        writer.begin()
+        for assignment in assignments:
+            writer.write(assignment)
+        writer.end()
+
+    Writers choose their own line endings, so the stream should not translate
+    newlines, i.e. it should be opened with newline=''.
+
+    Attributes:
+        stream (TextIO): the stream written to.
+        with_account (bool): whether each assignment is written with the
+        account it belongs to, e.g. when a document covers a batch of
+        accounts.
+    """
+
+    name: ClassVar[str]
+
+    def __init__(self, stream: TextIO, with_account: bool = False):
+        """Create an AssignmentWriter.
+
+        Args:
+            stream (TextIO): the stream to write to.
+            with_account (bool, optional): whether each assignment is written
+            with the account it belongs to. Defaults to False.
+        """
+        self.stream = stream
+        self.with_account = with_account
+
+    def begin(self):
+        """Write anything that comes before the first assignment."""
+
+    def write(self, assignment: Assignment, account: Optional[str] = None):
+        """Write an assignment.
+
+        Args:
+            assignment (Assignment): the assignment to write.
+            account (str, optional): the account the assignment belongs to,
+            which is written if the writer is with_account. Defaults to None.
+        """
+        raise NotImplementedError
+
+    def _record(self, assignment: Assignment, account: Optional[str]) -> dict:
+        # The assignment's fields, preceded by its account if it is written
+        record = {'account': account} if self.with_account else {}
+        record.update(assignment.to_dict())
+        return record
+
+    def end(self):
+        """Write anything that comes after the last assignment."""
+
+    def write_all(self, assignments: Iterable[Assignment]):
+        """Write a complete document containing the given assignments.
+
+        Args:
+            assignments (Iterable[Assignment]): the assignments to write.
+        """
+        self.begin()
+        for assignment in assignments:
+            self.write(assignment)
+        self.end()
+
+
+class JsonLinesWriter(AssignmentWriter):
+    """Writes each assignment as a JSON object on its own line."""
+
+    name = 'jsonl'
+
+    def write(self, assignment: Assignment, account: Optional[str] = None):
+        self.stream.write(json.dumps(self._record(assignment, account)) + '\n')
+        self.stream.flush()
+
+
+class CsvWriter(AssignmentWriter):
+    """Writes assignments as CSV, with a header row of field names.
+
+    The score, points_possible and submitted_at columns are empty unless the
+    assignments' details have been retrieved. A writer with_account has an
+    account column before the others.
+    """
+
+    name = 'csv'
+    fields: ClassVar[List[str]] = [
+        'course_name',
+        'name',
+        'release_date',
+        'due_date',
+        'late_due_date',
+        'submitted',
+        'url',
+        'status',
+        'score',
+        'points_possible',
+        'submitted_at',
+    ]
+
+    def __init__(self, stream: TextIO, with_account: bool = False):
+        super().__init__(stream, with_account)
+        self._writer = csv.DictWriter(
+            stream,
+            ['account'] + self.fields if with_account else self.fields,
+            lineterminator='\n',
+        )
+
+    def begin(self):
+        self._writer.writeheader()
+        self.stream.flush()
+
+    def write(self, assignment: Assignment, account: Optional[str] = None):
+        row = self._record(assignment, account)
+        row.update(row.pop('details') or {})
+        self._writer.writerow(row)
+        self.stream.flush()
+
+
+class IcsWriter(AssignmentWriter):
+    """Writes assignments as events of an iCalendar (RFC 5545) calendar.
+
+    Each assignment with a due date is an event at its due date. Assignments
+    without one are skipped. Dates are written as floating times, which
+    calendar applications show in the local time zone, since Gradescope's
+    dates don't include one.
+
+    An event's UID is made from its course and assignment names, rather than
+    its URL, since unsubmitted assignments have no URL and gain one when they
+    are submitted. A calendar application that imports the calendar again
+    then updates each event instead of adding a copy. A writer with_account
+    includes the account in the UIDs, so the same assignment on two accounts
+    is two events.
+    """
+
+    name = 'ics'
+    # Lines longer than this many octets are folded onto continuation lines
+    max_line_length: ClassVar[int] = 75
+
+    def __init__(
+        self,
+        stream: TextIO,
+        with_account: bool = False,
+        now: Optional[datetime.datetime] = None,
+    ):
+        """Create an IcsWriter.
+
+        Args:
+            stream (TextIO): the stream to write to.
+            with_account (bool, optional): whether each event's UID and
+            description include the account it belongs to. Defaults to False.
+            now (datetime.datetime, optional): the UTC time the calendar was
+            created at. Defaults to the current time.
+        """
+        super().__init__(stream, with_account)
+        self.now = now or datetime.datetime.utcnow()
+
+    def begin(self):
+        self._write_lines(
+            [
+                'BEGIN:VCALENDAR',
+                'VERSION:2.0',
+                'PRODID:-//Gradescraper//Gradescraper//EN',
+                'CALSCALE:GREGORIAN',
+            ]
+        )
+
+    def write(self, assignment: Assignment, account: Optional[str] = None):
+        if assignment.due_date is None:
+            return
+        identity = f'{assignment.course_name}/{assignment.name}'
+        if self.with_account:
+            identity = f'{account}/{identity}'
+        uid = hashlib.sha1(identity.encode()).hexdigest()
+        description = [
+            f'Course: {assignment.course_name}',
+            f'Submitted: {"yes" if assignment.submitted else "no"}',
+        ]
+        if assignment.late_due_date:
+            description.append(
+                f'Late due date: {assignment.late_due_date:%m/%d %I:%M%p}'
+            )
+        if self.with_account:
+            description.append(f'Account: {account}')
+        lines = [
+            'BEGIN:VEVENT',
+            f'UID:{uid}@gradescraper',
+            f'DTSTAMP:{self.now:%Y%m%dT%H%M%SZ}',
+            f'DTSTART:{assignment.due_date:%Y%m%dT%H%M%S}',
+            f'SUMMARY:{_escape(f"{assignment.course_name}: {assignment.name}")}',
+            f'DESCRIPTION:{_escape(chr(10).join(description))}',
+        ]
+        if assignment.url:
+            lines.append(f'URL:{assignment.url}')
+        lines.append('END:VEVENT')
+        self._write_lines(lines)
+
+    def end(self):
+        self._write_lines(['END:VCALENDAR'])
+
+    def _write_lines(self, lines: List[str]):
+        self.stream.write(
+            ''.join(_fold(line, self.max_line_length) + '\r\n' for line in lines)
+        )
+        self.stream.flush()
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line: str, max_length: int) -> str:
+    # Fold by octets without splitting multi-byte characters. Continuation
+    # lines start with a space, which counts towards their length.
+    parts = []
+    part_start = part_length = 0
+    for index, character in enumerate(line):
+        length = len(character.encode())
+        if part_length + length > max_length:
+            parts.append(line[part_start:index])
+            part_start, part_length = index, 1
+        part_length += length
+    parts.append(line[part_start:])
+    return '\r\n '.join(parts)
+
+
+WRITERS: Dict[str, Type[AssignmentWriter]] = {
+    writer.name: writer for writer in (JsonLinesWriter, CsvWriter, IcsWriter)
+}
@@ -1,11 +1,32 @@
 import asyncio
-from typing import ClassVar, List
+import datetime
+import json
+from operator import attrgetter
+from typing import AsyncIterator, Awaitable, Callable, ClassVar, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
 
 import aiohttp
-from bs4 import BeautifulSoup, SoupStrainer
+from yarl import URL
 
 from gradescraper.util import processor
+from gradescraper.util.cache import ResponseCache, hash_body
+from gradescraper.util.executor import ParseExecutor
+from gradescraper.util.profiler import NULL_PROFILER, Profiler
+from gradescraper.util.retry import RetryPolicy, TokenBucket
+from gradescraper.util.scheduler import FetchScheduler
+from gradescraper.structures.assignment import Assignment, AssignmentDetails
 from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+
+T = TypeVar('T')
+
+
+class _CoursePage(NamedTuple):
+    body: bytes
+    is_login_page: bool
+    # Set when the page was parsed while it was being read
+    assignments: Optional[List[Assignment]]
+    size: int
+
 
 class GradescopeMessenger:
     """A class for handling requests to the Gradescope website.
@@ -17,19 +38,138 @@ class GradescopeMessenger:
         to the Gradescope website.
         email (str, optional): The user's email address.
         password (str, optional): The user's password.
+        scheduler (FetchScheduler): the scheduler that bounds how many course
+        pages are fetched at once.
+        cache (ResponseCache, optional): the cache that course pages are
+        revalidated against, if any.
+        parser (str): the backend used to parse course pages. 'soup' parses
+        the whole page with BeautifulSoup once it has been read, while
+        'stream' parses it incrementally as it arrives.
+        parse_executor (ParseExecutor): the executor that whole pages are
+        parsed in.
+        retry_policy (RetryPolicy): when failed requests are retried.
+        rate_limiter (TokenBucket, optional): the rate limiter every request
+        waits for, if any.
+        errors (Dict[int, Exception]): the errors raised while retrieving the
+        assignments of each course, by course number, in the last call to
+        retrieve_assignments_for_courses or one of the iterators that
+        retrieve courses.
+        profiler (Union[Profiler, NullProfiler]): records how long each phase
+        of retrieval takes.
+        warm_connections (int): the number of connections opened ahead of the
+        course fetches by get_courses_and_assignments, besides the one used to
+        log in.
+        details_cache (Dict[str, Tuple[Optional[str], AssignmentDetails]]):
+        the details retrieved by retrieve_assignment_details, with the status
+        shown on the course page when they were retrieved, by assignment URL.
     """
 
     base_url: ClassVar[str] = 'https://www.gradescope.com'
-
-    def __init__(self, email: str='', password: str=''):
+    login_page_title: ClassVar[str] = processor.LOGIN_PAGE_TITLE
+    parsers: ClassVar[Tuple[str, ...]] = ('soup', 'stream')
+    chunk_size: ClassVar[int] = 16 * 1024
+    default_timeout: ClassVar[aiohttp.ClientTimeout] = aiohttp.ClientTimeout(
+        total=60, sock_connect=15, sock_read=30
+    )
+
+    def __init__(
+        self,
+        email: str = '',
+        password: str = '',
+        max_in_flight: int = 6,
+        per_host_limit: int = 6,
+        cache: Optional[ResponseCache] = None,
+        parser: str = 'soup',
+        parse_mode: str = 'inline',
+        connector: Optional[aiohttp.BaseConnector] = None,
+        parse_executor: Optional[ParseExecutor] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        profiler: Optional[Profiler] = None,
+    ):
         """Create a GradescopeMessenger, initializing an aiohttp ClientSession.
 
         Args:
             email (str, optional): The user's email address. Defaults to ''.
             password (str, optional): The user's password. Defaults to ''.
+            max_in_flight (int, optional): The maximum number of course pages
+            fetched at once. Defaults to 6.
+            per_host_limit (int, optional): The maximum number of open
+            connections to a single host. Defaults to 6.
+            cache (ResponseCache, optional): A cache to store course pages in
+            and revalidate them against. Defaults to None.
+            parser (str, optional): The backend used to parse course pages,
+            either 'soup' or 'stream'. Defaults to 'soup'.
+            parse_mode (str, optional): Where whole pages are parsed: 'inline'
+            on the event loop, or in a 'thread' or 'process' pool. Pages read
+            by the 'stream' parser are always parsed inline, as they arrive.
+            Defaults to 'inline'.
+            connector (aiohttp.BaseConnector, optional): A connector shared
+            with other messengers, e.g. one per account in a batch. The
+            messenger's session keeps its own cookie jar, and the connector is
+            left open when the messenger is closed. Defaults to None, in which
+            case the messenger creates and owns a connector limited by
+            max_in_flight and per_host_limit.
+            parse_executor (ParseExecutor, optional): An executor shared with
+            other messengers, which is left running when the messenger is
+            closed. Overrides parse_mode. Defaults to None.
+            timeout (aiohttp.ClientTimeout, optional): The timeouts of each
+            attempt at a request. Defaults to None, in which case
+            default_timeout is used.
+            retry_policy (RetryPolicy, optional): When failed requests are
+            retried. Its deadline bounds the total time spent on a request
+            across attempts. Defaults to None, in which case a RetryPolicy with
+            default settings is used.
+            rate_limiter (TokenBucket, optional): A rate limiter every request
+            waits for, which may be shared with other messengers. Defaults to
+            None.
+            profiler (Profiler, optional): A profiler to record the time taken
+            by the auth token fetch, login, dashboard parse, each course fetch
+            and parse, and each row extraction. Rows parsed in a process pool
+            aren't recorded. Defaults to None, in which case nothing is
+            recorded.
+
+        Raises:
+            ValueError: if parser or parse_mode is not known.
         """
-        self.session: aiohttp.ClientSession = aiohttp.ClientSession()
+        if parser not in self.parsers:
+            raise ValueError(f'Unknown parser {parser!r}')
+        owns_connector = connector is None
+        if owns_connector:
+            connector = aiohttp.TCPConnector(
+                limit=max(max_in_flight, per_host_limit),
+                limit_per_host=per_host_limit,
+            )
+        self.session: aiohttp.ClientSession = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=owns_connector,
+            timeout=timeout or self.default_timeout,
+        )
+        self.scheduler = FetchScheduler(max_in_flight)
+        # A shared connector is likely to be warm already, and warming up
+        # would use up requests allowed by a rate limiter
+        self.warm_connections = (
+            min(max_in_flight, per_host_limit) - 1
+            if owns_connector and rate_limiter is None
+            else 0
+        )
+        self.cache = cache
+        self.parser = parser
+        self._owns_parse_executor = parse_executor is None
+        self.parse_executor = parse_executor or ParseExecutor(parse_mode)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.errors: Dict[int, Exception] = {}
+        self.details_cache: Dict[str, Tuple[Optional[str], AssignmentDetails]] = {}
+        self.profiler = profiler or NULL_PROFILER
         self.logged_in: bool = False
+        # Successful logins bump the generation; finished attempts, successful
+        # or not, bump the attempt count.
+        self._login_lock = asyncio.Lock()
+        self._login_generation = 0
+        self._login_attempts = 0
+        self._login_error = None
         self.email = email
         self.password = password
 
@@ -38,6 +178,10 @@ class GradescopeMessenger:
 
     async def __aexit__(self, exc_type, exc_value, exc_traceback):
         await self.session.close()
+        if self._owns_parse_executor:
+            self.parse_executor.shutdown()
+        if self.cache:
+            self.cache.evict()
 
     async def get_auth_token(self) -> str:
         """Get the authentication token cookie from the Gradescope site.
@@ -45,50 +189,338 @@ class GradescopeMessenger:
         Returns:
             str: the authentication token.
         """
-        response = await self.session.get(self.base_url)
-        response_text = await response.text()
-        parsed_init_resp = BeautifulSoup(
-            response_text, 'lxml', parse_only=SoupStrainer('input')
-        )
-        return (
-            parsed_init_resp.find('input', {'name': 'authenticity_token'})
-        ).get('value')
-
-    async def login(self) -> BeautifulSoup:
+        with self.profiler.span('auth token'):
+            _, body = await self._request('GET', self.base_url)
+            return await self.parse_executor.run(processor.extract_auth_token, body)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        read: Callable[[aiohttp.ClientResponse], Awaitable[T]] = (
+            aiohttp.ClientResponse.read
+        ),
+        **kwargs,
+    ) -> Tuple[aiohttp.ClientResponse, T]:
+        # Every request goes through here. The response is read within the
+        # attempt, so that timeouts and connection errors while reading are
+        # retried too.
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    if response.status not in self.retry_policy.retry_statuses:
+                        return response, await read(response)
+                    retry_after = response.headers.get('Retry-After')
+                    error = aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=response.reason,
+                        headers=response.headers,
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as request_error:
+                error = request_error
+
+            delay = self.retry_policy.delay(attempt, retry_after)
+            if not self.retry_policy.should_retry(
+                attempt, delay, loop.time() - start
+            ):
+                raise error
+            await asyncio.sleep(delay)
+
+    async def login(
+        self, on_course: Optional[Callable[[Course], None]] = None
+    ) -> List[Course]:
         """Attempt to login to the Gradescope website.
 
         The GradescopeMessenger's stored email and password attributes are used
         in addition to an authentication token to make this login attempt.
+        Logins are serialized, so concurrent callers never race each other
+        through the login handshake.
+
+        The dashboard returned by the login is parsed as it arrives. The
+        messenger counts as logged in as soon as the dashboard's title has
+        been read, so course pages can be fetched, e.g. by on_course, while
+        the rest of the dashboard is still arriving.
+
+        Args:
+            on_course (Callable[[Course], None], optional): called with each
+            course as soon as its entry on the dashboard has been parsed.
+            Defaults to None.
 
         Raises:
             Exception: error related to a failure to log in to Gradescope.
 
         Returns:
-            BeautifulSoup: the user's Gradescope dashboard if the login was
-            successful.
+            List[Course]: the courses on the user's Gradescope dashboard if the
+            login was successful. Their assignments are not retrieved.
         """
+        async with self._login_lock:
+            return await self._login(on_course)
+
+    async def ensure_logged_in(self):
+        """Log in to the Gradescope website unless already logged in.
+
+        If a login is already in progress, this waits for it to finish instead
+        of starting another one. If that login fails, its error is raised
+        rather than attempting the login again.
+
+        Raises:
+            Exception: error related to a failure to log in to Gradescope.
+        """
+        if self.logged_in:
+            # Don't wait for a login that is still reading the dashboard
+            return
+        attempts = self._login_attempts
+        async with self._login_lock:
+            if self.logged_in:
+                return
+            if self._login_attempts != attempts and self._login_error:
+                raise self._login_error
+            await self._login()
+
+    def export_session(self) -> str:
+        """Serialize the session's Gradescope cookies.
+
+        The result can be passed to import_session, possibly in a later run, to
+        reuse the session without logging in again.
+
+        Returns:
+            str: the session's cookies for the Gradescope website as JSON.
+        """
+        cookies = self.session.cookie_jar.filter_cookies(URL(self.base_url))
+        return json.dumps({name: morsel.value for name, morsel in cookies.items()})
+
+    def import_session(self, serialized_session: str):
+        """Load cookies previously serialized with export_session.
+
+        The cookies are not validated until resume_session is called.
+
+        Args:
+            serialized_session (str): cookies returned by export_session.
+        """
+        self.session.cookie_jar.update_cookies(
+            json.loads(serialized_session), response_url=URL(self.base_url)
+        )
+
+    async def resume_session(
+        self, on_course: Optional[Callable[[Course], None]] = None
+    ) -> Optional[List[Course]]:
+        """Attempt to reuse the session's cookies instead of logging in.
 
+        A single GET of the dashboard both validates the cookies and returns
+        the dashboard that a login would have returned. Like login, the
+        dashboard is parsed as it arrives.
+
+        Args:
+            on_course (Callable[[Course], None], optional): called with each
+            course as soon as its entry on the dashboard has been parsed.
+            Defaults to None.
+
+        Returns:
+            Optional[List[Course]]: the courses on the user's Gradescope
+            dashboard if the session's cookies are still valid, otherwise None.
+        """
+        if not self.session.cookie_jar.filter_cookies(URL(self.base_url)):
+            return None
+
+        async def read(response: aiohttp.ClientResponse) -> Optional[List[Course]]:
+            if self._session_expired(response, False):
+                return None
+            return await self._read_dashboard(response, on_course)
+
+        async with self._login_lock:
+            with self.profiler.span('resume session'):
+                _, courses = await self._request('GET', self.base_url, read)
+            return courses
+
+    async def _reauthenticate(self, stale_generation: int):
+        # Only the first caller to notice an expired session logs in again;
+        # callers that saw the same session expire reuse the new login.
+        async with self._login_lock:
+            if self._login_generation == stale_generation:
+                self.logged_in = False
+                await self._login()
+
+    async def _read_dashboard(
+        self,
+        response: aiohttp.ClientResponse,
+        on_course: Optional[Callable[[Course], None]],
+    ) -> Optional[List[Course]]:
+        # Returns None if the response is the login page instead of the
+        # dashboard. Otherwise the messenger is marked as logged in once the
+        # title has been read, before any course is passed to on_course.
+        parser = processor.DashboardStreamParser(encoding=response.charset)
+        courses = []
+        logged_in = False
+        try:
+            chunks = response.content.iter_chunked(self.chunk_size)
+            async for chunk in chunks:
+                with self.profiler.span('parse dashboard', bytes=len(chunk)):
+                    entries = parser.feed(chunk)
+                if not logged_in and parser.title is not None:
+                    logged_in = True
+                    self.logged_in = True
+                    self._login_generation += 1
+                for _, course in entries:
+                    courses.append(course)
+                    if on_course:
+                        on_course(course)
+            for _, course in parser.close():
+                courses.append(course)
+                if on_course:
+                    on_course(course)
+        except processor.LoginPageError:
+            return None
+        return courses if logged_in else None
+
+    async def _login(
+        self, on_course: Optional[Callable[[Course], None]] = None
+    ) -> List[Course]:
+        self._login_error = None
+        try:
+            with self.profiler.span('login'):
+                return await self._attempt_login(on_course)
+        finally:
+            self._login_attempts += 1
+
+    async def _attempt_login(
+        self, on_course: Optional[Callable[[Course], None]]
+    ) -> List[Course]:
         post_params = {
             "session[email]": self.email,
             "session[password]": self.password,
             "authenticity_token": await self.get_auth_token(),
         }
 
-        # Login and get the response, or access the base url if the user is already logged in.
-        response = await self.session.post(
-            f'{self.base_url}/login', params=post_params
-        ) or await self.session.get(self.base_url)
+        # Login and get the response, which is the dashboard if the login succeeded.
+        with self.profiler.span('login request'):
+            _, courses = await self._request(
+                'POST',
+                f'{self.base_url}/login',
+                lambda response: self._read_dashboard(response, on_course),
+                params=post_params,
+            )
 
-        soup = BeautifulSoup(await response.text(), 'lxml')
-        if soup.find('title').string == 'Log In | Gradescope':
+        if courses is None:
             self.logged_in = False
-            raise Exception(
+            self._login_error = Exception(
                 'Failed to log in. Please check username and password.'
             )
-        else:
-            self.logged_in = True
+            raise self._login_error
+
+        return courses
+
+    def _is_login_page(self, body: bytes) -> bool:
+        return f'<title>{self.login_page_title}</title>'.encode() in body
+
+    def _session_expired(
+        self, response: aiohttp.ClientResponse, is_login_page: bool
+    ) -> bool:
+        # Gradescope redirects requests with an expired session to its login
+        # page rather than returning an error status.
+        return (
+            response.status == 401
+            or response.url.path.rstrip('/') == '/login'
+            or is_login_page
+        )
+
+    async def _read_course_page(
+        self, course: Course, response: aiohttp.ClientResponse
+    ) -> _CoursePage:
+        if self.parser == 'soup':
+            body = await response.read()
+            return _CoursePage(body, self._is_login_page(body), None, len(body))
+
+        stream_parser = processor.AssignmentStreamParser(
+            course.name,
+            course.term.year,
+            encoding=response.charset,
+            profiler=self.profiler,
+            track=self._track(course),
+        )
+        assignments = []
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            assignments.extend(stream_parser.feed(chunk))
+            size += len(chunk)
+            if self.cache:
+                chunks.append(chunk)
+        assignments.extend(stream_parser.close())
+        return _CoursePage(
+            b''.join(chunks),
+            stream_parser.title == self.login_page_title,
+            assignments,
+            size,
+        )
 
-        return soup
+    @staticmethod
+    def _track(course: Course) -> str:
+        return f'course {course.number}'
+
+    async def _get_course_page(
+        self, course: Course, headers: Optional[dict] = None
+    ) -> Tuple[aiohttp.ClientResponse, _CoursePage]:
+        await self.ensure_logged_in()
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            generation = self._login_generation
+            with self.profiler.span(
+                'fetch course', self._track(course), course=course.number
+            ) as span:
+                sent = loop.time()
+
+                async def read(response: aiohttp.ClientResponse) -> _CoursePage:
+                    span.set(ttfb=loop.time() - sent, status=response.status)
+                    return await self._read_course_page(course, response)
+
+                response, course_page = await self._request(
+                    'GET',
+                    f'{self.base_url}/courses/{course.number}',
+                    read,
+                    headers=headers,
+                )
+                span.set(bytes=course_page.size)
+            if not self._session_expired(response, course_page.is_login_page):
+                # Don't parse error pages as if they were course pages
+                response.raise_for_status()
+                return response, course_page
+            if attempt == 0:
+                await self._reauthenticate(generation)
+
+        raise Exception(
+            f'Session expired while retrieving course {course.number} and '
+            'could not be renewed.'
+        )
+
+    async def _parse_course_page(
+        self, course: Course, course_page: bytes
+    ) -> List[Assignment]:
+        # Profilers can't be shared with worker processes
+        profiler = (
+            self.profiler if self.parse_executor.mode != 'process' else NULL_PROFILER
+        )
+        track = self._track(course)
+        with self.profiler.span('parse course', track, bytes=len(course_page)):
+            assignment_tuples = await self.parse_executor.run(
+                processor.parse_course_page,
+                course_page,
+                course.name,
+                course.term.year,
+                profiler,
+                track,
+            )
+        return [
+            Assignment(*assignment_tuple) for assignment_tuple in assignment_tuples
+        ]
 
     async def retrieve_assignments_for_course(self, course: Course):
         """Finds assignments for the given course and stores them in the course.
@@ -96,85 +528,469 @@ class GradescopeMessenger:
         Assignments for the given course are found via a GET request to the
         course's special Gradescope URL. After the response is parsed into valid
         Assignment objects, the list of those assignments is stored in the
-        course's assignments attribute.
+        course's assignments attribute, and the time of retrieval in its
+        retrieved_at attribute.
+
+        If the messenger has a response cache, the request is made conditional
+        on the cached copy of the page. When the server reports the page as
+        unmodified, or returns an identical body, the cached assignments are
+        reused without parsing the page again.
 
         Note:
             To find assignments for the given course, the user must be logged
             in. If the user is not logged in when this method is called, the 
             login method is called, and then the rest of the method executes.
+            If the session expires before the course page is retrieved, the
+            user is logged in again once and the request is retried.
 
         Args:
             course (Course): The course to find assignments for.
-        """
 
-        if not self.logged_in:
-            await self.login()
+        Raises:
+            Exception: error related to a failure to log in to Gradescope.
+        """
+        url = f'{self.base_url}/courses/{course.number}'
+        cached = self.cache.get(self.email, url) if self.cache else None
 
-        course_page_response = await self.session.get(
-            f'{self.base_url}/courses/{course.number}'
+        response, course_page = await self._get_course_page(
+            course, cached.conditional_headers() if cached else None
         )
-
-        assignments_soup = BeautifulSoup(
-            await course_page_response.text(),
-            'lxml',
-            parse_only=SoupStrainer('tr'),
-        ).find_all('tr')[1:]
-        course.assignments = [
-            processor.extract_assignment_from_row(
-                row, course_name=course.name, assignment_year=course.term.year
+        body = (
+            course_page.body.decode(response.get_encoding())
+            if self.cache and response.status != 304
+            else ''
+        )
+        if cached and (
+            response.status == 304
+            or (
+                course_page.assignments is None
+                and hash_body(body) == cached.body_hash
+            )
+        ):
+            course.assignments = [
+                Assignment.from_dict(assignment) for assignment in cached.parsed
+            ]
+            body, parsed = cached.body, cached.parsed
+        else:
+            course.assignments = (
+                course_page.assignments
+                if course_page.assignments is not None
+                else await self._parse_course_page(course, course_page.body)
+            )
+            parsed = [assignment.to_dict() for assignment in course.assignments]
+
+        course.retrieved_at = datetime.datetime.now()
+
+        if self.cache:
+            self.cache.put(
+                self.email,
+                url,
+                body,
+                etag=response.headers.get('ETag', cached and cached.etag),
+                last_modified=response.headers.get(
+                    'Last-Modified', cached and cached.last_modified
+                ),
+                parsed=parsed,
             )
-            for row in assignments_soup
-        ]
 
     async def retrieve_assignments_for_courses(
         self, courses: List[Course], recent_only: bool
-    ):
+    ) -> Dict[int, Exception]:
         """Asynchronously retrieve assignments for the given courses.
 
         Since courses could contain a list of courses from irrelevant years or 
         terms, recent_only can be specified to only retrieve assignments for
         the courses occuring in the most recent term.
 
+        Course pages are fetched through the messenger's scheduler, so at most
+        scheduler.max_in_flight pages are requested at once. Courses from more
+        recent terms are fetched first.
+
+        A failure to retrieve one course doesn't affect the others. The
+        assignments of a course that failed are left as they were, and its
+        error is recorded in the messenger's errors attribute.
+
         Args:
             courses (List[Course]): A list of Courses to possibly retrieve 
             assignments for.
             recent_only (bool): Whether to only retrieve assignments for courses
             occuring in the most recent term.
+
+        Returns:
+            Dict[int, Exception]: the error raised while retrieving each course
+            that failed, by course number.
+        """
+        async for _ in self.iter_assignments_for_courses(courses, recent_only):
+            pass
+        return self.errors
+
+    async def _get_assignment_page(self, assignment: Assignment) -> bytes:
+        await self.ensure_logged_in()
+        # Assignment URLs always point at Gradescope, so only their paths are
+        # kept, which lets base_url point somewhere else
+        path = URL(assignment.url).path
+        for attempt in range(2):
+            generation = self._login_generation
+            with self.profiler.span('fetch assignment', path) as span:
+                response, body = await self._request('GET', f'{self.base_url}{path}')
+                span.set(bytes=len(body), status=response.status)
+            if not self._session_expired(response, self._is_login_page(body)):
+                response.raise_for_status()
+                return body
+            if attempt == 0:
+                await self._reauthenticate(generation)
+
+        raise Exception(
+            f'Session expired while retrieving assignment {assignment.name} and '
+            'could not be renewed.'
+        )
+
+    async def _retrieve_details(
+        self, assignment: Assignment, refresh: bool
+    ) -> AssignmentDetails:
+        # The status shown on the course page changes from 'Submitted' to the
+        # score once the assignment is graded, and with each resubmission or
+        # regrade after that
+        cached = self.details_cache.get(assignment.url)
+        if cached and cached[0] == assignment.status and not refresh:
+            return cached[1]
+
+        stored = (
+            self.cache.get(self.email, assignment.url)
+            if self.cache and not refresh
+            else None
+        )
+        if stored and stored.parsed['status'] == assignment.status:
+            details = AssignmentDetails.from_dict(stored.parsed['details'])
+        else:
+            body = await self._get_assignment_page(assignment)
+            with self.profiler.span(
+                'parse assignment', URL(assignment.url).path, bytes=len(body)
+            ):
+                details = AssignmentDetails(
+                    *await self.parse_executor.run(
+                        processor.parse_assignment_details, body
+                    )
+                )
+            if self.cache:
+                # Only the parsed details are worth keeping, since assignment
+                # pages aren't served with validators to revalidate against
+                self.cache.put(
+                    self.email,
+                    assignment.url,
+                    '',
+                    parsed={
+                        'status': assignment.status,
+                        'details': details.to_dict(),
+                    },
+                )
+        self.details_cache[assignment.url] = (assignment.status, details)
+        return details
+
+    async def retrieve_assignment_details(
+        self, assignments: Iterable[Assignment], refresh: bool = False
+    ) -> Dict[str, Exception]:
+        """Retrieve the score and submission time of the given assignments
+        and store them in their details attributes.
+
+        Each assignment's page is a separate request, so this is left to the
+        caller to do for only the assignments it needs, e.g. those due in the
+        coming week, rather than being part of retrieving courses. Pages are
+        fetched through the messenger's scheduler, so at most
+        scheduler.max_in_flight are requested at once, along with any course
+        pages being fetched.
+
+        Details are cached by assignment URL, in details_cache and in the
+        response cache if there is one, and are fetched again once the status
+        shown for the assignment on its course page differs from when they
+        were retrieved, e.g. when a submitted assignment is graded.
+        Assignments without a URL are skipped.
+
+        A failure to retrieve one assignment's details doesn't affect the
+        others. The details of an assignment that failed are left as they
+        were.
+
+        Args:
+            assignments (Iterable[Assignment]): the assignments to retrieve
+            details for.
+            refresh (bool, optional): Whether to fetch every assignment's page
+            even if its details are cached, e.g. to pick up newly published
+            grades. Defaults to False.
+
+        Returns:
+            Dict[str, Exception]: the error raised while retrieving each
+            assignment that failed, by URL.
         """
+        assignments_by_url: Dict[str, List[Assignment]] = {}
+        for assignment in assignments:
+            if assignment.url:
+                assignments_by_url.setdefault(assignment.url, []).append(assignment)
+
+        errors: Dict[str, Exception] = {}
+
+        async def retrieve(url: str, same_url: List[Assignment]):
+            try:
+                details = await self._retrieve_details(same_url[0], refresh)
+            except Exception as error:
+                errors[url] = error
+            else:
+                for assignment in same_url:
+                    assignment.details = details
+
+        await asyncio.gather(
+            *(
+                self.scheduler.run(
+                    lambda url=url, same_url=same_url: retrieve(url, same_url)
+                )
+                for url, same_url in assignments_by_url.items()
+            )
+        )
+        return errors
 
+    async def iter_assignments_for_courses(
+        self,
+        courses: List[Course],
+        recent_only: bool,
+        max_buffered: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[Course, Optional[Exception]]]:
+        """Retrieve assignments for the given courses, yielding each course as
+        soon as its assignments have been retrieved.
+
+        Courses are fetched the same way as by retrieve_assignments_for_courses,
+        but are yielded in the order they finish rather than once every course
+        has finished. The errors attribute is updated as courses fail.
+
+        If max_buffered is given, at most that many retrieved courses wait to
+        be yielded. A course that finishes while the buffer is full keeps its
+        scheduler slot until there is room, so fetching slows down to the
+        pace of a slow caller instead of piling up results.
+
+        If the caller stops iterating early, the retrieval of the remaining
+        courses is cancelled before the iterator is closed.
+
+        Args:
+            courses (List[Course]): A list of Courses to possibly retrieve
+            assignments for.
+            recent_only (bool): Whether to only retrieve assignments for courses
+            occuring in the most recent term.
+            max_buffered (int, optional): the number of retrieved courses that
+            can wait to be yielded. Defaults to None, for no limit.
+
+        Yields:
+            Tuple[Course, Optional[Exception]]: each course, and the error
+            raised while retrieving it if it failed.
+        """
         if recent_only:
-            await asyncio.gather(
-                *[
-                    self.retrieve_assignments_for_course(course)
-                    for course in processor.strip_old_courses(courses)
-                ]
+            courses = processor.strip_old_courses(courses)
+
+        courses_by_recency = sorted(
+            courses, key=attrgetter('term'), reverse=True
+        )
+        finished: asyncio.Queue = asyncio.Queue(max_buffered or 0)
+
+        async def retrieve(course: Course):
+            try:
+                await self.retrieve_assignments_for_course(course)
+            except Exception as error:
+                await finished.put((course, error))
+            else:
+                await finished.put((course, None))
+
+        self.errors = {}
+        tasks = [
+            asyncio.ensure_future(
+                self.scheduler.run(
+                    lambda course=course: retrieve(course), priority=priority
+                )
             )
-        else:
+            for priority, course in enumerate(courses_by_recency)
+        ]
+        try:
+            for _ in tasks:
+                course, error = await finished.get()
+                if error is not None:
+                    self.errors[course.number] = error
+                yield course, error
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def iter_courses_and_assignments(
+        self, recent_only: bool = True, max_buffered: Optional[int] = None
+    ) -> AsyncIterator[Course]:
+        """Get the user's courses and assignments, yielding each course as soon
+        as its assignments have been retrieved.
+
+        Unlike get_courses_and_assignments, one slow course doesn't hold back
+        the others, so results can be shown or saved while other course pages
+        are still being fetched:
+
+            async for course in messenger.iter_courses_and_assignments():
+                print(course.short_name, len(course.assignments))
+
+        Courses that failed to be retrieved are not yielded. Their errors are
+        recorded in the errors attribute. Courses whose assignments weren't
+        retrieved because of recent_only are not yielded either.
+
+        Args:
+            recent_only (bool, optional): Whether to only retrieve assignments
+            for courses occuring in the most recent term. Defaults to True.
+            max_buffered (int, optional): the number of retrieved courses that
+            can wait to be yielded before fetching slows down. Defaults to
+            None, for no limit.
+
+        Raises:
+            Exception: error related to a failure to log in to Gradescope.
+
+        Yields:
+            Course: each course, with its assignments.
+        """
+        courses = await self.get_courses()
+        # Closing this iterator closes the inner one, cancelling its fetches
+        iterator = self.iter_assignments_for_courses(
+            courses, recent_only, max_buffered
+        )
+        try:
+            async for course, error in iterator:
+                if error is None:
+                    yield course
+        finally:
+            await iterator.aclose()
+
+    async def get_courses(
+        self, on_course: Optional[Callable[[Course], None]] = None
+    ) -> List[Course]:
+        """Get the user's courses from their dashboard, without assignments.
+
+        Cookies loaded with import_session are reused when they are still
+        valid; otherwise, the user is logged in.
+
+        Args:
+            on_course (Callable[[Course], None], optional): called with each
+            course as soon as its entry on the dashboard has been parsed.
+            Defaults to None.
+
+        Raises:
+            Exception: error related to a failure to log in to Gradescope.
+
+        Returns:
+            List[Course]: the courses on the user's dashboard.
+        """
+        courses = await self.resume_session(on_course)
+        if courses is None:
+            courses = await self.login(on_course)
+        return courses
+
+    async def _warm_up_connections(self):
+        # Open connections to Gradescope while the dashboard is requested, so
+        # that the first course fetches don't wait for connections to be set
+        # up. Failures don't matter, since the fetches will connect anyway.
+        # The requests share the session's connector but not its cookies, so
+        # that their responses can't replace the cookie the login's
+        # authenticity token belongs to.
+        warm_up_session = aiohttp.ClientSession(
+            connector=self.session.connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=self.session.timeout,
+        )
+
+        async def warm_up():
+            try:
+                async with warm_up_session.head(self.base_url, allow_redirects=False):
+                    pass
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+        async with warm_up_session:
             await asyncio.gather(
-                *[
-                    self.retrieve_assignments_for_course(course)
-                    for course in courses
-                ]
+                *[warm_up() for _ in range(self.warm_connections)]
             )
 
     async def get_courses_and_assignments(self, recent_only: bool = True) -> List[Course]:
         """Get the user's courses and assignments.
 
+        Cookies loaded with import_session are reused when they are still
+        valid; otherwise, the user is logged in.
+
+        Retrieval is pipelined: each course is scheduled to be fetched as soon
+        as its entry on the dashboard has been parsed, rather than once the
+        whole dashboard has been, and connections are opened while the
+        dashboard is being requested. With recent_only, a course is scheduled
+        if its term is at least as recent as every term listed before it,
+        which is only the most recent term when the dashboard lists it first,
+        as it usually does. Once the whole dashboard has been parsed, any
+        course of the most recent term that wasn't scheduled is, and the
+        fetches of courses from older terms are cancelled; those that already
+        finished keep their assignments.
+
+        A failure to retrieve one course doesn't affect the others, as with
+        retrieve_assignments_for_courses.
+
         Args:
             recent_only (bool, optional): Whether to only retrieve assignments
             for courses occuring in the most recent term. Defaults to True.
 
+        Raises:
+            Exception: error related to a failure to log in to Gradescope.
 
         Returns:
             List[Course]: A list of the user's courses and their possibly
             retrieved assignments. Retrieval of assignments is contingent upon
             the value of recent_only.
         """
+        fetches: Dict[int, asyncio.Future] = {}
+        scheduled: Dict[int, Course] = {}
+        dropped: List[asyncio.Future] = []
+        recent_term: Optional[Term] = None
+
+        def fetch(course: Course):
+            if course.number in scheduled:
+                return
+            scheduled[course.number] = course
+            fetches[course.number] = asyncio.ensure_future(
+                self.scheduler.run(
+                    lambda: self.retrieve_assignments_for_course(course),
+                    priority=len(fetches),
+                )
+            )
 
-        soup = await self.login()
-
-        courses = processor.extract_courses(soup)
-
-        await self.retrieve_assignments_for_courses(courses, recent_only)
+        def on_course(course: Course):
+            nonlocal recent_term
+            if recent_only:
+                if recent_term is not None and course.term < recent_term:
+                    return
+                recent_term = course.term
+            fetch(course)
+
+        warm_up = asyncio.ensure_future(self._warm_up_connections())
+        try:
+            courses = await self.get_courses(on_course)
+            # A retried request could have parsed the dashboard more than
+            # once, so use the courses that were scheduled
+            courses = [scheduled.get(course.number, course) for course in courses]
+            if recent_only:
+                recent_courses = processor.strip_old_courses(courses)
+                recent_numbers = {course.number for course in recent_courses}
+                for number in [n for n in fetches if n not in recent_numbers]:
+                    dropped.append(fetches.pop(number))
+                    dropped[-1].cancel()
+            else:
+                recent_courses = courses
+            for course in recent_courses:
+                fetch(course)
+
+            results = await asyncio.gather(*fetches.values(), return_exceptions=True)
+            self.errors = {
+                number: result
+                for number, result in zip(fetches, results)
+                if isinstance(result, Exception)
+            }
+        finally:
+            tasks = (warm_up, *fetches.values(), *dropped)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         return courses
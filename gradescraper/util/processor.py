@@ -1,12 +1,31 @@
+import functools
+import re
 from datetime import datetime
 from operator import attrgetter
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup, element
+from bs4 import BeautifulSoup, SoupStrainer, element
+from lxml import etree
 
 from gradescraper.structures.assignment import Assignment
 from gradescraper.structures.course import Course
 from gradescraper.structures.term import Term
+from gradescraper.util.profiler import NULL_PROFILER, NullProfiler, Profiler
+
+LOGIN_PAGE_TITLE = 'Log In | Gradescope'
+
+
+def extract_auth_token(page: Union[str, bytes]) -> str:
+    """Extract the authenticity token from a page containing the login form.
+
+    Args:
+        page (Union[str, bytes]): the page's HTML.
+
+    Returns:
+        str: the value of the page's authenticity_token input.
+    """
+    inputs = BeautifulSoup(page, 'lxml', parse_only=SoupStrainer('input'))
+    return inputs.find('input', {'name': 'authenticity_token'}).get('value')
 
 
 def extract_course(course_entry: BeautifulSoup, term: Term) -> Course:
@@ -43,17 +62,21 @@ def extract_courses(courses_dashboard: BeautifulSoup) -> List[Course]:
 
     Returns:
         List[Course]: A list of Courses parsed from the dashboard given.
+
+    Note:
+        iter_dashboard_courses extracts the same courses from the dashboard's
+        HTML without building a tree for the whole page.
     """
     courses: List[Course] = []
-    course_list_div_children: List[BeautifulSoup] = list(
-        courses_dashboard.find('div', {'class': 'courseList'}).children
+    # The courseList alternates between a term's heading and its courses
+    sections = iter(
+        courses_dashboard.find('div', {'class': 'courseList'}).find_all(
+            recursive=False
+        )
     )
-    for i in [
-        x for x in range(len(course_list_div_children) - 1) if x % 2 == 0
-    ]:
-        term_season, term_year = course_list_div_children[i].string.split(' ')
+    for term_heading, term_courses_div in zip(sections, sections):
+        term_season, term_year = term_heading.string.split(' ')
         term = Term(term_season, int(term_year))
-        term_courses_div = course_list_div_children[i + 1]
         for tag in term_courses_div.find_all('a', class_='courseBox'):
             courses.append(extract_course(tag, term))
 
@@ -79,6 +102,8 @@ def extract_assignment_from_row(
     submitted = not row.find(
         'td', {'class': 'submissionStatus submissionStatus-warning'}
     )
+    status_cell = row.find('td', {'class': 'submissionStatus'})
+    status = _status_text(status_cell.get_text()) if status_cell else None
     assignment_link_header: element.Tag = row.find(
         'th', {'class': 'table--primaryLink'}
     )
@@ -119,9 +144,634 @@ def extract_assignment_from_row(
         release_date,
         due_date,
         late_due_date,
+        status,
+    )
+
+
+_MONTHS = {
+    month.lower(): number
+    for number, month in enumerate(
+        ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+        start=1,
+    )
+}
+_RELEASE_DATE = re.compile(r'([A-Za-z]{3})\s+(3[01]|[12]\d|0?[1-9])')
+_DUE_DATE = re.compile(
+    r'([A-Za-z]{3})\s+(3[01]|[12]\d|0?[1-9])\s+at\s+'
+    r'(1[0-2]|0?[1-9]):([0-5]?\d)([AaPp][Mm])'
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_release_date(text: str, assignment_year: str) -> datetime:
+    """Parse a release date like 'May 10'.
+
+    Gradescope shows few distinct dates, so results are cached. Dates are
+    matched by hand, falling back to datetime.strptime with the format
+    '%b %d' for anything unusual.
+
+    Args:
+        text (str): the release date.
+        assignment_year (str): the year the assignment was released in.
+
+    Raises:
+        ValueError: if text isn't a valid date.
+
+    Returns:
+        datetime: the release date, at midnight.
+    """
+    match = _RELEASE_DATE.fullmatch(text)
+    month = match and _MONTHS.get(match[1].lower())
+    if not month:
+        return datetime.strptime(text, '%b %d').replace(year=int(assignment_year))
+    return datetime(int(assignment_year), month, int(match[2]))
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_due_date(text: str, assignment_year: str) -> datetime:
+    """Parse a due date like 'May 10 at 11:59PM' or 'Late Due Date: May 12
+    at 11:59PM'.
+
+    Gradescope shows few distinct dates, so results are cached. Dates are
+    matched by hand, falling back to datetime.strptime with the format
+    '%b %d at %I:%M%p' for anything unusual.
+
+    Args:
+        text (str): the due date, optionally prefixed by a label ending in
+        'Due Date: '.
+        assignment_year (str): the year the assignment was released in.
+
+    Raises:
+        ValueError: if text isn't a valid date.
+
+    Returns:
+        datetime: the due date.
+    """
+    text = text.split('Due Date: ')[-1]
+    match = _DUE_DATE.fullmatch(text)
+    month = match and _MONTHS.get(match[1].lower())
+    if not month:
+        return datetime.strptime(text, '%b %d at %I:%M%p').replace(
+            year=int(assignment_year)
+        )
+    hour = int(match[3]) % 12
+    if match[5].lower() == 'pm':
+        hour += 12
+    return datetime(
+        int(assignment_year), month, int(match[2]), hour, int(match[4])
+    )
+
+
+def extract_assignment_from_row_fast(
+    row: BeautifulSoup, course_name: str, assignment_year: str
+) -> Assignment:
+    """Extract an Assignment from the row given, walking the row only once.
+
+    This produces the same Assignments as extract_assignment_from_row, which
+    is kept as the reference implementation, but visits each tag of the row
+    once, dispatching on its name and classes, instead of searching the row
+    for each field. Dates are parsed with parse_release_date and
+    parse_due_date.
+
+    Args:
+        row (BeautifulSoup): An HTML 'tr' element containing information about
+        an Assignment.
+        course_name (str): The name of the course that this assignment belongs
+        to.
+        assignment_year (str): The year that the assignment was assigned.
+
+    Returns:
+        Assignment: an assignment parsed from the row HTML given.
+    """
+    submitted = True
+    status_cell = None
+    assignment_link_header = assignment_link_element = None
+    release_date_span = None
+    due_date_spans = []
+    for tag in row.descendants:
+        name = tag.name
+        if name is None:
+            continue
+        classes = tag.get('class')
+        if name == 'a':
+            if assignment_link_element is None and assignment_link_header is not None:
+                if any(parent is assignment_link_header for parent in tag.parents):
+                    assignment_link_element = tag
+            continue
+        if not classes:
+            continue
+        if name == 'td':
+            if ' '.join(classes) == 'submissionStatus submissionStatus-warning':
+                submitted = False
+            if status_cell is None and 'submissionStatus' in classes:
+                status_cell = tag
+        elif name == 'th':
+            if assignment_link_header is None and 'table--primaryLink' in classes:
+                assignment_link_header = tag
+        elif name == 'span':
+            if 'submissionTimeChart--releaseDate' in classes:
+                if release_date_span is None:
+                    release_date_span = tag
+            elif 'submissionTimeChart--dueDate' in classes:
+                due_date_spans.append(tag)
+
+    assignment_name: str = (
+        assignment_link_element or assignment_link_header
+    ).string
+
+    base_url = 'https://www.gradescope.com'
+
+    assignment_url: str = (
+        base_url + assignment_link_element['href'].split('/submissions')[0]
+        if assignment_link_element
+        else ''
+    )
+
+    # Cache plain strs, since NavigableStrings keep the parsed tree alive
+    release_date = parse_release_date(
+        _optional_str(release_date_span.string), assignment_year
+    )
+    due_dates = [
+        parse_due_date(_optional_str(span.string), assignment_year)
+        for span in due_date_spans
+    ]
+    due_date = due_dates[0]
+    late_due_date = due_dates[1] if len(due_dates) == 2 else None
+    status = _status_text(status_cell.get_text()) if status_cell else None
+    return Assignment(
+        assignment_name,
+        course_name,
+        assignment_url,
+        submitted,
+        release_date,
+        due_date,
+        late_due_date,
+        status,
+    )
+
+
+def _status_text(text: str) -> str:
+    # Status cells are indented over several lines
+    return ' '.join(text.split())
+
+
+def _optional_str(string: Optional[str]) -> Optional[str]:
+    # Plain strs don't keep the parsed tree alive the way NavigableStrings do
+    return str(string) if string is not None else None
+
+
+def assignment_to_tuple(assignment: Assignment) -> tuple:
+    """Convert an Assignment to a compact, picklable tuple.
+
+    Args:
+        assignment (Assignment): the assignment to convert.
+
+    Returns:
+        tuple: the Assignment's constructor arguments, in order.
+    """
+    return (
+        _optional_str(assignment.name),
+        _optional_str(assignment.course_name),
+        assignment.url,
+        assignment.submitted,
+        assignment.release_date,
+        assignment.due_date,
+        assignment.late_due_date,
+        assignment.status,
+    )
+
+
+def parse_course_page(
+    course_page: Union[str, bytes],
+    course_name: str,
+    assignment_year: str,
+    profiler: Union[Profiler, NullProfiler] = NULL_PROFILER,
+    track: str = 'main',
+) -> List[tuple]:
+    """Parse every assignment row of a course page.
+
+    Since its arguments and result are plain data, this can be run in a worker
+    process, as long as no Profiler is passed.
+
+    Args:
+        course_page (Union[str, bytes]): the course page's HTML.
+        course_name (str): The name of the course the page belongs to.
+        assignment_year (str): The year that the course's assignments were
+        assigned.
+        profiler (Union[Profiler, NullProfiler], optional): records the
+        extraction of each row. Defaults to NULL_PROFILER.
+        track (str, optional): the profiler track to record rows on. Defaults
+        to 'main'.
+
+    Returns:
+        List[tuple]: a tuple of Assignment constructor arguments for each
+        assignment on the page.
+    """
+    rows = BeautifulSoup(
+        course_page, 'lxml', parse_only=SoupStrainer('tr')
+    ).find_all('tr')[1:]
+    assignment_tuples = []
+    for row in rows:
+        with profiler.span('extract row', track):
+            assignment_tuples.append(
+                assignment_to_tuple(
+                    extract_assignment_from_row_fast(
+                        row, course_name, assignment_year
+                    )
+                )
+            )
+    return assignment_tuples
+
+
+_SCORE = re.compile(r'(-|-?\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)')
+
+
+def _parse_submission_time(value: str) -> Optional[datetime]:
+    # Gradescope writes times like '2021-04-08 21:14:03 -0700'. Other dates
+    # are naive local times, so the offset is dropped.
+    for date_format in ('%Y-%m-%d %H:%M:%S %z', '%Y-%m-%dT%H:%M:%S%z'):
+        try:
+            return datetime.strptime(value, date_format).replace(tzinfo=None)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_assignment_details(
+    assignment_page: Union[str, bytes]
+) -> Tuple[Optional[float], Optional[float], Optional[datetime]]:
+    """Parse the score and submission time from an assignment's page.
+
+    Since its argument and result are plain data, this can be run in a worker
+    process.
+
+    Args:
+        assignment_page (Union[str, bytes]): the HTML of the assignment's page,
+        which shows the user's submission if there is one.
+
+    Returns:
+        Tuple[Optional[float], Optional[float], Optional[datetime]]: the
+        AssignmentDetails constructor arguments: the score, which is None if
+        the submission hasn't been graded, the points possible, and the time
+        of the submission.
+    """
+    root = etree.HTML(assignment_page)
+    score = points_possible = submitted_at = None
+    if root is None:
+        return score, points_possible, submitted_at
+    for tag in root.iter('div', 'span'):
+        if _has_class(tag, 'submissionOutlineHeader--totalPoints'):
+            match = _SCORE.search(''.join(tag.itertext()))
+            if match:
+                if match.group(1) != '-':
+                    score = float(match.group(1))
+                points_possible = float(match.group(2))
+            break
+    for tag in root.iter('time'):
+        if tag.get('datetime'):
+            submitted_at = _parse_submission_time(tag.get('datetime'))
+            break
+    return score, points_possible, submitted_at
+
+
+class LoginPageError(Exception):
+    """Raised when the login page is parsed in place of the dashboard."""
+
+
+def _extract_course_element(course_entry: etree._Element, term: Term) -> Course:
+    fields = {}
+    for child in course_entry:
+        for class_name in (child.get('class') or '').split():
+            # str drops lxml's reference from the string back to the tree
+            fields[class_name] = str(_element_string(child))
+    return Course(
+        term,
+        int(course_entry.get('href').replace('/courses/', '')),
+        fields['courseBox--shortname'],
+        fields['courseBox--name'],
+        int(fields['courseBox--assignments'].split(' ')[0]),
+    )
+
+
+class DashboardStreamParser:
+    """An incremental parser for the courses on the dashboard shown after
+    logging in.
+
+    Chunks of the page are fed to the parser as they arrive, and courses are
+    extracted as soon as their courseBox entries are complete. Only the
+    title, term headings and course entries of the courseList region are
+    looked at, no tree is built for the whole page, and each entry is
+    discarded once it has been extracted. Since the title comes first, the
+    login page is recognized before any course is extracted.
+
+    Attributes:
+        title (str, optional): the page's title, once it has been parsed.
+    """
+
+    def __init__(self, encoding: str = None):
+        """Create a DashboardStreamParser for one dashboard.
+
+        Args:
+            encoding (str, optional): the page's encoding. Defaults to None,
+            in which case it is detected from the page.
+        """
+        self.title: Optional[str] = None
+        self._term: Optional[Term] = None
+        self._empty = True
+        self._parser = etree.HTMLPullParser(
+            events=('end',), tag=('title', 'h2', 'a'), encoding=encoding
+        )
+
+    def _read_events(self) -> List[Tuple[Term, Course]]:
+        entries = []
+        for _, tag in self._parser.read_events():
+            if tag.tag == 'title':
+                if self.title is None:
+                    # str drops lxml's reference from the string to the tree
+                    self.title = str(_element_string(tag))
+                    if self.title == LOGIN_PAGE_TITLE:
+                        raise LoginPageError(LOGIN_PAGE_TITLE)
+            elif tag.tag == 'h2':
+                if _has_class(tag, 'courseList--term') and _has_class(
+                    tag.getparent(), 'courseList'
+                ):
+                    season, year = _element_string(tag).split(' ')
+                    self._term = Term(str(season), int(year))
+            elif self._term is not None and _has_class(tag, 'courseBox'):
+                entries.append(
+                    (self._term, _extract_course_element(tag, self._term))
+                )
+                # Drop earlier entries so memory use doesn't grow with the page
+                parent = tag.getparent()
+                while tag.getprevious() is not None:
+                    del parent[0]
+                tag.clear()
+        return entries
+
+    def feed(self, chunk: Union[str, bytes]) -> List[Tuple[Term, Course]]:
+        """Parse the next chunk of the page.
+
+        Args:
+            chunk (Union[str, bytes]): the next chunk of the page.
+
+        Raises:
+            LoginPageError: if the page is the login page instead of the
+            dashboard.
+
+        Returns:
+            List[Tuple[Term, Course]]: the courses whose entries were completed
+            by the chunk, and the terms they take place during. Courses from
+            the same term share a Term.
+        """
+        if chunk:
+            self._empty = False
+            self._parser.feed(chunk)
+        return self._read_events()
+
+    def close(self) -> List[Tuple[Term, Course]]:
+        """Finish parsing the page.
+
+        Raises:
+            LoginPageError: if the page is the login page instead of the
+            dashboard.
+
+        Returns:
+            List[Tuple[Term, Course]]: the courses whose entries were completed
+            by the end of the page.
+        """
+        if self._empty:
+            # lxml refuses to close a parser that was never fed any data
+            return []
+        self._parser.close()
+        return self._read_events()
+
+
+def iter_dashboard_courses(
+    dashboard_page: Union[str, bytes], chunk_size: int = 64 * 1024
+) -> Iterator[Tuple[Term, Course]]:
+    """Extract the courses from the dashboard shown after logging in, in a
+    single pass over the page.
+
+    Unlike extract_courses, no tree is built for the whole page: the page is
+    fed to a DashboardStreamParser a chunk at a time.
+
+    Args:
+        dashboard_page (Union[str, bytes]): the dashboard's HTML.
+        chunk_size (int, optional): the number of characters or bytes parsed
+        at a time. Defaults to 64 KiB.
+
+    Raises:
+        LoginPageError: if the page is the login page instead of the
+        dashboard.
+
+    Yields:
+        Tuple[Term, Course]: each course, and the term it takes place during,
+        in the order they are listed. Courses from the same term share a
+        Term.
+    """
+    parser = DashboardStreamParser()
+    for start in range(0, len(dashboard_page), chunk_size):
+        yield from parser.feed(dashboard_page[start : start + chunk_size])
+    yield from parser.close()
+
+
+def _element_string(tag: etree._Element) -> Optional[str]:
+    # Mirrors BeautifulSoup's Tag.string: the text of a tag whose only content
+    # is a single string, possibly nested inside a single child tag.
+    children = list(tag)
+    if not children:
+        return tag.text
+    if len(children) == 1 and not tag.text and not children[0].tail:
+        return _element_string(children[0])
+    return None
+
+
+def _has_class(tag: etree._Element, class_name: str) -> bool:
+    return class_name in (tag.get('class') or '').split()
+
+
+def extract_assignment_from_element(
+    row: etree._Element, course_name: str, assignment_year: str
+) -> Assignment:
+    """Extract an Assignment from the lxml row element given.
+
+    This is the lxml equivalent of extract_assignment_from_row, and produces
+    identical Assignments.
+
+    Args:
+        row (etree._Element): An HTML 'tr' element containing information
+        about an Assignment.
+        course_name (str): The name of the course that this assignment belongs
+        to.
+        assignment_year (str): The year that the assignment was assigned.
+
+    Returns:
+        Assignment: an assignment parsed from the row element given.
+    """
+    submitted = True
+    status_cell = None
+    assignment_link_header = assignment_link_element = None
+    release_date_span = None
+    due_date_spans = []
+    for tag in row.iter('td', 'th', 'span'):
+        if tag.tag == 'td':
+            if ' '.join((tag.get('class') or '').split()) == (
+                'submissionStatus submissionStatus-warning'
+            ):
+                submitted = False
+            if status_cell is None and _has_class(tag, 'submissionStatus'):
+                status_cell = tag
+        elif tag.tag == 'th':
+            if assignment_link_header is None and _has_class(
+                tag, 'table--primaryLink'
+            ):
+                assignment_link_header = tag
+                assignment_link_element = next(tag.iter('a'), None)
+        elif _has_class(tag, 'submissionTimeChart--releaseDate'):
+            if release_date_span is None:
+                release_date_span = tag
+        elif _has_class(tag, 'submissionTimeChart--dueDate'):
+            due_date_spans.append(tag)
+
+    assignment_name = _element_string(
+        assignment_link_element
+        if assignment_link_element is not None
+        else assignment_link_header
+    )
+
+    base_url = 'https://www.gradescope.com'
+
+    assignment_url: str = (
+        base_url + assignment_link_element.get('href').split('/submissions')[0]
+        if assignment_link_element is not None
+        else ''
+    )
+
+    release_date = parse_release_date(
+        _element_string(release_date_span), assignment_year
+    )
+    due_dates = [
+        parse_due_date(_element_string(span), assignment_year)
+        for span in due_date_spans
+    ]
+    due_date = due_dates[0]
+    late_due_date = due_dates[1] if len(due_dates) == 2 else None
+    status = (
+        _status_text(''.join(status_cell.itertext()))
+        if status_cell is not None
+        else None
+    )
+    return Assignment(
+        assignment_name,
+        course_name,
+        assignment_url,
+        submitted,
+        release_date,
+        due_date,
+        late_due_date,
+        status,
     )
 
 
+class AssignmentStreamParser:
+    """An incremental parser for the assignment rows of a course page.
+
+    Chunks of the page are fed to the parser as they arrive, and Assignments
+    are extracted as soon as their rows are complete, without building a tree
+    for the whole page. Rows are discarded once extracted. The first row of
+    the page is the table's header, and is skipped.
+
+    Attributes:
+        course_name (str): the name of the course the page belongs to.
+        assignment_year (str): the year that the course's assignments were
+        assigned.
+        title (str, optional): the page's title, once it has been parsed.
+    """
+
+    def __init__(
+        self,
+        course_name: str,
+        assignment_year: str,
+        encoding: str = None,
+        profiler: Union[Profiler, NullProfiler] = NULL_PROFILER,
+        track: str = 'main',
+    ):
+        """Create an AssignmentStreamParser for one course page.
+
+        Args:
+            course_name (str): the name of the course the page belongs to.
+            assignment_year (str): the year that the course's assignments were
+            assigned.
+            encoding (str, optional): the page's encoding. Defaults to None,
+            in which case it is detected from the page.
+            profiler (Union[Profiler, NullProfiler], optional): records the
+            extraction of each row. Defaults to NULL_PROFILER.
+            track (str, optional): the profiler track to record rows on.
+            Defaults to 'main'.
+        """
+        self.course_name = course_name
+        self.assignment_year = assignment_year
+        self.profiler = profiler
+        self.track = track
+        self.title: Optional[str] = None
+        self._rows_seen = 0
+        self._empty = True
+        self._parser = etree.HTMLPullParser(
+            events=('end',), tag=('title', 'tr'), encoding=encoding
+        )
+
+    def _read_events(self) -> List[Assignment]:
+        assignments = []
+        for _, tag in self._parser.read_events():
+            if tag.tag == 'title':
+                if self.title is None:
+                    self.title = _element_string(tag)
+                continue
+
+            self._rows_seen += 1
+            if self._rows_seen > 1:
+                with self.profiler.span('extract row', self.track):
+                    assignments.append(
+                        extract_assignment_from_element(
+                            tag, self.course_name, self.assignment_year
+                        )
+                    )
+            tag.clear()
+            # Drop earlier rows so memory use doesn't grow with the page
+            parent = tag.getparent()
+            while parent is not None and tag.getprevious() is not None:
+                del parent[0]
+        return assignments
+
+    def feed(self, chunk: bytes) -> List[Assignment]:
+        """Parse the next chunk of the page.
+
+        Args:
+            chunk (bytes): the next chunk of the page.
+
+        Returns:
+            List[Assignment]: the Assignments whose rows were completed by the
+            chunk.
+        """
+        if chunk:
+            self._empty = False
+            self._parser.feed(chunk)
+        return self._read_events()
+
+    def close(self) -> List[Assignment]:
+        """Finish parsing the page.
+
+        Returns:
+            List[Assignment]: the Assignments whose rows were completed by the
+            end of the page.
+        """
+        if self._empty:
+            # lxml refuses to close a parser that was never fed any data
+            return []
+        self._parser.close()
+        return self._read_events()
+
+
 def strip_old_courses(courses_list: List[Course]) -> List[Course]:
     """Return the courses in courses_list that occurred in the most recent term.
 
@@ -132,7 +782,9 @@ def strip_old_courses(courses_list: List[Course]) -> List[Course]:
         List[Course]: courses in courses_list that took place in the most recent
         term.
     """
-    most_recent_term = min(courses_list, key=attrgetter('term')).term
+    if not courses_list:
+        return []
+    most_recent_term = max(courses_list, key=attrgetter('term')).term
     return [
         course for course in courses_list if course.term == most_recent_term
     ]
@@ -0,0 +1,226 @@
+import json
+import time
+from typing import Any, Callable, Dict, List, NamedTuple
+
+
+class Span(NamedTuple):
+    """A timed phase of a run.
+
+    Attributes:
+        name (str): the name of the phase, e.g. 'fetch course'.
+        track (str): the track the span is shown on in a trace viewer. Spans
+        that run concurrently, like the fetches of different courses, should
+        be on different tracks.
+        start (float): the number of seconds from the profiler's creation to
+        the start of the span.
+        duration (float): the length of the span in seconds.
+        attributes (Dict[str, Any]): details recorded about the span, e.g. the
+        size of a response.
+    """
+
+    name: str
+    track: str
+    start: float
+    duration: float
+    attributes: Dict[str, Any]
+
+
+class PhaseSummary(NamedTuple):
+    """The combined timings of every span with the same name."""
+
+    name: str
+    count: int
+    total: float
+    mean: float
+    max: float
+
+
+class _ActiveSpan:
+    __slots__ = ('_profiler', '_name', '_track', '_start', 'attributes')
+
+    def __init__(self, profiler: 'Profiler', name: str, track: str, attributes):
+        self._profiler = profiler
+        self._name = name
+        self._track = track
+        self.attributes = attributes
+
+    def set(self, **attributes):
+        """Record details about the span."""
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self._start = self._profiler.clock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        end = self._profiler.clock()
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        self._profiler.spans.append(
+            Span(
+                self._name,
+                self._track,
+                self._start - self._profiler.origin,
+                end - self._start,
+                self.attributes,
+            )
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullProfiler:
+    """A profiler that records nothing, used when profiling is off.
+
+    Its spans are a single shared object that does nothing, so instrumented
+    code costs little more than a method call when profiling is off.
+    """
+
+    enabled = False
+
+    def span(self, name: str, track: str = 'main', **attributes) -> _NullSpan:
+        return _NULL_SPAN
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    """Records timed spans of the phases of a run.
+
+    Spans are recorded with a context manager:
+
+        with profiler.span('login') as span:
+            ...
+            span.set(status=200)
+
+    Attributes:
+        clock (Callable[[], float]): returns the current time in seconds.
+        origin (float): the time the profiler was created.
+        spans (List[Span]): the spans recorded so far, in the order they ended.
+    """
+
+    enabled = True
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """Create a Profiler.
+
+        Args:
+            clock (Callable[[], float], optional): returns the current time in
+            seconds. Defaults to time.perf_counter.
+        """
+        self.clock = clock
+        self.origin = clock()
+        self.spans: List[Span] = []
+
+    def span(self, name: str, track: str = 'main', **attributes) -> _ActiveSpan:
+        """Create a span, which is timed while it is used as a context manager.
+
+        Args:
+            name (str): the name of the phase.
+            track (str, optional): the track the span is shown on in a trace
+            viewer. Defaults to 'main'.
+            **attributes: details to record about the span.
+
+        Returns:
+            _ActiveSpan: the span. Its set method records further details.
+        """
+        return _ActiveSpan(self, name, track, attributes)
+
+    def summary(self) -> List[PhaseSummary]:
+        """Combine the recorded spans by name.
+
+        Returns:
+            List[PhaseSummary]: the timings of each phase, in the order that
+            phases first ended.
+        """
+        durations: Dict[str, List[float]] = {}
+        for span in self.spans:
+            durations.setdefault(span.name, []).append(span.duration)
+        return [
+            PhaseSummary(name, len(times), sum(times), sum(times) / len(times), max(times))
+            for name, times in durations.items()
+        ]
+
+    def format_summary(self) -> str:
+        """Format the summary of the recorded spans as a table.
+
+        Returns:
+            str: the table, with times in milliseconds.
+        """
+        lines = [
+            f'{"Phase":<20} {"Count":>7} {"Total (ms)":>11} {"Mean (ms)":>10} {"Max (ms)":>10}'
+        ]
+        for phase in self.summary():
+            lines.append(
+                f'{phase.name:<20} {phase.count:>7} {phase.total * 1000:>11.2f} '
+                f'{phase.mean * 1000:>10.3f} {phase.max * 1000:>10.2f}'
+            )
+        fetches = [span for span in self.spans if span.name == 'fetch course']
+        if fetches:
+            ttfb = [span.attributes.get('ttfb', 0) for span in fetches]
+            size = sum(span.attributes.get('bytes', 0) for span in fetches)
+            lines.append(
+                f'Course pages: {size / 1024:.1f} KiB in {len(fetches)} fetches, '
+                f'mean time to first byte {sum(ttfb) / len(ttfb) * 1000:.2f} ms'
+            )
+        return '\n'.join(lines)
+
+    def trace_events(self) -> dict:
+        """Convert the recorded spans to the Trace Event Format.
+
+        The result can be loaded into chrome://tracing or Perfetto. Each track
+        is shown as a separate thread.
+
+        Returns:
+            dict: the trace, with times in microseconds.
+        """
+        tracks: Dict[str, int] = {}
+        events = []
+        for span in sorted(self.spans, key=lambda span: span.start):
+            tid = tracks.setdefault(span.track, len(tracks))
+            events.append(
+                {
+                    'name': span.name,
+                    'ph': 'X',
+                    'pid': 1,
+                    'tid': tid,
+                    'ts': span.start * 1e6,
+                    'dur': span.duration * 1e6,
+                    'args': span.attributes,
+                }
+            )
+        events.extend(
+            {
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': 1,
+                'tid': tid,
+                'args': {'name': track},
+            }
+            for track, tid in tracks.items()
+        )
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_trace(self, path: str):
+        """Write the recorded spans to a file in the Trace Event Format.
+
+        Args:
+            path (str): the path of the file.
+        """
+        with open(path, 'w') as trace_file:
+            json.dump(self.trace_events(), trace_file, default=str)
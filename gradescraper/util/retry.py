@@ -0,0 +1,174 @@
+import asyncio
+import datetime
+import email.utils
+import random
+import time
+from typing import Callable, FrozenSet, Optional
+
+
+class TokenBucket:
+    """A client-side rate limiter allowing short bursts of requests.
+
+    Tokens are added at a constant rate, up to the bucket's capacity, and each
+    request takes one, waiting for it if the bucket is empty.
+
+    Attributes:
+        rate (float): the number of tokens added per second.
+        capacity (float): the most tokens the bucket holds, and so the largest
+        burst of requests allowed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create a full TokenBucket.
+
+        Args:
+            rate (float): the number of tokens added per second.
+            capacity (float, optional): the most tokens the bucket holds.
+            Defaults to None, in which case it holds one second of tokens, or
+            one token if rate is less than one.
+            clock (Callable[[], float], optional): returns the current time in
+            seconds. Defaults to time.monotonic.
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self):
+        """Take a token from the bucket, waiting until one is available."""
+        # Waiters queue on the lock, so tokens are handed out in order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse the value of a Retry-After header.
+
+    Args:
+        value (str, optional): the header's value, either a number of seconds
+        or an HTTP date.
+
+    Returns:
+        Optional[float]: the number of seconds to wait, or None if value is
+        missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((retry_at - now).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    """When, and after how long, failed requests are retried.
+
+    Requests are retried after connection errors, timeouts, and responses with
+    a status in retry_statuses. The delay before each retry grows
+    exponentially, with full jitter, unless the server asks for a specific
+    delay with a Retry-After header.
+
+    Attributes:
+        max_attempts (int): the most times a request is made.
+        base_delay (float): the delay, in seconds, before the first retry,
+        before jitter.
+        max_delay (float): the longest delay, in seconds, before a retry,
+        including those asked for with Retry-After.
+        deadline (float, optional): the most seconds spent on a request,
+        across every attempt, after which it isn't retried.
+        retry_statuses (FrozenSet[int]): the response statuses that are
+        retried.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30,
+        deadline: Optional[float] = 120,
+        retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504}),
+        random_fraction: Callable[[], float] = random.random,
+    ):
+        """Create a RetryPolicy.
+
+        Args:
+            max_attempts (int, optional): the most times a request is made.
+            Defaults to 4.
+            base_delay (float, optional): the delay, in seconds, before the
+            first retry, before jitter. Defaults to 0.5.
+            max_delay (float, optional): the longest delay, in seconds, before
+            a retry. Defaults to 30.
+            deadline (float, optional): the most seconds spent on a request,
+            across every attempt. Defaults to 120.
+            retry_statuses (FrozenSet[int], optional): the response statuses
+            that are retried. Defaults to 429 and the 5xx statuses that signal
+            a temporary failure.
+            random_fraction (Callable[[], float], optional): returns a random
+            number in [0, 1). Defaults to random.random.
+        """
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = retry_statuses
+        self._random_fraction = random_fraction
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the number of seconds to wait before retrying a request.
+
+        Args:
+            attempt (int): the number of attempts made so far, starting at 1.
+            retry_after (str, optional): the Retry-After header of the failed
+            response, if any. Defaults to None.
+
+        Returns:
+            float: the delay in seconds.
+        """
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return min(requested, self.max_delay)
+        backoff = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return backoff * self._random_fraction()
+
+    def should_retry(self, attempt: int, delay: float, elapsed: float) -> bool:
+        """Check whether a failed request should be retried.
+
+        Args:
+            attempt (int): the number of attempts made so far, starting at 1.
+            delay (float): the delay before the retry.
+            elapsed (float): the seconds spent on the request so far.
+
+        Returns:
+            bool: whether to retry the request.
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return self.deadline is None or elapsed + delay < self.deadline
@@ -0,0 +1,81 @@
+import asyncio
+import heapq
+import itertools
+from typing import Awaitable, Callable, List, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class FetchScheduler:
+    """A scheduler that bounds the number of fetches running at once.
+
+    Jobs wait for a free slot before running. When a slot frees up, it is
+    handed to the waiting job with the lowest priority value, with ties broken
+    in submission order, so high priority jobs (e.g. courses from the current
+    term) are never starved by a large backlog of older ones.
+
+    Attributes:
+        max_in_flight (int): the maximum number of jobs that may run at once.
+        in_flight (int): the number of jobs currently running.
+    """
+
+    def __init__(self, max_in_flight: int = 6):
+        """Create a FetchScheduler.
+
+        Args:
+            max_in_flight (int, optional): the maximum number of jobs that may
+            run at once. Defaults to 6.
+
+        Raises:
+            ValueError: if max_in_flight is less than 1.
+        """
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._waiting: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    async def _acquire(self, priority: int):
+        if self.in_flight < self.max_in_flight and not self._waiting:
+            self.in_flight += 1
+            return
+
+        slot = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._counter), slot))
+        try:
+            await slot
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                # The slot was handed over just before the cancellation.
+                self._release()
+            raise
+
+    def _release(self):
+        while self._waiting:
+            _, _, slot = heapq.heappop(self._waiting)
+            if not slot.done():
+                # Hand the slot straight to the next job; in_flight is unchanged
+                slot.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def run(
+        self, job: Callable[[], Awaitable[T]], priority: int = 0
+    ) -> T:
+        """Run job once a slot is available.
+
+        Args:
+            job (Callable[[], Awaitable[T]]): a function returning the
+            awaitable to run.
+            priority (int, optional): the job's priority. Lower values run
+            first. Defaults to 0.
+
+        Returns:
+            T: the result of the job.
+        """
+        await self._acquire(priority)
+        try:
+            return await job()
+        finally:
+            self._release()
@@ -0,0 +1,354 @@
+import datetime
+from typing import Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.due_date_index import DueDateIndex
+from gradescraper.util.diff import Change
+from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.sync import SyncResult
+from gradescraper.util.watch import PollSchedule, watch
+
+
+class AssignmentService:
+    """Answers queries about assignments from an in-memory snapshot.
+
+    The snapshot is replaced as a whole by update, and every query is answered
+    from indexes built when it was replaced, so queries never make a request
+    to Gradescope. Most take O(log n + k) time for k results; unsubmitted
+    also scans the assignments near their late due dates (see
+    DueDateIndex.in_late_window).
+
+    Attributes:
+        courses (List[Course]): the courses in the snapshot.
+        synced_at (datetime.datetime, optional): when the snapshot was last
+        replaced, or None if it never has been.
+        errors (Dict[int, Exception]): the errors raised while retrieving
+        courses in the last sync, by course number.
+        last_error (Exception, optional): the error raised by the last sync if
+        it failed, or None if it succeeded.
+        days_forward (int): the number of days ahead that queries cover by
+        default.
+    """
+
+    def __init__(
+        self,
+        courses: Optional[List[Course]] = None,
+        days_forward: int = 7,
+        now: Callable[[], datetime.datetime] = datetime.datetime.now,
+    ):
+        """Create an AssignmentService.
+
+        Args:
+            courses (List[Course], optional): the initial snapshot, e.g. loaded
+            from a SnapshotStore so that queries can be answered before the
+            first sync. Defaults to None.
+            days_forward (int, optional): the number of days ahead that
+            queries cover by default. Defaults to 7.
+            now (Callable[[], datetime.datetime], optional): returns the
+            current date, which queries are relative to. Defaults to
+            datetime.datetime.now.
+        """
+        self.days_forward = days_forward
+        self.synced_at: Optional[datetime.datetime] = None
+        self.errors: Dict[int, Exception] = {}
+        self.last_error: Optional[Exception] = None
+        self._now = now
+        self._set_courses(courses or [])
+
+    def _set_courses(self, courses: List[Course]):
+        # Queries only read these attributes, so assigning them replaces the
+        # snapshot at once for every later query
+        self.courses = courses
+        self._courses_by_number = {course.number: course for course in courses}
+        self._index = DueDateIndex.merge(course.due_date_index for course in courses)
+
+    def update(self, courses: List[Course], errors: Optional[Dict[int, Exception]] = None):
+        """Replace the snapshot with newly synced courses.
+
+        Args:
+            courses (List[Course]): the courses on the user's dashboard.
+            errors (Dict[int, Exception], optional): the errors raised while
+            retrieving courses, by course number. Defaults to None.
+        """
+        self._set_courses(courses)
+        self.errors = errors or {}
+        self.last_error = None
+        self.synced_at = datetime.datetime.now()
+
+    def _range(self, days: Optional[int]):
+        start = self._now()
+        return start, start + datetime.timedelta(
+            days=self.days_forward if days is None else days
+        )
+
+    def upcoming(
+        self,
+        days: Optional[int] = None,
+        unsubmitted_only: bool = False,
+        include_late: bool = False,
+    ) -> List[Assignment]:
+        """Get the assignments of every course due in the coming days.
+
+        Args:
+            days (int, optional): the number of days ahead to include.
+            Defaults to None, for days_forward.
+            unsubmitted_only (bool, optional): Whether to only return
+            unsubmitted assignments. Defaults to False.
+            include_late (bool, optional): Whether to also return assignments
+            whose late due date is in the range. Defaults to False.
+
+        Returns:
+            List[Assignment]: the assignments, ordered by due date.
+        """
+        return self._index.in_range(
+            *self._range(days), unsubmitted_only, include_late
+        )
+
+    def unsubmitted(self, days: Optional[int] = None) -> List[Assignment]:
+        """Get the unsubmitted assignments that can still be submitted in the
+        coming days, on time or late.
+
+        Args:
+            days (int, optional): the number of days ahead to include.
+            Defaults to None, for days_forward.
+
+        Returns:
+            List[Assignment]: the assignments that can only be submitted late,
+            ordered by late due date, followed by the assignments that can
+            still be submitted on time, ordered by due date.
+        """
+        now = self._now()
+        return self._index.in_late_window(now) + self.upcoming(
+            days, unsubmitted_only=True
+        )
+
+    def course(self, number: int) -> Optional[Course]:
+        """Get a course by its number.
+
+        Args:
+            number (int): the course's number.
+
+        Returns:
+            Course, optional: the course, or None if it isn't in the snapshot.
+        """
+        return self._courses_by_number.get(number)
+
+    def course_assignments(
+        self,
+        number: int,
+        days: Optional[int] = None,
+        unsubmitted_only: bool = False,
+        include_late: bool = False,
+    ) -> Optional[List[Assignment]]:
+        """Get the assignments of a course.
+
+        Args:
+            number (int): the course's number.
+            days (int, optional): the number of days ahead to include.
+            Defaults to None, for every assignment of the course.
+            unsubmitted_only (bool, optional): Whether to only return
+            unsubmitted assignments. Defaults to False.
+            include_late (bool, optional): Whether to also return assignments
+            whose late due date is in the range. Defaults to False.
+
+        Returns:
+            List[Assignment], optional: the assignments, ordered by due date
+            if days is given, or None if the course isn't in the snapshot.
+        """
+        course = self.course(number)
+        if course is None:
+            return None
+        if days is None:
+            return [
+                assignment
+                for assignment in course.assignments
+                if not (unsubmitted_only and assignment.submitted)
+            ]
+        return course.get_assignments_in_range(
+            *self._range(days), unsubmitted_only, include_late
+        )
+
+    def status(self) -> dict:
+        """Describe the snapshot and the last sync.
+
+        Returns:
+            dict: a JSON-serializable description.
+        """
+        return {
+            'synced_at': self.synced_at and self.synced_at.isoformat(),
+            'courses': len(self.courses),
+            'assignments': sum(len(course.assignments) for course in self.courses),
+            'failed_courses': {
+                str(number): str(error) for number, error in self.errors.items()
+            },
+            'last_error': self.last_error and str(self.last_error),
+        }
+
+
+def _days(request: web.Request) -> Optional[int]:
+    days = request.query.get('days')
+    if days is None:
+        return None
+    try:
+        return int(days)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f'days must be an integer, not {days!r}')
+
+
+def _flag(request: web.Request, name: str) -> bool:
+    return request.query.get(name, 'false').lower() in ('1', 'true', 'yes')
+
+
+def _assignments_response(
+    service: AssignmentService, assignments: List[Assignment]
+) -> web.Response:
+    return web.json_response(
+        {
+            'synced_at': service.synced_at and service.synced_at.isoformat(),
+            'assignments': [assignment.to_dict() for assignment in assignments],
+        }
+    )
+
+
+def create_app(service: AssignmentService) -> web.Application:
+    """Create a web application answering queries from the service.
+
+    Routes:
+        GET /status: the state of the snapshot and the last sync.
+        GET /assignments/upcoming: the assignments due in the coming days.
+        GET /assignments/unsubmitted: the unsubmitted assignments that can
+        still be submitted in the coming days.
+        GET /courses: the courses in the snapshot.
+        GET /courses/{number}/assignments: the assignments of a course.
+
+    The assignment routes take a days query parameter, and the upcoming and
+    course routes take unsubmitted and late flags, e.g.
+    /assignments/upcoming?days=3&unsubmitted=true.
+
+    Args:
+        service (AssignmentService): the service to answer queries from.
+
+    Returns:
+        web.Application: the application.
+    """
+
+    async def status(request: web.Request) -> web.Response:
+        return web.json_response(service.status())
+
+    async def upcoming(request: web.Request) -> web.Response:
+        return _assignments_response(
+            service,
+            service.upcoming(
+                _days(request), _flag(request, 'unsubmitted'), _flag(request, 'late')
+            ),
+        )
+
+    async def unsubmitted(request: web.Request) -> web.Response:
+        return _assignments_response(service, service.unsubmitted(_days(request)))
+
+    async def courses(request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {
+                    'number': course.number,
+                    'short_name': course.short_name,
+                    'name': course.name,
+                    'term': str(course.term),
+                    'assignments': len(course.assignments),
+                    'retrieved_at': course.retrieved_at
+                    and course.retrieved_at.isoformat(),
+                }
+                for course in service.courses
+            ]
+        )
+
+    async def course_assignments(request: web.Request) -> web.Response:
+        try:
+            number = int(request.match_info['number'])
+        except ValueError:
+            raise web.HTTPNotFound()
+        assignments = service.course_assignments(
+            number,
+            _days(request),
+            _flag(request, 'unsubmitted'),
+            _flag(request, 'late'),
+        )
+        if assignments is None:
+            raise web.HTTPNotFound(text=f'No course {number}')
+        return _assignments_response(service, assignments)
+
+    app = web.Application()
+    app.router.add_get('/status', status)
+    app.router.add_get('/assignments/upcoming', upcoming)
+    app.router.add_get('/assignments/unsubmitted', unsubmitted)
+    app.router.add_get('/courses', courses)
+    app.router.add_get('/courses/{number}/assignments', course_assignments)
+    return app
+
+
+async def serve(
+    messenger: GradescopeMessenger,
+    service: AssignmentService,
+    schedule: PollSchedule,
+    fresh_for: datetime.timedelta,
+    host: str = '127.0.0.1',
+    port: int = 8080,
+    on_poll: Optional[Callable[[SyncResult, List[Change]], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    max_polls: Optional[int] = None,
+):
+    """Serve queries from the service while keeping it synced, until
+    cancelled.
+
+    The service is synced by watching Gradescope, so each sync is incremental
+    and failed syncs are retried with backoff. Queries are answered from the
+    latest successful sync in the meantime.
+
+    Args:
+        messenger (GradescopeMessenger): the messenger to sync with.
+        service (AssignmentService): the service to serve and keep synced. Its
+        courses are compared to the first sync.
+        schedule (PollSchedule): the delays between syncs.
+        fresh_for (datetime.timedelta): how long the assignments of a course
+        are trusted while its assignment count is unchanged.
+        host (str, optional): the address to listen on. Defaults to
+        '127.0.0.1', so that only local clients can connect.
+        port (int, optional): the port to listen on. Defaults to 8080.
+        on_poll (Callable[[SyncResult, List[Change]], None], optional): called
+        after every successful sync, once the service has been updated.
+        Defaults to None.
+        on_error (Callable[[Exception], None], optional): called when a sync
+        fails. Defaults to None.
+        max_polls (int, optional): the number of syncs to make before
+        returning. Defaults to None, in which case the service runs until
+        cancelled.
+    """
+
+    def update(result: SyncResult, changes: List[Change]):
+        service.update(result.courses, result.failed)
+        if on_poll:
+            on_poll(result, changes)
+
+    def record_error(error: Exception):
+        service.last_error = error
+        if on_error:
+            on_error(error)
+
+    runner = web.AppRunner(create_app(service))
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+        await watch(
+            messenger,
+            schedule,
+            fresh_for,
+            update,
+            record_error,
+            previous_courses=service.courses,
+            max_polls=max_polls,
+        )
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,312 @@
+import datetime
+import os
+import sqlite3
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.timestamp import from_timestamp, to_timestamp
+
+# Course imports the due date index, which reports from the store don't need,
+# so it is only imported by load
+if TYPE_CHECKING:
+    from gradescraper.structures.course import Course
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.expanduser('~'), '.gradescraper', 'gradescraper.db'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    account TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    short_name TEXT,
+    name TEXT,
+    assignments_num INTEGER NOT NULL,
+    retrieved_at INTEGER,
+    PRIMARY KEY (account, number)
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    account TEXT NOT NULL,
+    course_number INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT,
+    course_name TEXT,
+    url TEXT NOT NULL,
+    submitted INTEGER NOT NULL,
+    release_date INTEGER,
+    due_date INTEGER,
+    late_due_date INTEGER,
+    status TEXT,
+    PRIMARY KEY (account, course_number, key)
+);
+CREATE INDEX IF NOT EXISTS assignments_by_due_date
+    ON assignments (account, due_date);
+CREATE INDEX IF NOT EXISTS assignments_by_course
+    ON assignments (account, course_number);
+"""
+
+ASSIGNMENT_COLUMNS = (
+    'name, course_name, url, submitted, release_date, due_date, late_due_date, '
+    'status'
+)
+
+# Columns added to tables after they were first created, and their types
+ADDED_COLUMNS = {'assignments': {'status': 'TEXT'}}
+
+
+def _row_to_assignment(row: sqlite3.Row) -> Assignment:
+    return Assignment(
+        row['name'],
+        row['course_name'],
+        row['url'],
+        bool(row['submitted']),
+        from_timestamp(row['release_date']),
+        from_timestamp(row['due_date']),
+        from_timestamp(row['late_due_date']),
+        row['status'],
+    )
+
+
+class SnapshotStore:
+    """A local SQLite database of the courses and assignments last fetched for
+    each account.
+
+    Dates are stored as integer timestamps (see gradescraper.structures.compact)
+    and assignments are indexed by due date and by course, so reports can be
+    answered without contacting Gradescope.
+
+    Attributes:
+        path (str): the path of the database file.
+        connection (sqlite3.Connection): the connection to the database.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        """Open the store, creating the database and its tables if needed.
+
+        Args:
+            path (str, optional): the path of the database file, or ':memory:'
+            for a temporary in-memory database. Defaults to DEFAULT_DB_PATH.
+        """
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        # CREATE TABLE IF NOT EXISTS leaves databases made by older versions
+        # with their original columns
+        with self.connection:
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {
+                    row['name']
+                    for row in self.connection.execute(f'PRAGMA table_info({table})')
+                }
+                for column, column_type in columns.items():
+                    if column not in existing:
+                        self.connection.execute(
+                            f'ALTER TABLE {table} ADD COLUMN {column} {column_type}'
+                        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        """Close the connection to the database."""
+        self.connection.close()
+
+    def save(self, account: str, courses: List['Course']):
+        """Save a snapshot of an account's courses in a single transaction.
+
+        courses should be every course on the account's dashboard. Courses no
+        longer on it are removed. The stored assignments of a course are only
+        replaced if its assignments were retrieved (its retrieved_at is set),
+        so courses that were skipped keep their last known assignments.
+
+        Args:
+            account (str): the account the courses belong to.
+            courses (List[Course]): the account's courses.
+        """
+        retrieved = [course for course in courses if course.retrieved_at]
+        with self.connection:
+            self.connection.execute(
+                'CREATE TEMP TABLE IF NOT EXISTS current_courses '
+                '(number INTEGER PRIMARY KEY)'
+            )
+            self.connection.execute('DELETE FROM current_courses')
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO current_courses VALUES (?)',
+                [(course.number,) for course in courses],
+            )
+            for table, column in (('assignments', 'course_number'), ('courses', 'number')):
+                self.connection.execute(
+                    f'DELETE FROM {table} WHERE account = ? AND {column} NOT IN '
+                    '(SELECT number FROM current_courses)',
+                    (account,),
+                )
+
+            self.connection.executemany(
+                'INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (account, number) DO UPDATE SET '
+                'position = excluded.position, season = excluded.season, '
+                'year = excluded.year, short_name = excluded.short_name, '
+                'name = excluded.name, '
+                'assignments_num = excluded.assignments_num, '
+                'retrieved_at = COALESCE(excluded.retrieved_at, retrieved_at)',
+                [
+                    (
+                        account,
+                        course.number,
+                        position,
+                        course.term.season,
+                        course.term.year,
+                        course.short_name,
+                        course.name,
+                        course.assignments_num,
+                        to_timestamp(course.retrieved_at),
+                    )
+                    for position, course in enumerate(courses)
+                ],
+            )
+            self.connection.executemany(
+                'DELETE FROM assignments WHERE account = ? AND course_number = ?',
+                [(account, course.number) for course in retrieved],
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO assignments VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (
+                        account,
+                        course.number,
+                        assignment.key,
+                        position,
+                        assignment.name,
+                        assignment.course_name,
+                        assignment.url,
+                        assignment.submitted,
+                        to_timestamp(assignment.release_date),
+                        to_timestamp(assignment.due_date),
+                        to_timestamp(assignment.late_due_date),
+                        assignment.status,
+                    )
+                    for course in retrieved
+                    for position, assignment in enumerate(course.assignments)
+                ],
+            )
+
+    def load(self, account: str) -> List['Course']:
+        """Load the last saved snapshot of an account's courses.
+
+        Args:
+            account (str): the account to load the courses of.
+
+        Returns:
+            List[Course]: the account's courses, in dashboard order, with their
+            stored assignments and retrieval times.
+        """
+        from gradescraper.structures.course import Course
+        from gradescraper.structures.term import Term
+
+        assignments: Dict[int, List[Assignment]] = {}
+        for row in self.connection.execute(
+            f'SELECT course_number, {ASSIGNMENT_COLUMNS} FROM assignments '
+            'WHERE account = ? ORDER BY course_number, position',
+            (account,),
+        ):
+            assignments.setdefault(row['course_number'], []).append(
+                _row_to_assignment(row)
+            )
+
+        terms = {}
+        courses = []
+        for row in self.connection.execute(
+            'SELECT * FROM courses WHERE account = ? ORDER BY position', (account,)
+        ):
+            term = terms.setdefault(
+                (row['season'], row['year']), Term(row['season'], row['year'])
+            )
+            course = Course(
+                term,
+                row['number'],
+                row['short_name'],
+                row['name'],
+                row['assignments_num'],
+            )
+            course.assignments = assignments.get(row['number'], [])
+            course.retrieved_at = from_timestamp(row['retrieved_at'])
+            courses.append(course)
+        return courses
+
+    def assignments_in_range(
+        self,
+        account: str,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        unsubmitted_only: bool = False,
+    ) -> List[Assignment]:
+        """Get an account's stored assignments due within the specified range.
+
+        Args:
+            account (str): the account to get the assignments of.
+            start_date (datetime.datetime): The start date of the range,
+            inclusive.
+            end_date (datetime.datetime): The end date of the range, inclusive.
+            unsubmitted_only (bool, optional): Whether to only return
+            unsubmitted assignments. Defaults to False.
+
+        Returns:
+            List[Assignment]: The assignments in the range, ordered by due
+            date.
+        """
+        query = (
+            f'SELECT {ASSIGNMENT_COLUMNS} FROM assignments WHERE account = ? '
+            'AND due_date BETWEEN ? AND ?'
+        )
+        if unsubmitted_only:
+            query += ' AND NOT submitted'
+        query += ' ORDER BY due_date'
+        return [
+            _row_to_assignment(row)
+            for row in self.connection.execute(
+                query, (account, to_timestamp(start_date), to_timestamp(end_date))
+            )
+        ]
+
+    def last_retrieved(self, account: str) -> Optional[datetime.datetime]:
+        """Get when the account's assignments were most recently retrieved.
+
+        Args:
+            account (str): the account to check.
+
+        Returns:
+            Optional[datetime.datetime]: the latest retrieval time of any of the
+            account's courses, or None if none have been retrieved.
+        """
+        (retrieved_at,) = self.connection.execute(
+            'SELECT MAX(retrieved_at) FROM courses WHERE account = ?', (account,)
+        ).fetchone()
+        return from_timestamp(retrieved_at)
+
+    def accounts(self) -> List[str]:
+        """Get the accounts with a saved snapshot.
+
+        Returns:
+            List[str]: the accounts, most recently retrieved first.
+        """
+        return [
+            account
+            for (account,) in self.connection.execute(
+                'SELECT account FROM courses GROUP BY account '
+                'ORDER BY MAX(retrieved_at) DESC'
+            )
+        ]
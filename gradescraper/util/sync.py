@@ -0,0 +1,117 @@
+import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from gradescraper.structures.course import Course
+from gradescraper.util import processor
+from gradescraper.util.messenger import GradescopeMessenger
+
+
+class SyncResult(NamedTuple):
+    """The outcome of an incremental sync.
+
+    Attributes:
+        courses (List[Course]): every course on the dashboard, with either
+        freshly retrieved or previously known assignments.
+        fetched (List[Course]): the courses whose pages were fetched, or
+        failed to be.
+        skipped (List[Course]): the courses that reused their previous
+        assignments instead of being fetched.
+        failed (Dict[int, Exception]): the error raised while fetching each
+        course that failed, by course number. Courses that failed keep their
+        previous assignments, if any.
+    """
+
+    courses: List[Course]
+    fetched: List[Course]
+    skipped: List[Course]
+    failed: Dict[int, Exception]
+
+
+def plan_sync(
+    dashboard_courses: List[Course],
+    previous_courses: Iterable[Course],
+    fresh_for: datetime.timedelta,
+    now: datetime.datetime,
+) -> Tuple[List[Course], List[Course]]:
+    """Decide which dashboard courses need their assignments fetched again.
+
+    A course can be skipped if its previous snapshot was retrieved no more than
+    fresh_for ago and the dashboard still shows the same number of assignments.
+    Skipped courses are given the assignments and retrieval time of their
+    previous snapshot.
+
+    Args:
+        dashboard_courses (List[Course]): the courses just parsed from the
+        dashboard.
+        previous_courses (Iterable[Course]): the courses from the last
+        snapshot, e.g. loaded from a SnapshotStore.
+        fresh_for (datetime.timedelta): how long a snapshot of a course is
+        trusted while its assignment count is unchanged.
+        now (datetime.datetime): the current time.
+
+    Returns:
+        Tuple[List[Course], List[Course]]: the courses to fetch and the courses
+        that were skipped.
+    """
+    previous_by_number = {course.number: course for course in previous_courses}
+    to_fetch = []
+    skipped = []
+    for course in dashboard_courses:
+        previous = previous_by_number.get(course.number)
+        if (
+            previous is not None
+            and previous.retrieved_at is not None
+            and previous.assignments_num == course.assignments_num
+            and now - previous.retrieved_at <= fresh_for
+        ):
+            course.assignments = previous.assignments
+            course.retrieved_at = previous.retrieved_at
+            skipped.append(course)
+        else:
+            to_fetch.append(course)
+    return to_fetch, skipped
+
+
+async def incremental_sync(
+    messenger: GradescopeMessenger,
+    previous_courses: Iterable[Course],
+    fresh_for: datetime.timedelta,
+    recent_only: bool = True,
+    now: Optional[datetime.datetime] = None,
+) -> SyncResult:
+    """Get the user's courses, only fetching the pages of changed courses.
+
+    The dashboard is always retrieved, since it holds each course's current
+    assignment count. Only courses whose count changed, or whose previous
+    snapshot is older than fresh_for, have their pages fetched.
+
+    Args:
+        messenger (GradescopeMessenger): the messenger to make requests with.
+        previous_courses (Iterable[Course]): the courses from the last
+        snapshot.
+        fresh_for (datetime.timedelta): how long a snapshot of a course is
+        trusted while its assignment count is unchanged.
+        recent_only (bool, optional): Whether to only fetch courses occuring in
+        the most recent term. Defaults to True.
+        now (datetime.datetime, optional): the current time. Defaults to None,
+        in which case datetime.datetime.now() is used.
+
+    Returns:
+        SyncResult: the courses, and which of them were fetched or skipped.
+    """
+    now = now or datetime.datetime.now()
+    previous_courses = list(previous_courses)
+    courses = await messenger.get_courses()
+    candidates = processor.strip_old_courses(courses) if recent_only else courses
+    to_fetch, skipped = plan_sync(candidates, previous_courses, fresh_for, now)
+    failed = await messenger.retrieve_assignments_for_courses(
+        to_fetch, recent_only=False
+    )
+    if failed:
+        previous_by_number = {course.number: course for course in previous_courses}
+        for course in to_fetch:
+            previous = previous_by_number.get(course.number)
+            if course.number in failed and previous is not None:
+                course.assignments = previous.assignments
+                course.retrieved_at = previous.retrieved_at
+    return SyncResult(courses, to_fetch, skipped, failed)
@@ -0,0 +1,134 @@
+import asyncio
+import datetime
+import random
+from typing import Awaitable, Callable, List, Optional
+
+from gradescraper.structures.course import Course
+from gradescraper.util.diff import Change, diff_snapshots
+from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.sync import SyncResult, incremental_sync
+
+
+class PollSchedule:
+    """Jittered delays between polls, which back off after failed polls.
+
+    Jitter spreads out the polls of many watchers started at the same time.
+    After consecutive failures, the delay doubles each time, up to max_delay.
+
+    Attributes:
+        interval (float): the number of seconds between successful polls.
+        jitter (float): the fraction of the delay that it may randomly vary by.
+        max_delay (float): the longest delay, in seconds, after failures.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        jitter: float = 0.1,
+        max_delay: float = 60 * 60,
+        random_fraction: Callable[[], float] = random.random,
+    ):
+        """Create a PollSchedule.
+
+        Args:
+            interval (float): the number of seconds between successful polls.
+            jitter (float, optional): the fraction of the delay that it may
+            randomly vary by, in either direction. Defaults to 0.1.
+            max_delay (float, optional): the longest delay, in seconds, after
+            failures. Defaults to one hour.
+            random_fraction (Callable[[], float], optional): returns a random
+            number in [0, 1). Defaults to random.random.
+        """
+        self.interval = interval
+        self.jitter = jitter
+        self.max_delay = max(max_delay, interval)
+        self._random_fraction = random_fraction
+
+    def next_delay(self, failures: int = 0) -> float:
+        """Get the number of seconds to wait before the next poll.
+
+        Args:
+            failures (int, optional): the number of consecutive failed polls.
+            Defaults to 0.
+
+        Returns:
+            float: the delay in seconds.
+        """
+        delay = min(self.interval * 2 ** failures, self.max_delay)
+        return delay * (1 + self.jitter * (2 * self._random_fraction() - 1))
+
+
+def _changes(previous_courses: List[Course], result: SyncResult) -> List[Change]:
+    # Courses outside the most recent term aren't synced, so their assignments
+    # are unknown rather than removed
+    synced = result.fetched + result.skipped
+    numbers = {course.number for course in synced}
+    return diff_snapshots(
+        [course for course in previous_courses if course.number in numbers], synced
+    )
+
+
+async def watch(
+    messenger: GradescopeMessenger,
+    schedule: PollSchedule,
+    fresh_for: datetime.timedelta,
+    on_poll: Callable[[SyncResult, List[Change]], None],
+    on_error: Optional[Callable[[Exception], None]] = None,
+    previous_courses: Optional[List[Course]] = None,
+    recent_only: bool = True,
+    max_polls: Optional[int] = None,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+):
+    """Poll Gradescope until cancelled, reporting what changed after each poll.
+
+    Each poll is an incremental sync against the previous poll's courses, so
+    only courses whose assignment count changed, or whose assignments are
+    older than fresh_for, are fetched. Only the latest snapshot is kept, so
+    memory use doesn't grow with the number of polls.
+
+    Args:
+        messenger (GradescopeMessenger): the messenger to poll with. Its session
+        is reused, and logged in again when it expires.
+        schedule (PollSchedule): the delays between polls.
+        fresh_for (datetime.timedelta): how long the assignments of a course
+        are trusted while its assignment count is unchanged.
+        on_poll (Callable[[SyncResult, List[Change]], None]): called after
+        every successful poll with its result and the changes since the last
+        one.
+        on_error (Callable[[Exception], None], optional): called when a poll
+        fails. Defaults to None.
+        previous_courses (List[Course], optional): the snapshot to compare the
+        first poll to, e.g. loaded from a SnapshotStore. Defaults to None, in
+        which case the first poll reports no changes.
+        recent_only (bool, optional): Whether to only fetch courses occuring in
+        the most recent term. Defaults to True.
+        max_polls (int, optional): the number of polls to make before
+        returning. Defaults to None, in which case polling never stops.
+        sleep (Callable[[float], Awaitable[None]], optional): waits for the
+        given number of seconds. Defaults to asyncio.sleep.
+    """
+    previous = previous_courses or []
+    compare = bool(previous)
+    failures = 0
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        polls += 1
+        try:
+            result = await incremental_sync(
+                messenger, previous, fresh_for, recent_only
+            )
+        except Exception as error:
+            failures += 1
+            if on_error:
+                on_error(error)
+        else:
+            failures = 0
+            changes = _changes(previous, result) if compare else []
+            on_poll(result, changes)
+            previous = result.courses
+            compare = True
+            if messenger.cache:
+                messenger.cache.evict()
+
+        if max_polls is None or polls < max_polls:
+            await sleep(schedule.next_delay(failures))
@@ -0,0 +1,50 @@
+import json
+
+from gradescraper.util.batch import Account, load_accounts, retrieve_accounts
+from gradescraper.util.messenger import GradescopeMessenger
+import pytest
+
+from tests.gradescope_stub import EMAIL, PASSWORD, serve_stub_site
+
+
+def test_load_accounts(tmp_path):
+    path = tmp_path / 'accounts.json'
+    path.write_text(
+        json.dumps(
+            [
+                {'email': 'a@email.com', 'password': 'a-password'},
+                {'email': 'b@email.com'},
+            ]
+        )
+    )
+    accounts = load_accounts(str(path), {'b@email.com': 'b-password'}.get)
+    assert accounts == [
+        Account('a@email.com', 'a-password'),
+        Account('b@email.com', 'b-password'),
+    ]
+
+    with pytest.raises(ValueError):
+        load_accounts(str(path))
+
+
+@pytest.mark.asyncio
+async def test_retrieve_accounts_isolates_failures(monkeypatch):
+    async with serve_stub_site() as (site, base_url):
+        monkeypatch.setattr(GradescopeMessenger, 'base_url', base_url)
+        accounts = [
+            Account(EMAIL, PASSWORD),
+            Account(EMAIL, 'bad'),
+            Account(EMAIL, PASSWORD),
+        ]
+        results = await retrieve_accounts(accounts, max_accounts=2)
+
+    assert [result.email for result in results] == [EMAIL] * 3
+    good, bad, other = results
+    assert bad.courses is None and isinstance(bad.error, Exception)
+    for result in (good, other):
+        assert result.error is None
+        fetched = [course for course in result.courses if course.retrieved_at]
+        assert len(fetched) == 4
+        assert all(len(course.assignments) == 7 for course in fetched)
+    # Each account logs in with its own cookie jar
+    assert site.login_count == 2
@@ -0,0 +1,43 @@
+import os
+import time
+
+from gradescraper.util.cache import ResponseCache, hash_body
+
+
+def test_put_and_get(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put('a@email.com', 'https://example.com/1', '<html>', etag='"abc"', parsed=[1])
+    cached = cache.get('a@email.com', 'https://example.com/1')
+    assert cached.body == '<html>'
+    assert cached.body_hash == hash_body('<html>')
+    assert cached.parsed == [1]
+    assert cached.conditional_headers() == {'If-None-Match': '"abc"'}
+
+
+def test_entries_are_keyed_by_account(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put('a@email.com', 'https://example.com/1', '<html>')
+    assert cache.get('b@email.com', 'https://example.com/1') is None
+
+
+def test_expired_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_age=60)
+    cache.put('a@email.com', 'https://example.com/1', '<html>')
+    assert cache.get('a@email.com', 'https://example.com/1')
+    cache.max_age = -1
+    assert cache.get('a@email.com', 'https://example.com/1') is None
+    assert cache.evict() == 1
+
+
+def test_size_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size=2500)
+    for i in range(5):
+        cache.put('a@email.com', f'https://example.com/{i}', 'x' * 1000)
+        # Give each entry a distinct age so the oldest are evicted first
+        path = cache._path('a@email.com', f'https://example.com/{i}')
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    assert cache.evict() == 3
+    assert cache.get('a@email.com', 'https://example.com/4')
+    assert cache.get('a@email.com', 'https://example.com/3')
+    assert cache.get('a@email.com', 'https://example.com/0') is None
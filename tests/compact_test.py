@@ -0,0 +1,53 @@
+import datetime
+
+import pytest
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.compact import (
+    CompactAssignment,
+    CompactCourse,
+    from_timestamp,
+    to_timestamp,
+)
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+
+
+def test_timestamp_round_trip():
+    date = datetime.datetime(2021, 3, 14, 23, 59)
+    assert from_timestamp(to_timestamp(date)) == date
+    assert to_timestamp(None) is None
+    assert from_timestamp(None) is None
+
+
+def test_compact_assignment_matches_assignment():
+    assignment = Assignment(
+        'HW 1',
+        'Mathematics',
+        'https://www.gradescope.com/courses/1/assignments/2',
+        True,
+        datetime.datetime(2021, 4, 1),
+        datetime.datetime(2021, 4, 10, 23, 59),
+        None,
+    )
+    compact = CompactAssignment.from_assignment(assignment)
+    assert compact.name == assignment.name
+    assert compact.due_date == assignment.due_date
+    assert compact.late_due_date is None
+    assert str(compact) == str(assignment)
+    assert compact.to_assignment().to_dict() == assignment.to_dict()
+    with pytest.raises(AttributeError):
+        compact.submitted = False
+
+
+def test_compact_course_round_trip():
+    course = Course(Term('Spring', 2021), 12345, 'MATH', 'Mathematics', 1)
+    course.assignments = [
+        Assignment('HW 1', 'Mathematics', '', False, None, datetime.datetime(2021, 4, 10), None)
+    ]
+    compact = CompactCourse.from_course(course)
+    assert compact.term == course.term
+    assert compact.assignments[0].due_timestamp == to_timestamp(datetime.datetime(2021, 4, 10))
+    restored = compact.to_course()
+    assert restored.number == 12345
+    assert [a.to_dict() for a in restored.assignments] == [a.to_dict() for a in course.assignments]
@@ -34,3 +34,13 @@ def test_get_assignments_in_range():
     assert course.get_assignments_in_range(start, start+datetime.timedelta(days=3), unsubmitted_only=False) == assignments[:3]
     assert course.get_assignments_in_range(start, start+datetime.timedelta(days=15), unsubmitted_only=False) == assignments
 
+
+
+def test_due_date_index_is_rebuilt():
+    course = Course(Term('Summer', 1776), '12345', 'MATH', 'Mathematics', 1)
+    start = datetime.datetime(2021, 4, 10)
+    assert course.get_assignments_in_range(start, start + datetime.timedelta(days=1)) == []
+    course.assignments = [
+        Assignment('Assignment 1', course.name, '', False, None, start, None)
+    ]
+    assert len(course.get_assignments_in_range(start, start + datetime.timedelta(days=1))) == 1
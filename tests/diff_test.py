@@ -0,0 +1,99 @@
+import datetime
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+from gradescraper.util import processor
+from gradescraper.util.diff import Change, ChangeKind, diff_snapshots
+
+from tests.gradescope_stub import submit_assignment
+
+DUE = datetime.datetime(2021, 4, 12, 23, 59)
+
+
+def _course(number, *assignments):
+    course = Course(Term('Spring', 2021), number, 'MATH', 'Math', len(assignments))
+    course.assignments = list(assignments)
+    return course
+
+
+def test_diff_snapshots():
+    moved = Assignment('HW 2', 'Math', '/2', False, due_date=DUE)
+    old = [
+        _course(
+            1,
+            # Unsubmitted rows have no link
+            Assignment('HW 1', 'Math', '', False, due_date=DUE),
+            moved,
+            Assignment('HW 3', 'Math', '/3', False, due_date=DUE),
+            Assignment('Quiz', 'Math', '', False, due_date=DUE),
+        )
+    ]
+    new = [
+        _course(
+            1,
+            Assignment('HW 1', 'Math', '/1', True, due_date=DUE),
+            Assignment(
+                'HW 2', 'Math', '/2', False, due_date=DUE + datetime.timedelta(days=1)
+            ),
+            Assignment(
+                'Quiz', 'Math', '', False, due_date=DUE, late_due_date=DUE
+            ),
+            Assignment('HW 4', 'Math', '/4', False, due_date=DUE),
+        )
+    ]
+
+    changes = diff_snapshots(old, new)
+
+    assert [(change.kind, change.assignment.name) for change in changes] == [
+        (ChangeKind.SUBMITTED_TOGGLED, 'HW 1'),
+        (ChangeKind.DUE_DATE_MOVED, 'HW 2'),
+        (ChangeKind.LATE_DUE_DATE_ADDED, 'Quiz'),
+        (ChangeKind.ADDED, 'HW 4'),
+        (ChangeKind.REMOVED, 'HW 3'),
+    ]
+    assert changes[1].previous is moved
+    assert all(change.course_number == 1 for change in changes)
+
+
+def _parsed_course(course_page):
+    course = _course(123456)
+    course.assignments = [
+        Assignment(*assignment_tuple)
+        for assignment_tuple in processor.parse_course_page(course_page, 'Math', '2021')
+    ]
+    return course
+
+
+def test_submission_is_reported_as_toggled():
+    with open('tests/sample_course_dashboard.html') as course_html:
+        before = course_html.read()
+    after = submit_assignment(before, '/courses/123456/assignments/5/submissions/9')
+
+    changes = diff_snapshots([_parsed_course(before)], [_parsed_course(after)])
+
+    assert [change.kind for change in changes] == [ChangeKind.SUBMITTED_TOGGLED]
+    assert changes[0].previous.url == ''
+    assert changes[0].assignment.url.endswith('/courses/123456/assignments/5')
+    assert changes[0].assignment.submitted
+
+
+def test_diff_snapshots_keys_by_course():
+    # The same assignment URL in different courses is a different assignment
+    old = [_course(1, Assignment('HW 1', 'Math', '/1', False, due_date=DUE))]
+    new = [_course(2, Assignment('HW 1', 'Math', '/1', False, due_date=DUE))]
+
+    assert [change.kind for change in diff_snapshots(old, new)] == [
+        ChangeKind.ADDED,
+        ChangeKind.REMOVED,
+    ]
+    assert diff_snapshots(new, new) == []
+
+
+def test_change_str():
+    old = Assignment('HW 1', 'Math', '/1', False, due_date=DUE)
+    new = Assignment(
+        'HW 1', 'Math', '/1', False, due_date=DUE + datetime.timedelta(days=1)
+    )
+    change = Change(ChangeKind.DUE_DATE_MOVED, 1, new, old)
+    assert str(change) == f'Due date moved from 04/12 23:59: {new}'
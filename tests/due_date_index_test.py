@@ -0,0 +1,108 @@
+import datetime
+import random
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.due_date_index import DueDateIndex
+
+START = datetime.datetime(2021, 4, 10)
+DAY = datetime.timedelta(days=1)
+
+
+def make_assignment(name, days, submitted=False, late_days=None):
+    return Assignment(
+        name,
+        'Course',
+        '',
+        submitted,
+        None,
+        START + datetime.timedelta(days=days),
+        START + datetime.timedelta(days=late_days) if late_days is not None else None,
+    )
+
+
+def test_in_range():
+    assignments = [
+        make_assignment('C', 3),
+        make_assignment('A', 1),
+        make_assignment('B', 1, submitted=True),
+        make_assignment('D', 10),
+    ]
+    index = DueDateIndex(assignments)
+    day = datetime.timedelta(days=1)
+    assert [a.name for a in index.in_range(START, START + 3 * day)] == ['A', 'B', 'C']
+    assert [a.name for a in index.in_range(START, START + 3 * day, unsubmitted_only=True)] == ['A', 'C']
+    assert index.in_range(START + day, START) == []
+    assert len(index) == 4
+
+
+def test_include_late():
+    assignments = [
+        make_assignment('Late window', -2, late_days=1),
+        make_assignment('Due', 1, late_days=2),
+        make_assignment('Closed', -5, late_days=-1),
+    ]
+    index = DueDateIndex(assignments)
+    end = START + datetime.timedelta(days=3)
+    assert [a.name for a in index.in_range(START, end)] == ['Due']
+    assert [a.name for a in index.in_range(START, end, include_late=True)] == ['Late window', 'Due']
+
+
+def test_overdue_and_late_window():
+    assignments = [
+        make_assignment('Missed', -5, late_days=-1),
+        make_assignment('Late window', -2, late_days=1),
+        make_assignment('Submitted', -3, submitted=True, late_days=1),
+        make_assignment('Upcoming', 1, late_days=2),
+    ]
+    index = DueDateIndex(assignments)
+    assert [a.name for a in index.overdue(START)] == ['Missed', 'Late window']
+    assert [a.name for a in index.in_late_window(START)] == ['Late window']
+
+
+def test_merge():
+    first = DueDateIndex([make_assignment('A1', 1), make_assignment('A3', 3)])
+    second = DueDateIndex([make_assignment('B1', 1), make_assignment('B2', 2)])
+    merged = DueDateIndex.merge([first, second])
+    end = START + datetime.timedelta(days=5)
+    assert [a.name for a in merged.in_range(START, end)] == ['A1', 'B1', 'B2', 'A3']
+    assert [a.name for a in merged.overdue(end)] == ['A1', 'B1', 'B2', 'A3']
+
+
+def test_in_late_window_matches_scan():
+    generator = random.Random(0)
+    assignments = []
+    indexes = []
+    for course in range(3):
+        course_assignments = [
+            make_assignment(
+                f'{course}-{index}',
+                generator.randrange(-20, 20),
+                submitted=generator.random() < 0.3,
+            )
+            for index in range(40)
+        ]
+        for assignment in course_assignments[::2]:
+            assignment.late_due_date = assignment.due_date + datetime.timedelta(
+                hours=generator.randrange(1, 24 * 5)
+            )
+        assignments.extend(course_assignments)
+        indexes.append(DueDateIndex(course_assignments))
+    merged = DueDateIndex.merge(indexes)
+
+    def by_late_due_date(found):
+        return sorted(found, key=lambda a: (a.late_due_date, a.name))
+
+    for days in range(-25, 25):
+        now = START + days * DAY
+        in_late_window = merged.in_late_window(now)
+        assert [a.late_due_date for a in in_late_window] == sorted(
+            a.late_due_date for a in in_late_window
+        )
+        assert by_late_due_date(in_late_window) == by_late_due_date(
+            a
+            for a in assignments
+            if not a.submitted
+            and a.late_due_date
+            and a.due_date < now <= a.late_due_date
+        )
+    assert DueDateIndex([make_assignment('A', 1)]).in_late_window(START) == []
@@ -0,0 +1,27 @@
+import pytest
+
+from gradescraper.util import processor
+from gradescraper.util.executor import ParseExecutor
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('mode', ParseExecutor.modes)
+async def test_parse_course_page(mode):
+    with open('tests/sample_course_dashboard.html', 'rb') as course_html:
+        course_page = course_html.read()
+    executor = ParseExecutor(mode)
+    try:
+        assignment_tuples = await executor.run(
+            processor.parse_course_page, course_page, 'Example', 2021
+        )
+    finally:
+        executor.shutdown()
+    assert assignment_tuples == processor.parse_course_page(
+        course_page, 'Example', 2021
+    )
+    assert len(assignment_tuples) == 7
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ParseExecutor('fiber')
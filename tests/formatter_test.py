@@ -0,0 +1,152 @@
+import csv
+import datetime
+import io
+import json
+
+from gradescraper.structures.assignment import Assignment, AssignmentDetails
+from gradescraper.util.formatter import WRITERS, CsvWriter, IcsWriter, JsonLinesWriter
+
+DUE = datetime.datetime(2021, 4, 12, 23, 59)
+
+
+def make_assignments():
+    return [
+        Assignment(
+            'Homework 1',
+            'MATH 101',
+            'https://www.gradescope.com/courses/1/assignments/1',
+            True,
+            DUE - datetime.timedelta(days=7),
+            DUE,
+            DUE + datetime.timedelta(days=2),
+        ),
+        Assignment('Quiz, part 2; review', 'CS 200', None, False, None, DUE),
+        Assignment('Project', 'CS 200', None, False, None, None),
+    ]
+
+
+def test_writers_by_name():
+    assert WRITERS == {'jsonl': JsonLinesWriter, 'csv': CsvWriter, 'ics': IcsWriter}
+
+
+def test_json_lines():
+    stream = io.StringIO()
+    JsonLinesWriter(stream).write_all(make_assignments())
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3
+    assert [
+        Assignment.from_dict(json.loads(line)).to_dict() for line in lines
+    ] == [assignment.to_dict() for assignment in make_assignments()]
+
+
+def test_csv():
+    stream = io.StringIO()
+    CsvWriter(stream).write_all(make_assignments())
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert [row['name'] for row in rows] == [
+        'Homework 1',
+        'Quiz, part 2; review',
+        'Project',
+    ]
+    assert rows[0]['due_date'] == DUE.isoformat()
+    assert rows[0]['submitted'] == 'True'
+    assert rows[2]['due_date'] == ''
+    assert rows[0]['score'] == ''
+
+
+def test_csv_flattens_details():
+    assignment = make_assignments()[0]
+    assignment.details = AssignmentDetails(8.5, 10.0, DUE)
+    stream = io.StringIO()
+    CsvWriter(stream).write_all([assignment])
+    row = next(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert (row['score'], row['points_possible']) == ('8.5', '10.0')
+    assert row['submitted_at'] == DUE.isoformat()
+
+
+def test_writes_are_flushed():
+    class CountingStream(io.StringIO):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+
+    stream = CountingStream()
+    writer = JsonLinesWriter(stream)
+    writer.write(make_assignments()[0])
+    assert stream.flushes == 1
+
+
+def test_ics():
+    stream = io.StringIO()
+    IcsWriter(stream, now=datetime.datetime(2021, 4, 10)).write_all(
+        make_assignments()
+    )
+    calendar = stream.getvalue()
+    assert calendar.startswith('BEGIN:VCALENDAR\r\nVERSION:2.0\r\n')
+    assert calendar.endswith('END:VCALENDAR\r\n')
+    # The assignment without a due date is skipped
+    assert calendar.count('BEGIN:VEVENT') == 2
+    assert 'DTSTART:20210412T235900\r\n' in calendar
+    assert 'DTSTAMP:20210410T000000Z\r\n' in calendar
+    assert 'SUMMARY:CS 200: Quiz\\, part 2\\; review\r\n' in calendar
+    assert 'DESCRIPTION:Course: MATH 101\\nSubmitted: yes\\nLate due date: 04/14' in (
+        calendar.replace('\r\n ', '')
+    )
+
+
+def test_ics_folds_long_lines():
+    assignment = Assignment('é' * 100, 'Course', None, False, None, DUE)
+    stream = io.StringIO()
+    IcsWriter(stream).write(assignment)
+    lines = stream.getvalue().split('\r\n')
+    assert all(len(line.encode()) <= 75 for line in lines)
+    unfolded = stream.getvalue().replace('\r\n ', '')
+    assert f'SUMMARY:Course: {assignment.name}\r\n' in unfolded
+
+
+def test_writers_with_account():
+    stream = io.StringIO()
+    JsonLinesWriter(stream, with_account=True).write(
+        make_assignments()[0], 'a@email.com'
+    )
+    assert json.loads(stream.getvalue())['account'] == 'a@email.com'
+
+    stream = io.StringIO()
+    writer = CsvWriter(stream, with_account=True)
+    writer.begin()
+    writer.write(make_assignments()[0], 'a@email.com')
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert rows[0]['account'] == 'a@email.com'
+
+
+def _uids(calendar):
+    return [
+        line[len('UID:') :] for line in calendar.splitlines() if line.startswith('UID:')
+    ]
+
+
+def test_ics_uids_survive_submission_and_differ_by_account():
+    unsubmitted = Assignment('Homework 2', 'MATH 101', '', False, None, DUE)
+    submitted = Assignment(
+        'Homework 2',
+        'MATH 101',
+        'https://www.gradescope.com/courses/1/assignments/2',
+        True,
+        None,
+        DUE,
+        status='Submitted',
+    )
+    stream = io.StringIO()
+    writer = IcsWriter(stream)
+    writer.write(unsubmitted)
+    writer.write(submitted)
+    first, second = _uids(stream.getvalue())
+    assert first == second
+
+    stream = io.StringIO()
+    writer = IcsWriter(stream, with_account=True)
+    writer.write(submitted, 'a@email.com')
+    writer.write(submitted, 'b@email.com')
+    first, second = _uids(stream.getvalue())
+    assert first != second
@@ -0,0 +1,249 @@
+"""A local stand-in for the Gradescope website used by the messenger tests."""
+import asyncio
+import contextlib
+import hashlib
+import secrets
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+EMAIL = 'student@email.com'
+PASSWORD = 'password'
+
+LOGIN_PAGE_TEMPLATE = """<html><head><title>Log In | Gradescope</title></head><body>
+<form action="/login" method="post">
+<input type="hidden" name="authenticity_token" value="{token}">
+</form></body></html>"""
+LOGIN_PAGE = LOGIN_PAGE_TEMPLATE.format(token='stub-token')
+
+
+class LoginSite:
+    """A site behind a fake login, which accepts the sessions it started.
+
+    Attributes:
+        sessions (set): the session cookie values currently accepted.
+    """
+
+    def __init__(self):
+        self.sessions = set()
+
+    def start_session(self) -> str:
+        session = secrets.token_hex(8)
+        self.sessions.add(session)
+        return session
+
+    def is_logged_in(self, request) -> bool:
+        return request.cookies.get('session') in self.sessions
+
+    def expire_sessions(self):
+        self.sessions.clear()
+
+
+class StubSite(LoginSite):
+    """Serves the dashboard, course and assignment fixtures behind a fake
+    login.
+
+    Attributes:
+        etags_enabled (bool): whether course pages are served with ETags and
+        answer matching conditional requests with 304 Not Modified.
+        login_count (int): the number of successful logins.
+        request_counts (dict): the number of requests made to each path.
+        injected_responses (dict): responses returned, in order, instead of
+        handling the next requests to each path.
+        stalled_requests (dict): the number of upcoming requests to each path
+        that are stalled for stall_seconds before being handled.
+        dashboard_stall_seconds (float): if set, the dashboard returned by a
+        login stalls for this long after the first term's courses.
+        course_requests_during_stall (int): the number of course page requests
+        made before the stalled dashboard was resumed.
+        rotate_csrf_cookies (bool): whether every response to / sets a new
+        CSRF cookie, like the session cookie of a Rails app, which the
+        authenticity token sent with a login must match. The login page's body
+        is then sent after a stall, and HEAD responses are delayed for less
+        time, so that a HEAD request sent with the messenger's cookies
+        replaces the cookie before the login is sent.
+    """
+
+    def __init__(self):
+        super().__init__()
+        with open('tests/courses_dashboard.html') as dashboard_html:
+            self.dashboard = dashboard_html.read()
+        with open('tests/sample_course_dashboard.html') as course_html:
+            self.course_page = course_html.read()
+        with open('tests/assignment_submission.html') as assignment_html:
+            self.assignment_page = assignment_html.read()
+        self.etags_enabled = False
+        self.login_count = 0
+        self.request_counts = {}
+        self.injected_responses = {}
+        self.stalled_requests = {}
+        self.stall_seconds = 5
+        self.dashboard_stall_seconds = 0
+        self.course_requests_during_stall = 0
+        self.rotate_csrf_cookies = False
+        self.app = web.Application(middlewares=[self.count_requests])
+        self.app.add_routes(
+            [
+                web.get('/', self.home),
+                web.get('/login', self.login_page),
+                web.post('/login', self.login),
+                web.get('/courses/{number}', self.course),
+                web.get(
+                    '/courses/{number}/assignments/{assignment}', self.assignment
+                ),
+            ]
+        )
+
+    @web.middleware
+    async def count_requests(self, request, handler):
+        self.request_counts[request.path] = (
+            self.request_counts.get(request.path, 0) + 1
+        )
+        injected = self.injected_responses.get(request.path)
+        if injected:
+            return injected.pop(0)
+        if self.stalled_requests.get(request.path):
+            self.stalled_requests[request.path] -= 1
+            await asyncio.sleep(self.stall_seconds)
+        return await handler(request)
+
+    async def home(self, request):
+        if self.is_logged_in(request):
+            return web.Response(text=self.dashboard, content_type='text/html')
+        if self.rotate_csrf_cookies:
+            return await self._rotated_login_page(request)
+        return web.Response(text=LOGIN_PAGE, content_type='text/html')
+
+    async def _rotated_login_page(self, request):
+        token = secrets.token_hex(8)
+        if request.method == 'HEAD':
+            await asyncio.sleep(0.05)
+            response = web.Response(content_type='text/html')
+            response.set_cookie('csrf', token)
+            return response
+        response = web.StreamResponse(headers={'Content-Type': 'text/html'})
+        response.set_cookie('csrf', token)
+        await response.prepare(request)
+        await asyncio.sleep(0.2)
+        await response.write(LOGIN_PAGE_TEMPLATE.format(token=token).encode())
+        await response.write_eof()
+        return response
+
+    async def login_page(self, request):
+        return web.Response(text=LOGIN_PAGE, content_type='text/html')
+
+    async def login(self, request):
+        params = {**request.query, **(await request.post())}
+        if (
+            params.get('session[email]') != EMAIL
+            or params.get('session[password]') != PASSWORD
+            or params.get('authenticity_token')
+            != (
+                request.cookies.get('csrf')
+                if self.rotate_csrf_cookies
+                else 'stub-token'
+            )
+        ):
+            return web.Response(text=LOGIN_PAGE, content_type='text/html')
+        self.login_count += 1
+        session = self.start_session()
+        if self.dashboard_stall_seconds:
+            return await self._stalled_dashboard(request, session)
+        response = web.Response(text=self.dashboard, content_type='text/html')
+        response.set_cookie('session', session)
+        return response
+
+    async def _stalled_dashboard(self, request, session):
+        response = web.StreamResponse(headers={'Content-Type': 'text/html'})
+        response.set_cookie('session', session)
+        await response.prepare(request)
+        second_term = self.dashboard.index(
+            '<h2', self.dashboard.index('courseList--term') + 1
+        )
+        await response.write(self.dashboard[:second_term].encode())
+        await asyncio.sleep(self.dashboard_stall_seconds)
+        self.course_requests_during_stall = sum(
+            count
+            for path, count in self.request_counts.items()
+            if path.startswith('/courses/')
+        )
+        await response.write(self.dashboard[second_term:].encode())
+        await response.write_eof()
+        return response
+
+    async def course(self, request):
+        if not self.is_logged_in(request):
+            raise web.HTTPFound('/login')
+        if not self.etags_enabled:
+            return web.Response(text=self.course_page, content_type='text/html')
+
+        etag = '"%s"' % hashlib.md5(self.course_page.encode()).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(
+            text=self.course_page, content_type='text/html', headers={'ETag': etag}
+        )
+
+    async def assignment(self, request):
+        if not self.is_logged_in(request):
+            raise web.HTTPFound('/login')
+        return web.Response(text=self.assignment_page, content_type='text/html')
+
+
+def submit_assignment(course_page: str, href: str) -> str:
+    """Turn the first unsubmitted row of a course page into a submitted one.
+
+    Like on Gradescope, the row gains a link to the submission, which
+    unsubmitted rows don't have.
+
+    Args:
+        course_page (str): the course page's HTML.
+        href (str): the path of the submission the row links to.
+
+    Returns:
+        str: the course page's HTML after the submission.
+    """
+    status = course_page.index('submissionStatus submissionStatus-warning')
+    header_start = course_page.rindex('scope="row">', 0, status) + len('scope="row">')
+    header_end = course_page.index('</th>', header_start)
+    name = course_page[header_start:header_end]
+    text = course_page.index('No Submission', status)
+    return (
+        course_page[:header_start]
+        + f'<a href="{href}">{name}</a>'
+        + course_page[header_end:status]
+        + 'submissionStatus submissionStatus-complete'
+        + course_page[status + len('submissionStatus submissionStatus-warning') : text]
+        + 'Submitted'
+        + course_page[text + len('No Submission') :]
+    )
+
+
+@contextlib.asynccontextmanager
+async def serve_app(app: web.Application):
+    """Run an application on a local port for the duration of the context.
+
+    Args:
+        app (web.Application): the application to serve.
+
+    Yields:
+        str: the application's base URL.
+    """
+    server = TestServer(app, host='localhost')
+    await server.start_server()
+    try:
+        yield str(server.make_url('')).rstrip('/')
+    finally:
+        await server.close()
+
+
+@contextlib.asynccontextmanager
+async def serve_stub_site():
+    """Run a StubSite on a local port for the duration of the context.
+
+    Yields:
+        Tuple[StubSite, str]: the site and its base URL.
+    """
+    site = StubSite()
+    async with serve_app(site.app) as base_url:
+        yield site, base_url
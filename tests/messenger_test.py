@@ -1,6 +1,18 @@
+import asyncio
+from datetime import datetime
+
+import aiohttp
+from aiohttp import web
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+from gradescraper.util.cache import ResponseCache
 from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.retry import RetryPolicy
 import pytest
 
+from tests.gradescope_stub import EMAIL, PASSWORD, serve_stub_site
+
+
 @pytest.mark.dependency(name='auth_token')
 @pytest.mark.asyncio
 async def test_get_auth_token():
@@ -17,3 +29,405 @@ async def test_bad_login():
             await messenger.login()
 
 
+async def _stub_messenger(base_url, email=EMAIL, password=PASSWORD):
+    messenger = GradescopeMessenger(email, password)
+    messenger.base_url = base_url
+    return messenger
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_login_once():
+    async with serve_stub_site() as (site, base_url):
+        async with await _stub_messenger(base_url) as messenger:
+            courses = [
+                Course(Term('Spring', 2021), number, 'MATH', 'Math', 7)
+                for number in range(5)
+            ]
+            await messenger.retrieve_assignments_for_courses(
+                courses, recent_only=False
+            )
+        assert site.login_count == 1
+        assert all(len(course.assignments) == 7 for course in courses)
+
+
+@pytest.mark.asyncio
+async def test_failed_login_is_not_repeated():
+    async with serve_stub_site() as (site, base_url):
+        async with await _stub_messenger(base_url, password='bad') as messenger:
+            results = await asyncio.gather(
+                *[messenger.ensure_logged_in() for _ in range(4)],
+                return_exceptions=True,
+            )
+        assert all(isinstance(result, Exception) for result in results)
+        assert site.request_counts['/login'] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_session_reauthenticates_once():
+    async with serve_stub_site() as (site, base_url):
+        async with await _stub_messenger(base_url) as messenger:
+            courses = await messenger.get_courses_and_assignments()
+            site.expire_sessions()
+            await messenger.retrieve_assignments_for_courses(
+                courses, recent_only=True
+            )
+        assert site.login_count == 2
+        assert all(len(course.assignments) == 7 for course in courses[:4])
+
+
+@pytest.mark.asyncio
+async def test_resume_exported_session():
+    async with serve_stub_site() as (site, base_url):
+        async with await _stub_messenger(base_url) as messenger:
+            await messenger.login()
+            serialized_session = messenger.export_session()
+
+        async with await _stub_messenger(base_url) as messenger:
+            messenger.import_session(serialized_session)
+            courses = await messenger.get_courses_and_assignments()
+        assert site.login_count == 1
+        assert len(courses) == 8
+
+        site.expire_sessions()
+        async with await _stub_messenger(base_url) as messenger:
+            messenger.import_session(serialized_session)
+            await messenger.get_courses_and_assignments()
+        assert site.login_count == 2
+
+
+@pytest.mark.asyncio
+async def test_resume_without_cookies():
+    async with serve_stub_site() as (site, base_url):
+        async with await _stub_messenger(base_url) as messenger:
+            assert await messenger.resume_session() is None
+        assert site.request_counts == {}
+
+
+@pytest.mark.asyncio
+async def test_cached_course_pages_are_revalidated(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path))
+    course = Course(Term('Spring', 2021), 1, 'MATH', 'Math', 7)
+    async with serve_stub_site() as (site, base_url):
+        site.etags_enabled = True
+        async with await _stub_messenger(base_url) as messenger:
+            messenger.cache = cache
+            await messenger.retrieve_assignments_for_course(course)
+        first_assignments = [str(assignment) for assignment in course.assignments]
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError('unmodified page was parsed again')
+
+        monkeypatch.setattr(GradescopeMessenger, '_parse_course_page', fail_parse)
+        course.assignments = []
+        async with await _stub_messenger(base_url) as messenger:
+            messenger.cache = cache
+            await messenger.retrieve_assignments_for_course(course)
+    assert [str(assignment) for assignment in course.assignments] == first_assignments
+
+
+@pytest.mark.asyncio
+async def test_stream_parser_backend():
+    async with serve_stub_site() as (site, base_url):
+        courses = []
+        for parser in GradescopeMessenger.parsers:
+            course = Course(Term('Spring', 2021), 1, 'MATH', 'Math', 7)
+            async with await _stub_messenger(base_url) as messenger:
+                messenger.parser = parser
+                await messenger.retrieve_assignments_for_course(course)
+            courses.append(course)
+    soup_course, stream_course = courses
+    assert [a.to_dict() for a in stream_course.assignments] == [
+        a.to_dict() for a in soup_course.assignments
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_parse_mode():
+    async with serve_stub_site() as (site, base_url):
+        messenger = GradescopeMessenger(EMAIL, PASSWORD, parse_mode='process')
+        messenger.base_url = base_url
+        async with messenger:
+            courses = await messenger.get_courses_and_assignments()
+    assert len(courses) == 8
+    assert all(len(course.assignments) == 7 for course in courses[:4])
+
+
+def _fast_retries(messenger, max_attempts=3):
+    messenger.retry_policy = RetryPolicy(max_attempts, base_delay=0.01)
+
+
+@pytest.mark.asyncio
+async def test_retries_rate_limited_and_failed_requests():
+    async with serve_stub_site() as (site, base_url):
+        site.injected_responses['/courses/1'] = [
+            web.Response(status=429, headers={'Retry-After': '0'}),
+            web.Response(status=503),
+        ]
+        async with await _stub_messenger(base_url) as messenger:
+            _fast_retries(messenger)
+            course = Course(Term('Spring', 2021), 1, 'MATH', 'Math', 7)
+            await messenger.retrieve_assignments_for_course(course)
+        assert site.request_counts['/courses/1'] == 3
+        assert len(course.assignments) == 7
+
+
+@pytest.mark.asyncio
+async def test_failed_courses_are_isolated():
+    async with serve_stub_site() as (site, base_url):
+        site.injected_responses['/courses/1'] = [
+            web.Response(status=503) for _ in range(3)
+        ]
+        site.stalled_requests['/courses/2'] = 1
+        async with GradescopeMessenger(
+            EMAIL, PASSWORD, timeout=aiohttp.ClientTimeout(total=0.5)
+        ) as messenger:
+            messenger.base_url = base_url
+            _fast_retries(messenger)
+            courses = [
+                Course(Term('Spring', 2021), number, 'MATH', 'Math', 7)
+                for number in range(4)
+            ]
+            errors = await messenger.retrieve_assignments_for_courses(
+                courses, recent_only=False
+            )
+
+        assert list(errors) == [1]
+        assert isinstance(errors[1], aiohttp.ClientResponseError)
+        assert errors[1].status == 503
+        assert courses[1].assignments == [] and courses[1].retrieved_at is None
+        # The stalled request timed out and was retried
+        assert site.request_counts['/courses/2'] == 2
+        assert all(
+            len(course.assignments) == 7 for course in courses if course.number != 1
+        )
+
+
+@pytest.mark.asyncio
+async def test_courses_are_yielded_as_they_are_retrieved():
+    async with serve_stub_site() as (site, base_url):
+        site.stalled_requests['/courses/0'] = 1
+        site.stall_seconds = 0.5
+        site.injected_responses['/courses/3'] = [
+            web.Response(status=503) for _ in range(3)
+        ]
+        async with await _stub_messenger(base_url) as messenger:
+            _fast_retries(messenger)
+            courses = [
+                Course(Term('Spring', 2021), number, 'MATH', 'Math', 7)
+                for number in range(4)
+            ]
+            retrieved = [
+                (course.number, error)
+                async for course, error in messenger.iter_assignments_for_courses(
+                    courses, recent_only=False
+                )
+            ]
+
+        # The stalled course is yielded last rather than holding up the others
+        assert sorted(number for number, _ in retrieved[:3]) == [1, 2, 3]
+        assert retrieved[3] == (0, None)
+        assert list(messenger.errors) == [3]
+        assert dict(retrieved)[3] is messenger.errors[3]
+
+
+@pytest.mark.asyncio
+async def test_stopping_iteration_cancels_remaining_courses():
+    async with serve_stub_site() as (site, base_url):
+        site.stalled_requests['/courses/0'] = 1
+        site.stall_seconds = 0.5
+        async with await _stub_messenger(base_url) as messenger:
+            courses = [
+                Course(Term('Spring', 2021), number, 'MATH', 'Math', 7)
+                for number in range(2)
+            ]
+            iterator = messenger.iter_assignments_for_courses(
+                courses, recent_only=False
+            )
+            async for course, _ in iterator:
+                break
+            await iterator.aclose()
+            await asyncio.sleep(0.6)
+
+        assert course.number == 1
+        assert courses[0].retrieved_at is None
+
+
+def _course_requests(site):
+    return sum(
+        count
+        for path, count in site.request_counts.items()
+        if path.startswith('/courses/')
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_courses_and_assignments():
+    async with serve_stub_site() as (site, base_url):
+        async with await _stub_messenger(base_url) as messenger:
+            courses = [
+                course async for course in messenger.iter_courses_and_assignments()
+            ]
+    assert len(courses) == 4
+    assert all(len(course.assignments) == 7 for course in courses)
+    assert all(course.retrieved_at for course in courses)
+
+
+@pytest.mark.asyncio
+async def test_slow_caller_applies_backpressure():
+    async with serve_stub_site() as (site, base_url):
+        async with GradescopeMessenger(EMAIL, PASSWORD, max_in_flight=1) as messenger:
+            messenger.base_url = base_url
+            iterator = messenger.iter_courses_and_assignments(
+                recent_only=False, max_buffered=1
+            )
+            await iterator.__anext__()
+            await asyncio.sleep(0.2)
+            # The yielded course, one waiting in the buffer and one waiting
+            # for room in it
+            assert _course_requests(site) == 3
+
+            await iterator.aclose()
+            await asyncio.sleep(0.1)
+            assert _course_requests(site) == 3
+
+
+@pytest.mark.asyncio
+async def test_courses_are_fetched_while_dashboard_is_parsed():
+    async with serve_stub_site() as (site, base_url):
+        site.dashboard_stall_seconds = 0.3
+        async with await _stub_messenger(base_url) as messenger:
+            courses = await messenger.get_courses_and_assignments()
+            warm_connections = messenger.warm_connections
+
+        # Every course of the first term was fetched before the rest of the
+        # dashboard arrived
+        assert site.course_requests_during_stall == 4
+        assert len(courses) == 8
+        assert [len(course.assignments) for course in courses] == [7] * 4 + [0] * 4
+        # The auth token request, and the connections warmed up alongside it
+        assert site.request_counts['/'] == 1 + warm_connections == 6
+
+
+@pytest.mark.asyncio
+async def test_login_reports_courses_as_they_are_parsed():
+    async with serve_stub_site() as (site, base_url):
+        async with await _stub_messenger(base_url) as messenger:
+            seen = []
+            courses = await messenger.login(
+                lambda course: seen.append((course, messenger.logged_in))
+            )
+    assert [course for course, _ in seen] == courses
+    assert all(logged_in for _, logged_in in seen)
+
+
+def _assignment_requests(site):
+    return sum(
+        count
+        for path, count in site.request_counts.items()
+        if '/assignments/' in path
+    )
+
+
+def _grade_first_submission(site, score):
+    # Graded rows show the score in place of the submission status
+    site.course_page = site.course_page.replace(
+        '<td class="submissionStatus submissionStatus-complete">',
+        '<td class="submissionStatus">',
+        1,
+    ).replace(
+        '<div class="submissionStatus--text">Submitted</div>',
+        f'<div class="submissionStatus--score">{score} / 10.0</div>',
+        1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_assignment_details_are_cached_until_graded():
+    course = Course(Term('Spring', 2021), 1, 'MATH', 'Math', 7)
+    async with serve_stub_site() as (site, base_url):
+        site.assignment_page = site.assignment_page.replace('8.5 / 10.0', '- / 10.0')
+        async with await _stub_messenger(base_url) as messenger:
+
+            async def upcoming_details():
+                await messenger.retrieve_assignments_for_course(course)
+                assignments = [
+                    assignment for assignment in course.assignments if assignment.url
+                ]
+                assert await messenger.retrieve_assignment_details(
+                    assignments[:2]
+                ) == {}
+                return assignments
+
+            assignments = await upcoming_details()
+            assert _assignment_requests(site) == 2
+            assert assignments[0].status == 'Submitted'
+            details = assignments[0].details
+            assert (details.score, details.points_possible) == (None, 10.0)
+            assert details.submitted_at == datetime(2021, 4, 8, 21, 14, 3)
+            assert assignments[2].details is None
+
+            assignments = await upcoming_details()
+            assert _assignment_requests(site) == 2
+            assert assignments[0].details.score is None
+
+            site.assignment_page = site.assignment_page.replace('- / 10.0', '9.0 / 10.0')
+            _grade_first_submission(site, 9.0)
+            assignments = await upcoming_details()
+            assert _assignment_requests(site) == 3
+            assert assignments[0].status == '9.0 / 10.0'
+            assert assignments[0].details.score == 9.0
+
+
+@pytest.mark.asyncio
+async def test_assignment_details_are_stored_in_response_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    course = Course(Term('Spring', 2021), 1, 'MATH', 'Math', 7)
+    async with serve_stub_site() as (site, base_url):
+        for _ in range(2):
+            async with await _stub_messenger(base_url) as messenger:
+                messenger.cache = cache
+                await messenger.retrieve_assignments_for_course(course)
+                assignment = next(
+                    assignment for assignment in course.assignments if assignment.url
+                )
+                await messenger.retrieve_assignment_details([assignment])
+            assert assignment.details.score == 8.5
+        assert _assignment_requests(site) == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_keeps_the_login_cookie():
+    async with serve_stub_site() as (site, base_url):
+        site.rotate_csrf_cookies = True
+        async with await _stub_messenger(base_url) as messenger:
+            assert messenger.warm_connections > 0
+            courses = await messenger.get_courses_and_assignments()
+        assert site.login_count == 1
+        assert len(courses) == 8
+
+
+@pytest.mark.asyncio
+async def test_older_term_listed_first_is_not_retrieved():
+    async with serve_stub_site() as (site, base_url):
+        # List the older term's courses first, and stall their pages
+        site.dashboard = (
+            site.dashboard.replace('Spring 1776</h2>', 'TERM</h2>')
+            .replace('Fall 1775</h2>', 'Spring 1776</h2>')
+            .replace('TERM</h2>', 'Fall 1775</h2>')
+        )
+        for number in ('123456', '182049', '723938', '849291'):
+            site.stalled_requests[f'/courses/{number}'] = 1
+        async with await _stub_messenger(base_url) as messenger:
+            courses = await asyncio.wait_for(
+                messenger.get_courses_and_assignments(), site.stall_seconds / 2
+            )
+            errors = messenger.errors
+
+        assert [str(course.term) for course in courses] == (
+            ['Fall 1775'] * 4 + ['Spring 1776'] * 4
+        )
+        # The older term's fetches were cancelled instead of waited for
+        assert [len(course.assignments) for course in courses] == (
+            [0] * 4 + [7] * 4
+        )
+        assert errors == {}
@@ -1,4 +1,7 @@
-from bs4 import BeautifulSoup
+from datetime import datetime
+
+from bs4 import BeautifulSoup, SoupStrainer
+import pytest
 from gradescraper.util import processor
 from gradescraper.structures.term import Term
 
@@ -77,6 +80,7 @@ def test_extract_unsubmitted_assignment():
     )
     assert extracted_assignment.name == 'Incomplete Assignment'
     assert extracted_assignment.submitted == False
+    assert extracted_assignment.status == 'No Submission'
     assert extracted_assignment.due_date.month == 3
     assert extracted_assignment.due_date.day == 17
     assert extracted_assignment.due_date.hour == 17
@@ -111,6 +115,7 @@ def test_extract_scored_assignment():
     )
     assert extracted_assignment.name == 'Scored Exam Example'
     assert extracted_assignment.submitted == True
+    assert extracted_assignment.status == '38.5 / 40.0'
     assert extracted_assignment.due_date.month == 4
     assert extracted_assignment.due_date.day == 14
     assert extracted_assignment.due_date.hour == 23
@@ -159,4 +164,127 @@ def test_extract_assignment_with_late_due_date():
     assert extracted_assignment.late_due_date.day == 20
     assert extracted_assignment.late_due_date.hour == 17
     assert extracted_assignment.late_due_date.minute == 10
-    assert extracted_assignment.late_due_date.year == 2021
\ No newline at end of file
+    assert extracted_assignment.late_due_date.year == 2021
+
+def test_strip_old_courses():
+    with open('tests/courses_dashboard.html', 'r') as courses_html:
+        soup = BeautifulSoup(courses_html, 'lxml')
+    recent_courses = processor.strip_old_courses(processor.extract_courses(soup))
+    assert len(recent_courses) == 4
+    assert all(course.term == Term('Spring', 1776) for course in recent_courses)
+
+
+def test_stream_parser_matches_row_extractor():
+    with open('tests/sample_course_dashboard.html', 'rb') as course_html:
+        course_page = course_html.read()
+    rows = BeautifulSoup(course_page, 'lxml', parse_only=SoupStrainer('tr')).find_all('tr')[1:]
+    expected = [
+        processor.extract_assignment_from_row(row, 'Example', 2021).to_dict()
+        for row in rows
+    ]
+
+    stream_parser = processor.AssignmentStreamParser('Example', 2021)
+    streamed = []
+    for i in range(0, len(course_page), 100):
+        streamed.extend(stream_parser.feed(course_page[i:i + 100]))
+    streamed.extend(stream_parser.close())
+
+    assert [assignment.to_dict() for assignment in streamed] == expected
+    assert stream_parser.title == 'Example Course Title'
+
+
+def test_stream_parser_without_data():
+    assert processor.AssignmentStreamParser('Example', 2021).close() == []
+
+
+def _course_tuple(course):
+    return (
+        course.term,
+        course.number,
+        course.short_name,
+        course.name,
+        course.assignments_num,
+    )
+
+
+@pytest.mark.parametrize('chunk_size', [7, 1024, 64 * 1024])
+def test_iter_dashboard_courses_matches_extract_courses(chunk_size):
+    with open('tests/courses_dashboard.html', 'rb') as courses_html:
+        page = courses_html.read()
+    expected = processor.extract_courses(BeautifulSoup(page, 'lxml'))
+    entries = list(processor.iter_dashboard_courses(page, chunk_size))
+    assert [_course_tuple(course) for _, course in entries] == [
+        _course_tuple(course) for course in expected
+    ]
+    assert all(course.term is term for term, course in entries)
+    assert all(type(course.name) is str for _, course in entries)
+
+
+def test_iter_dashboard_courses_rejects_login_page():
+    with pytest.raises(processor.LoginPageError):
+        next(
+            processor.iter_dashboard_courses(
+                '<html><head><title>Log In | Gradescope</title></head></html>'
+            )
+        )
+
+
+def test_fast_row_extractor_matches_row_extractor():
+    with open('tests/sample_course_dashboard.html', 'rb') as course_html:
+        course_page = course_html.read()
+    rows = BeautifulSoup(course_page, 'lxml', parse_only=SoupStrainer('tr')).find_all('tr')[1:]
+    for row in rows:
+        expected = processor.extract_assignment_from_row(row, 'Example', 2021)
+        extracted = processor.extract_assignment_from_row_fast(row, 'Example', 2021)
+        assert processor.assignment_to_tuple(extracted) == processor.assignment_to_tuple(expected)
+
+
+@pytest.mark.parametrize(
+    'text',
+    ['May 10', 'Jan 1', 'sep 09', 'Dec  31'],
+)
+def test_parse_release_date_matches_strptime(text):
+    expected = datetime.strptime(text, '%b %d').replace(year=2021)
+    assert processor.parse_release_date(text, 2021) == expected
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        'May 10 at 11:59PM',
+        'Jan 1 at 12:00AM',
+        'Jun 30 at 12:30PM',
+        'oct 3 at 9:05am',
+        'Feb 2 at 1:7PM',
+    ],
+)
+def test_parse_due_date_matches_strptime(text):
+    expected = datetime.strptime(text, '%b %d at %I:%M%p').replace(year=2021)
+    assert processor.parse_due_date(text, 2021) == expected
+    assert processor.parse_due_date(f'Late Due Date: {text}', 2021) == expected
+
+
+def test_parse_dates_rejects_invalid_dates():
+    for text in ['Foo 10', 'Apr 31', 'May 10 at 13:00PM']:
+        with pytest.raises(ValueError):
+            processor.parse_due_date(text, 2021)
+    with pytest.raises(ValueError):
+        processor.parse_release_date('May 32', 2021)
+
+
+def test_parse_assignment_details():
+    with open('tests/assignment_submission.html') as assignment_html:
+        page = assignment_html.read()
+    assert processor.parse_assignment_details(page) == (
+        8.5,
+        10.0,
+        datetime(2021, 4, 8, 21, 14, 3),
+    )
+
+
+def test_parse_ungraded_assignment_details():
+    page = (
+        '<html><body><div class="submissionOutlineHeader--totalPoints">'
+        '- / 40.0 pts</div></body></html>'
+    )
+    assert processor.parse_assignment_details(page) == (None, 40.0, None)
@@ -0,0 +1,91 @@
+import json
+
+from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.profiler import NULL_PROFILER, Profiler
+import pytest
+
+from tests.gradescope_stub import EMAIL, PASSWORD, serve_stub_site
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def test_profiler_records_spans():
+    clock = FakeClock()
+    profiler = Profiler(clock)
+    with profiler.span('fetch course', 'course 1', course=1) as span:
+        clock.time += 0.5
+        span.set(bytes=100)
+    with pytest.raises(ValueError):
+        with profiler.span('fetch course', 'course 2'):
+            clock.time += 1.5
+            raise ValueError()
+
+    first, second = profiler.spans
+    assert (first.name, first.track, first.start, first.duration) == (
+        'fetch course',
+        'course 1',
+        0,
+        0.5,
+    )
+    assert first.attributes == {'course': 1, 'bytes': 100}
+    assert second.attributes == {'error': 'ValueError'}
+
+    (phase,) = profiler.summary()
+    assert (phase.count, phase.total, phase.mean, phase.max) == (2, 2, 1, 1.5)
+
+
+def test_trace_events(tmp_path):
+    clock = FakeClock()
+    profiler = Profiler(clock)
+    with profiler.span('login'):
+        clock.time += 0.001
+
+    path = tmp_path / 'trace.json'
+    profiler.export_trace(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    assert events[0] == {
+        'name': 'login',
+        'ph': 'X',
+        'pid': 1,
+        'tid': 0,
+        'ts': 0,
+        'dur': 1000,
+        'args': {},
+    }
+    assert events[1]['args'] == {'name': 'main'}
+
+
+def test_null_profiler_records_nothing():
+    with NULL_PROFILER.span('login') as span:
+        span.set(status=200)
+    assert not NULL_PROFILER.enabled
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('parser', ['soup', 'stream'])
+async def test_messenger_records_phases(parser):
+    profiler = Profiler()
+    async with serve_stub_site() as (site, base_url):
+        async with GradescopeMessenger(
+            EMAIL, PASSWORD, parser=parser, profiler=profiler
+        ) as messenger:
+            messenger.base_url = base_url
+            await messenger.get_courses_and_assignments()
+
+    phases = {phase.name: phase.count for phase in profiler.summary()}
+    assert phases['auth token'] == 1
+    assert phases['login'] == 1
+    assert phases['parse dashboard'] == 1
+    assert phases['fetch course'] == 4
+    assert phases['extract row'] == 28
+    fetch = next(span for span in profiler.spans if span.name == 'fetch course')
+    assert fetch.attributes['bytes'] > 0
+    assert fetch.attributes['status'] == 200
+    assert 0 <= fetch.attributes['ttfb'] <= fetch.duration
+    assert 'Course pages' in profiler.format_summary()
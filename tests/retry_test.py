@@ -0,0 +1,46 @@
+import asyncio
+import datetime
+import email.utils
+
+from gradescraper.util.retry import RetryPolicy, TokenBucket, parse_retry_after
+import pytest
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('120') == 120
+    assert parse_retry_after('soon') is None
+
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+        seconds=60
+    )
+    delay = parse_retry_after(email.utils.format_datetime(retry_at, usegmt=True))
+    assert 55 < delay <= 60
+
+
+def test_retry_policy_backs_off_with_jitter():
+    policy = RetryPolicy(base_delay=1, max_delay=5, random_fraction=lambda: 1)
+    assert [policy.delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+    assert policy.delay(1, retry_after='3') == 3
+    assert policy.delay(1, retry_after='300') == 5
+
+    policy = RetryPolicy(base_delay=1, random_fraction=lambda: 0.5)
+    assert policy.delay(2) == 1
+
+
+def test_retry_policy_limits_attempts_and_time():
+    policy = RetryPolicy(max_attempts=3, deadline=10)
+    assert policy.should_retry(1, 1, 0)
+    assert not policy.should_retry(3, 1, 0)
+    assert not policy.should_retry(1, 5, 6)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    loop = asyncio.get_running_loop()
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = loop.time()
+    for _ in range(7):
+        await bucket.acquire()
+    # The first 2 requests are a burst, the other 5 take 1/50s each
+    assert loop.time() - start >= 0.09
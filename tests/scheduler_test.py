@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from gradescraper.util.scheduler import FetchScheduler
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight():
+    scheduler = FetchScheduler(max_in_flight=2)
+    peak = 0
+
+    async def job():
+        nonlocal peak
+        peak = max(peak, scheduler.in_flight)
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[scheduler.run(job) for _ in range(10)])
+    assert peak == 2
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    scheduler = FetchScheduler(max_in_flight=1)
+    order = []
+
+    def make_job(name):
+        async def job():
+            order.append(name)
+            await asyncio.sleep(0)
+
+        return job
+
+    await asyncio.gather(
+        scheduler.run(make_job('first')),
+        scheduler.run(make_job('old'), priority=5),
+        scheduler.run(make_job('recent'), priority=0),
+        scheduler.run(make_job('older'), priority=9),
+    )
+    assert order == ['first', 'recent', 'old', 'older']
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_frees_slot():
+    scheduler = FetchScheduler(max_in_flight=1)
+    blocker = asyncio.ensure_future(scheduler.run(lambda: asyncio.sleep(0.05)))
+    await asyncio.sleep(0)
+    waiting = asyncio.ensure_future(scheduler.run(lambda: asyncio.sleep(0)))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await blocker
+    assert await scheduler.run(lambda: asyncio.sleep(0, result='done')) == 'done'
+    assert scheduler.in_flight == 0
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError):
+        FetchScheduler(max_in_flight=0)
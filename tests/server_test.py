@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+
+import aiohttp
+from aiohttp.test_utils import TestClient, TestServer, unused_port
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.server import AssignmentService, create_app, serve
+from gradescraper.util.watch import PollSchedule
+import pytest
+
+from tests.gradescope_stub import EMAIL, PASSWORD, serve_stub_site
+
+NOW = datetime.datetime(2021, 4, 10)
+
+
+def make_course(number, assignments):
+    course = Course(Term('Spring', 2021), number, f'C{number}', f'Course {number}', 0)
+    course.assignments = [
+        Assignment(
+            name,
+            course.name,
+            f'/courses/{number}/assignments/{name}',
+            submitted,
+            NOW - datetime.timedelta(days=7),
+            NOW + datetime.timedelta(days=days),
+            None if late_days is None else NOW + datetime.timedelta(days=late_days),
+        )
+        for name, days, submitted, late_days in assignments
+    ]
+    return course
+
+
+def make_service():
+    return AssignmentService(
+        [
+            make_course(1, [('A', 1, True, None), ('B', 3, False, None)]),
+            make_course(
+                2, [('C', 2, False, None), ('D', 10, False, None), ('E', -1, False, 1)]
+            ),
+        ],
+        now=lambda: NOW,
+    )
+
+
+def names(assignments):
+    return [assignment['name'] for assignment in assignments]
+
+
+def test_service_queries():
+    service = make_service()
+    assert [a.name for a in service.upcoming()] == ['A', 'C', 'B']
+    assert [a.name for a in service.upcoming(days=30)] == ['A', 'C', 'B', 'D']
+    assert [a.name for a in service.upcoming(unsubmitted_only=True)] == ['C', 'B']
+    assert [a.name for a in service.upcoming(include_late=True)] == ['E', 'A', 'C', 'B']
+    # E can still be submitted late
+    assert [a.name for a in service.unsubmitted()] == ['E', 'C', 'B']
+    assert [a.name for a in service.course_assignments(2)] == ['C', 'D', 'E']
+    assert [a.name for a in service.course_assignments(2, days=7)] == ['C']
+    assert service.course_assignments(3) is None
+
+
+def test_update_replaces_snapshot():
+    service = make_service()
+    service.update([make_course(3, [('F', 1, False, None)])], {4: ValueError('x')})
+    assert [a.name for a in service.upcoming()] == ['F']
+    assert service.course(1) is None
+    assert service.synced_at is not None
+    assert service.status() == {
+        'synced_at': service.synced_at.isoformat(),
+        'courses': 1,
+        'assignments': 1,
+        'failed_courses': {'4': 'x'},
+        'last_error': None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_app_routes():
+    async with TestClient(TestServer(create_app(make_service()))) as client:
+        response = await client.get('/assignments/upcoming?days=30&unsubmitted=true')
+        assert names((await response.json())['assignments']) == ['C', 'B', 'D']
+
+        response = await client.get('/assignments/unsubmitted')
+        assert names((await response.json())['assignments']) == ['E', 'C', 'B']
+
+        response = await client.get('/courses')
+        assert [course['number'] for course in await response.json()] == [1, 2]
+
+        response = await client.get('/courses/2/assignments?days=7&late=1')
+        assert names((await response.json())['assignments']) == ['E', 'C']
+
+        assert (await client.get('/courses/3/assignments')).status == 404
+        assert (await client.get('/courses/x/assignments')).status == 404
+        assert (await client.get('/assignments/upcoming?days=a')).status == 400
+
+
+@pytest.mark.asyncio
+async def test_serve_syncs_in_background():
+    port = unused_port()
+    service = AssignmentService()
+    async with serve_stub_site() as (site, base_url):
+        async with GradescopeMessenger(EMAIL, PASSWORD) as messenger:
+            messenger.base_url = base_url
+            task = asyncio.ensure_future(
+                serve(
+                    messenger,
+                    service,
+                    PollSchedule(60),
+                    datetime.timedelta(minutes=15),
+                    port=port,
+                )
+            )
+            try:
+                while service.synced_at is None:
+                    await asyncio.sleep(0.01)
+                requests = sum(site.request_counts.values())
+                number = next(
+                    course.number for course in service.courses if course.assignments
+                )
+
+                async with aiohttp.ClientSession() as session:
+                    for _ in range(3):
+                        async with session.get(
+                            f'http://127.0.0.1:{port}/courses/{number}/assignments'
+                        ) as response:
+                            assert len((await response.json())['assignments']) == 7
+                    async with session.get(f'http://127.0.0.1:{port}/status') as response:
+                        status = await response.json()
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        # Queries are answered without requests to Gradescope
+        assert sum(site.request_counts.values()) == requests
+    assert status['courses'] == 8 and status['assignments'] == 28
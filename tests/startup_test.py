@@ -0,0 +1,64 @@
+import runpy
+import subprocess
+import sys
+
+from gradescraper.util.executor import ParseExecutor
+from gradescraper.util.formatter import WRITERS
+from gradescraper.util.messenger import GradescopeMessenger
+import pytest
+
+HEAVY_MODULES = ['aiohttp', 'bs4', 'lxml', 'keyring']
+
+IMPORTED_MODULES = """
+import runpy, sys
+sys.argv = ['gradescraper.py'] + sys.argv[1:]
+try:
+    runpy.run_path('gradescraper.py', run_name='__main__')
+except SystemExit:
+    pass
+print(' '.join(sys.modules), file=sys.stderr)
+"""
+
+
+def _imported_modules(*arguments):
+    completed = subprocess.run(
+        [sys.executable, '-c', IMPORTED_MODULES, *arguments],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return set(completed.stderr.split())
+
+
+@pytest.mark.parametrize(
+    'arguments',
+    [['--help'], ['--offline', '--account', 'student@email.com', 'password']],
+)
+def test_quick_paths_skip_heavy_imports(arguments, tmp_path):
+    if arguments[0] == '--offline':
+        arguments = arguments + ['--db', str(tmp_path / 'gradescraper.db')]
+    modules = _imported_modules(*arguments)
+    assert 'argparse' in modules
+    assert not [module for module in HEAVY_MODULES if module in modules]
+
+
+def test_choices_match_messenger():
+    cli = runpy.run_path('gradescraper.py')
+    assert cli['PARSERS'] == GradescopeMessenger.parsers
+    assert cli['PARSE_MODES'] == ParseExecutor.modes
+    assert cli['FORMATS'] == ('text', *WRITERS)
+
+
+def test_offline_report_skips_unused_structures(tmp_path):
+    modules = _imported_modules(
+        '--offline',
+        '--account',
+        'student@email.com',
+        'password',
+        '--db',
+        str(tmp_path / 'gradescraper.db'),
+    )
+    assert 'gradescraper.util.store' in modules
+    assert 'gradescraper.structures.course' not in modules
+    assert 'gradescraper.structures.due_date_index' not in modules
@@ -0,0 +1,99 @@
+import datetime
+import sqlite3
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+from gradescraper.util.store import SnapshotStore
+
+START = datetime.datetime(2021, 4, 10)
+
+
+def make_course(number, assignment_days, retrieved=True):
+    course = Course(Term('Spring', 2021), number, f'C{number}', f'Course {number}', len(assignment_days))
+    course.assignments = [
+        Assignment(
+            f'HW {i}',
+            course.name,
+            f'https://www.gradescope.com/courses/{number}/assignments/{i}',
+            i % 2 == 0,
+            START,
+            START + datetime.timedelta(days=days),
+            None,
+            'Submitted' if i % 2 == 0 else 'No Submission',
+        )
+        for i, days in enumerate(assignment_days)
+    ]
+    course.retrieved_at = START if retrieved else None
+    return course
+
+
+def test_save_and_load():
+    with SnapshotStore(':memory:') as store:
+        courses = [make_course(1, [1, 2]), make_course(2, [3])]
+        store.save('a@email.com', courses)
+        loaded = store.load('a@email.com')
+        assert [course.number for course in loaded] == [1, 2]
+        assert loaded[0].term == Term('Spring', 2021)
+        assert loaded[0].retrieved_at == START
+        assert [a.to_dict() for a in loaded[0].assignments] == [
+            a.to_dict() for a in courses[0].assignments
+        ]
+        assert store.load('b@email.com') == []
+
+
+def test_status_column_is_added_to_old_databases(tmp_path):
+    path = str(tmp_path / 'gradescraper.db')
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            'CREATE TABLE assignments (account TEXT NOT NULL, '
+            'course_number INTEGER NOT NULL, key TEXT NOT NULL, '
+            'position INTEGER NOT NULL, name TEXT, course_name TEXT, '
+            'url TEXT NOT NULL, submitted INTEGER NOT NULL, release_date INTEGER, '
+            'due_date INTEGER, late_due_date INTEGER, '
+            'PRIMARY KEY (account, course_number, key))'
+        )
+    connection.close()
+    with SnapshotStore(path) as store:
+        courses = [make_course(1, [1, 2])]
+        store.save('a@email.com', courses)
+        loaded = store.load('a@email.com')
+        assert [a.status for a in loaded[0].assignments] == [
+            'Submitted',
+            'No Submission',
+        ]
+
+
+def test_unretrieved_courses_keep_assignments():
+    with SnapshotStore(':memory:') as store:
+        store.save('a@email.com', [make_course(1, [1, 2]), make_course(2, [3])])
+        store.save('a@email.com', [make_course(1, [], retrieved=False)])
+        loaded = store.load('a@email.com')
+        assert [course.number for course in loaded] == [1]
+        assert len(loaded[0].assignments) == 2
+        assert loaded[0].retrieved_at == START
+
+
+def test_assignments_in_range():
+    with SnapshotStore(':memory:') as store:
+        store.save('a@email.com', [make_course(1, [5, 1]), make_course(2, [3, 9])])
+        end = START + datetime.timedelta(days=5)
+        upcoming = store.assignments_in_range('a@email.com', START, end)
+        assert [(a.course_name, a.name) for a in upcoming] == [
+            ('Course 1', 'HW 1'),
+            ('Course 2', 'HW 0'),
+            ('Course 1', 'HW 0'),
+        ]
+        unsubmitted = store.assignments_in_range('a@email.com', START, end, unsubmitted_only=True)
+        assert [a.name for a in unsubmitted] == ['HW 1']
+        assert store.last_retrieved('a@email.com') == START
+
+
+def test_accounts():
+    with SnapshotStore(':memory:') as store:
+        assert store.accounts() == []
+        older = make_course(1, [1])
+        older.retrieved_at = START - datetime.timedelta(days=1)
+        store.save('a@email.com', [older])
+        store.save('b@email.com', [make_course(1, [1])])
+        assert store.accounts() == ['b@email.com', 'a@email.com']
@@ -0,0 +1,85 @@
+import datetime
+
+from aiohttp import web
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.term import Term
+from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.sync import incremental_sync, plan_sync
+import pytest
+
+from tests.gradescope_stub import EMAIL, PASSWORD, serve_stub_site
+
+NOW = datetime.datetime(2021, 4, 10, 12)
+FRESH_FOR = datetime.timedelta(minutes=15)
+
+
+def _course(number, assignments_num, retrieved_at=None):
+    course = Course(Term('Spring', 2021), number, 'MATH', 'Math', assignments_num)
+    if retrieved_at:
+        course.assignments = [
+            Assignment(f'HW {number}', 'Math', f'/courses/{number}/1', False)
+        ]
+        course.retrieved_at = retrieved_at
+    return course
+
+
+def test_plan_sync():
+    previous = [
+        _course(1, 3, NOW - datetime.timedelta(minutes=5)),
+        _course(2, 3, NOW - datetime.timedelta(minutes=5)),
+        _course(3, 3, NOW - datetime.timedelta(hours=1)),
+        _course(4, 3),
+    ]
+    dashboard = [_course(1, 3), _course(2, 4), _course(3, 3), _course(4, 3), _course(5, 0)]
+
+    to_fetch, skipped = plan_sync(dashboard, previous, FRESH_FOR, NOW)
+
+    assert [course.number for course in skipped] == [1]
+    assert [course.number for course in to_fetch] == [2, 3, 4, 5]
+    assert skipped[0].assignments[0].name == 'HW 1'
+    assert skipped[0].retrieved_at == previous[0].retrieved_at
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_skips_unchanged_courses():
+    async with serve_stub_site() as (site, base_url):
+        async with GradescopeMessenger(EMAIL, PASSWORD) as messenger:
+            messenger.base_url = base_url
+            first = await incremental_sync(messenger, [], FRESH_FOR)
+        assert len(first.fetched) == 4
+        assert not first.skipped
+
+        previous = first.courses
+        previous[0].assignments_num += 1
+        async with GradescopeMessenger(EMAIL, PASSWORD) as messenger:
+            messenger.base_url = base_url
+            second = await incremental_sync(messenger, previous, FRESH_FOR)
+        assert [course.number for course in second.fetched] == [123456]
+        assert len(second.skipped) == 3
+        assert sum(
+            count for path, count in site.request_counts.items()
+            if path.startswith('/courses/')
+        ) == 5
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_keeps_previous_assignments_of_failed_courses():
+    async with serve_stub_site() as (site, base_url):
+        async with GradescopeMessenger(EMAIL, PASSWORD) as messenger:
+            messenger.base_url = base_url
+            first = await incremental_sync(messenger, [], FRESH_FOR)
+
+        site.injected_responses['/courses/123456'] = [
+            web.Response(status=404)
+        ]
+        async with GradescopeMessenger(EMAIL, PASSWORD) as messenger:
+            messenger.base_url = base_url
+            second = await incremental_sync(
+                messenger, first.courses, datetime.timedelta(0)
+            )
+
+    assert list(second.failed) == [123456]
+    failed = second.courses[0]
+    assert failed.assignments is first.courses[0].assignments
+    assert failed.retrieved_at == first.courses[0].retrieved_at
@@ -0,0 +1,106 @@
+import datetime
+import random
+
+import pytest
+
+from gradescraper.structures.assignment import Assignment
+from gradescraper.structures.course import Course
+from gradescraper.structures.due_date_index import DueDateIndex
+from gradescraper.structures.table import AssignmentTable
+from gradescraper.structures.term import Term
+
+START = datetime.datetime(2021, 4, 10)
+DAY = datetime.timedelta(days=1)
+
+
+def make_courses(num_courses=4, assignments_per_course=50, seed=0):
+    generator = random.Random(seed)
+    courses = []
+    for number in range(num_courses):
+        course = Course(Term('Spring', 2021), number, f'C{number}', f'Course {number}', 0)
+        course.assignments = []
+        for index in range(assignments_per_course):
+            due = START + datetime.timedelta(hours=generator.randrange(-240, 240))
+            course.assignments.append(
+                Assignment(
+                    f'Assignment {index}',
+                    course.name,
+                    '',
+                    generator.random() < 0.5,
+                    due - 7 * DAY,
+                    due if index % 10 else None,
+                    due + 2 * DAY if index % 3 == 0 and index % 10 else None,
+                )
+            )
+        courses.append(course)
+    return courses
+
+
+@pytest.mark.parametrize('unsubmitted_only', [False, True])
+@pytest.mark.parametrize('include_late', [False, True])
+def test_in_range_matches_due_date_index(unsubmitted_only, include_late):
+    courses = make_courses()
+    table = AssignmentTable.from_courses(courses)
+    index = DueDateIndex.merge(course.due_date_index for course in courses)
+    for days in (0, 1, 3, 7):
+        start, end = START - days * DAY, START + days * DAY
+        assert table.in_range(start, end, unsubmitted_only, include_late) == (
+            index.in_range(start, end, unsubmitted_only, include_late)
+        )
+    assert table.in_range(START + DAY, START) == []
+
+
+def test_overdue_counts():
+    courses = make_courses()
+    table = AssignmentTable.from_courses(courses)
+    by_course = table.overdue_by_course(START)
+    assert list(by_course) == [
+        len(course.due_date_index.overdue(START)) for course in courses
+    ]
+    assert table.count_overdue(START) == sum(by_course)
+
+
+def test_workload_by_course():
+    courses = make_courses()
+    table = AssignmentTable.from_courses(courses)
+    end = START + 3 * DAY
+    assert list(table.workload_by_course(START, end, unsubmitted_only=True)) == [
+        len(course.get_assignments_in_range(START, end, unsubmitted_only=True))
+        for course in courses
+    ]
+
+
+def test_workload_by_day():
+    courses = make_courses()
+    table = AssignmentTable.from_courses(courses)
+    end = START + 5 * DAY + datetime.timedelta(hours=12)
+    by_day = table.workload_by_day(START, end)
+    assert len(by_day) == 6
+    for day, count in enumerate(by_day):
+        bin_end = min(START + (day + 1) * DAY, end)
+        assert count == sum(
+            START + day * DAY <= assignment.due_date < bin_end
+            for course in courses
+            for assignment in course.assignments
+            if assignment.due_date
+        )
+
+    by_course = table.workload_by_day(START, end, by_course=True)
+    assert by_course.shape == (4, 6)
+    assert list(by_course.sum(axis=0)) == list(by_day)
+    assert list(by_course.sum(axis=1)) == list(
+        table.workload_by_course(START, end - datetime.timedelta(seconds=1))
+    )
+    assert list(table.workload_by_day(START, START)) == []
+    with pytest.raises(ValueError):
+        table.workload_by_day(START, end, bin_size=datetime.timedelta(0))
+
+
+def test_from_assignments_groups_by_course_name():
+    assignments = [
+        assignment for course in make_courses(2, 5) for assignment in course.assignments
+    ]
+    table = AssignmentTable.from_assignments(reversed(assignments))
+    assert table.course_names == ['Course 1', 'Course 0']
+    assert list(table.course_ids) == [0] * 5 + [1] * 5
+    assert len(table) == 10
@@ -1,3 +1,5 @@
+import pytest
+
 from gradescraper.structures.term import Term
 
 
@@ -15,3 +17,24 @@ def test_init():
     split_init = Term(*'Fall 2022'.split(' '))
     assert split_init.season == 'Fall'
     assert split_init.year == '2022'
+
+
+def test_comparison_across_years():
+    assert Term('Spring', 2021) > Term('Fall', 2020)
+    assert Term('Fall', 2020) < Term('Spring', 2021)
+    assert max([Term('Fall', 2020), Term('Spring', 2021)]) == Term('Spring', 2021)
+
+
+def test_sort_key():
+    terms = [Term('Fall', 2021), Term('Spring', 2020), Term('Winter', 2020), Term('Summer', 2021)]
+    assert sorted(terms, key=lambda term: term.sort_key) == sorted(terms)
+    assert sorted(terms)[0] == Term('Spring', 2020)
+    assert Term('Quarter', 2021) < Term('Spring', 2021)
+    assert Term('Quarter', 2021) > Term('Winter', 2020)
+
+
+def test_terms_are_hashable_and_immutable():
+    assert len({Term('Spring', 2021), Term('Spring', 2021), Term('Fall', 2021)}) == 2
+    term = Term('Spring', 2021)
+    with pytest.raises(AttributeError):
+        term.year = 2022
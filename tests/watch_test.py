@@ -0,0 +1,92 @@
+import datetime
+
+from gradescraper.util.diff import ChangeKind
+from gradescraper.util.messenger import GradescopeMessenger
+from gradescraper.util.watch import PollSchedule, watch
+import pytest
+
+from tests.gradescope_stub import (
+    EMAIL,
+    PASSWORD,
+    serve_stub_site,
+    submit_assignment,
+)
+
+
+def test_poll_schedule_backs_off_with_jitter():
+    schedule = PollSchedule(60, jitter=0.5, max_delay=300, random_fraction=lambda: 1)
+    assert schedule.next_delay() == 90
+    assert schedule.next_delay(1) == 180
+    assert schedule.next_delay(10) == 450
+
+    schedule = PollSchedule(60, jitter=0.5, random_fraction=lambda: 0)
+    assert schedule.next_delay() == 30
+
+
+@pytest.mark.asyncio
+async def test_watch_reports_changes_between_polls():
+    polls = []
+    delays = []
+
+    async with serve_stub_site() as (site, base_url):
+
+        def on_poll(result, changes):
+            polls.append((result, changes))
+            # Submit an assignment before the next poll, which links its row
+            site.course_page = submit_assignment(
+                site.course_page, '/courses/123456/assignments/5/submissions/9'
+            )
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        async with GradescopeMessenger(EMAIL, PASSWORD) as messenger:
+            messenger.base_url = base_url
+            await watch(
+                messenger,
+                PollSchedule(60, jitter=0),
+                datetime.timedelta(0),
+                on_poll,
+                max_polls=2,
+                sleep=sleep,
+            )
+
+    assert delays == [60]
+    assert site.login_count == 1
+    (first, first_changes), (second, second_changes) = polls
+    assert first_changes == []
+    # The page is shared by the 4 fetched courses
+    assert len(second_changes) == 4
+    assert all(
+        change.kind is ChangeKind.SUBMITTED_TOGGLED for change in second_changes
+    )
+    assert all(change.assignment.url for change in second_changes)
+    assert all(
+        str(change).startswith('Submission status changed')
+        for change in second_changes
+    )
+
+
+@pytest.mark.asyncio
+async def test_watch_backs_off_after_errors():
+    errors = []
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    async with serve_stub_site() as (site, base_url):
+        async with GradescopeMessenger(EMAIL, 'bad') as messenger:
+            messenger.base_url = base_url
+            await watch(
+                messenger,
+                PollSchedule(60, jitter=0),
+                datetime.timedelta(0),
+                lambda result, changes: None,
+                on_error=errors.append,
+                max_polls=3,
+                sleep=sleep,
+            )
+
+    assert len(errors) == 3
+    assert delays == [120, 240]